@@ -0,0 +1,94 @@
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+import requests
+
+from safa.api.http_client import HttpClient
+
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("SAFA_MAX_CONCURRENT_REQUESTS", 8))
+
+
+class AsyncHttpClient:
+    def __init__(self, http_client: HttpClient, max_concurrency: int = MAX_CONCURRENT_REQUESTS):
+        """
+        Creates asynchronous HTTP client sharing the cookies of the given client, each worker thread has its own session.
+        :param http_client: The client used to perform the requests.
+        :param max_concurrency: The maximum number of requests in flight at once.
+        """
+        self.http_client = http_client
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        :return: The HTTP session of the calling thread, sharing its cookies with the synchronous client.
+        """
+        return self.http_client.session
+
+    @property
+    def cookies(self) -> requests.cookies.RequestsCookieJar:
+        """
+        :return: The cookies shared with the synchronous client.
+        """
+        return self.http_client.cookies
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Performs GET request to endpoint.
+        :param endpoint: Relative path to endpoint from base url.
+        :param params: Additional parameters to include in request.
+        :return: The request's response.
+        """
+        return await self._run(self.http_client.get, endpoint, params=params)
+
+    async def post(self, endpoint: str, data: Optional[Dict] = None, **kwargs) -> Any:
+        """
+        Performs POST request to endpoint.
+        :param endpoint: Relative path to endpoint from base url.
+        :param data: The data to include in request.
+        :return: The requests' response.
+        """
+        return await self._run(self.http_client.post, endpoint, data=data, **kwargs)
+
+    async def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Performs PUT http request.
+        :param endpoint: Relative path to endpoint from base url.
+        :param data: The data to include in the HTTP request.
+        :return: The request's response.
+        """
+        return await self._run(self.http_client.put, endpoint, data=data)
+
+    async def delete(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Performs a DELETE http request.
+        :param endpoint: Relative path to endpoint from base url.
+        :param data: The data to include in request.
+        :return: Request response.
+        """
+        return await self._run(self.http_client.delete, endpoint, data=data)
+
+    async def _run(self, request_method, *args, **kwargs) -> Any:
+        """
+        Performs blocking request in worker thread once a concurrency slot is available.
+        :param request_method: The method of the HTTP client to call.
+        :param args: Positional arguments to request method.
+        :param kwargs: Keyword arguments to request method.
+        :return: JSON response to request.
+        """
+        async with self._get_semaphore():
+            return await asyncio.to_thread(request_method, *args, **kwargs)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns semaphore bounding concurrent requests, creating one for the running event loop if necessary.
+        :return: The semaphore.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
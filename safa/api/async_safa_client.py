@@ -0,0 +1,340 @@
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List, Optional, cast
+
+from tqdm import tqdm
+
+from safa.api.async_http_client import AsyncHttpClient
+from safa.api.constants import SAFA_AUTH_TOKEN, STORE_CRED_KEY, STORE_PROJECT_KEY
+from safa.api.safa_store import SafaStore
+from safa.config.safa_config import SafaConfig
+from safa.data.commits import DiffDataType
+from safa.utils.project_delta import apply_project_delta, normalize_delta
+
+SESSION_TOKEN_TTL = int(os.environ.get("SAFA_SESSION_TOKEN_TTL", 12 * 60 * 60))
+SESSION_TOKEN_EXPIRY_MARGIN = 60
+
+
+class AsyncSafaClient:
+
+    def __init__(self, http_client: AsyncHttpClient, store: Optional[SafaStore] = None):
+        """
+        Creates new asynchronous client to interact with SAFA api.
+        :param http_client: Client used to make HTTP requests.
+        :param store: Used to store intermediate results.
+        """
+        if store is None:
+            store = SafaStore()
+        self.http_client = http_client
+        self.store = store
+
+    async def login(self, config: Optional[SafaConfig] = None, email: Optional[str] = None, password: Optional[str] = None) -> None:
+        """
+        Authenticates user using SAFA credentials, reusing the session token of a previous login while it is valid.
+        Expired sessions are renewed using the same credentials.
+        :param config: Safa configuration.
+        :param email: SAFA account email.
+        :param password: SAFA account password.
+        :return: Auth token.
+        """
+        if config is None and (email is None or password is None):
+            raise Exception("Expected config or email and password.")
+        if config:
+            email = config.user_config.email
+            password = config.user_config.password
+        credentials = {"email": email, "password": password}
+        self.http_client.http_client.on_unauthorized = lambda: self._login_with_credentials(credentials)
+        if self._restore_session_token(cast(str, email)):
+            return
+        await self.http_client.post("login", credentials, reauthenticate=False)
+        self._save_session_token(cast(str, email))
+
+    def _login_with_credentials(self, credentials: Dict) -> None:
+        """
+        Authenticates again once the session has expired, blocking the calling thread.
+        :param credentials: The email and password of the user.
+        :return: None
+        """
+        self.http_client.http_client.post("login", credentials, reauthenticate=False)
+        self._save_session_token(credentials["email"])
+
+    def _save_session_token(self, email: str) -> None:
+        """
+        Saves session token to store so that later runs can skip logging in.
+        Tokens without an expiration are assumed to last SAFA_SESSION_TOKEN_TTL seconds.
+        :param email: The email of the user logged in.
+        :return: None
+        """
+        token_cookie = next((c for c in self.http_client.cookies if c.name == SAFA_AUTH_TOKEN), None)
+        if token_cookie is None:
+            raise Exception("Login failed, SAFA-TOKEN not found in cookies")
+        self.store.save(STORE_CRED_KEY, email, {
+            "base_url": self.http_client.http_client.base_url,
+            "token": token_cookie.value,
+            "domain": token_cookie.domain,
+            "path": token_cookie.path,
+            "expires": token_cookie.expires if token_cookie.expires else int(time.time()) + SESSION_TOKEN_TTL
+        })
+
+    def _restore_session_token(self, email: str) -> bool:
+        """
+        Sets session token saved by a previous run if it has not expired.
+        :param email: The email of the user logging in.
+        :return: Whether session token was restored.
+        """
+        if not self.store.has(STORE_CRED_KEY, email):
+            return False
+        token_data = self.store.get(STORE_CRED_KEY, email)
+        if token_data.get("base_url") != self.http_client.http_client.base_url:
+            return False
+        if token_data["expires"] - SESSION_TOKEN_EXPIRY_MARGIN < time.time():
+            self.store.delete(STORE_CRED_KEY, email)
+            return False
+        self.http_client.cookies.set(SAFA_AUTH_TOKEN, token_data["token"], domain=token_data["domain"],
+                                             path=token_data["path"], expires=token_data["expires"])
+        return True
+
+    async def get_version(self, version_id: str, base_version_id: Optional[str] = None, **kwargs) -> Dict:
+        """
+        Retrieves project with version ID.
+        :param version_id: ID of version of project to retrieve.
+        :param base_version_id: ID of a cached version of the same project, only the changes since are retrieved.
+        :param kwargs: Additional keyword arguments to get_or_store.
+        :return: The project data.
+        """
+
+        async def get_data():
+            if base_version_id and base_version_id != version_id and self.store.has(STORE_PROJECT_KEY, base_version_id):
+                try:
+                    return await self.get_version_from_delta(base_version_id, version_id)
+                except Exception as e:
+                    print(f"Unable to retrieve project delta ({e}), retrieving full project...")
+            print("...retrieving project data...")
+            project_data = await self.http_client.get(f"projects/versions/{version_id}")
+            return project_data
+
+        return await self._get_or_store(STORE_PROJECT_KEY, version_id, get_data, **kwargs)
+
+    async def get_versions(self, version_ids: List[str], **kwargs) -> List[Dict]:
+        """
+        Retrieves many project versions concurrently.
+        :param version_ids: IDs of the versions to retrieve.
+        :param kwargs: Additional keyword arguments to get_version.
+        :return: The project data of each version, in the same order as given.
+        """
+        return list(await asyncio.gather(*[self.get_version(v_id, **kwargs) for v_id in version_ids]))
+
+    async def get_version_delta(self, base_version_id: str, version_id: str) -> DiffDataType:
+        """
+        Retrieves the changes made to project between two versions.
+        :param base_version_id: ID of the version to calculate changes from.
+        :param version_id: ID of the version to calculate changes to.
+        :return: The artifacts and traces added, modified, and removed.
+        """
+        print("...retrieving project changes...")
+        response = await self.http_client.get(f"projects/delta/{base_version_id}/{version_id}")
+        return normalize_delta(response)
+
+    async def get_version_from_delta(self, base_version_id: str, version_id: str) -> Dict:
+        """
+        Constructs project data for version by applying changes since base version to its cached data.
+        :param base_version_id: ID of version whose data is cached.
+        :param version_id: ID of version to construct.
+        :return: The project data at version.
+        """
+        delta = await self.get_version_delta(base_version_id, version_id)
+        base_project_data = cast(Dict, self.store.get(STORE_PROJECT_KEY, base_version_id))
+        project_data = {**base_project_data,
+                        "artifacts": list(base_project_data.get("artifacts", [])),
+                        "traces": list(base_project_data.get("traces", []))}
+        return apply_project_delta(project_data, delta)
+
+    def apply_commit(self, version_id: str, commit_response: DiffDataType, base_version_id: Optional[str] = None) -> None:
+        """
+        Patches cached project data with commit response instead of retrieving the project again.
+        When base version is given, its cached data is moved to the committed version.
+        :param version_id: ID of version that commit was made to.
+        :param commit_response: The response to the commit containing the saved entities.
+        :param base_version_id: ID of cached version that committed version was created from.
+        :return: None
+        """
+        cached_version_id = base_version_id if base_version_id else version_id
+        if not self.store.has(STORE_PROJECT_KEY, cached_version_id):
+            return
+        project_data = cast(Dict, self.store.get(STORE_PROJECT_KEY, cached_version_id))
+        apply_project_delta(project_data, commit_response)
+        if cached_version_id != version_id:
+            self.store.move(STORE_PROJECT_KEY, cached_version_id, version_id)
+        else:
+            self.store.save(STORE_PROJECT_KEY, version_id, project_data)
+
+    async def get_projects(self, **kwargs) -> List[Dict]:
+        """
+        Returns the list of projects accessible to user.
+        :param kwargs: Additional keyword arguments to get_or_store
+        :return: List of projects.
+        """
+        print("...retrieving projects...")
+        result = await self.http_client.get("projects")
+        return cast(List[Dict], result)
+
+    async def get_project_versions(self, project_id: str) -> List[Dict]:
+        """
+        Retrieves the project versions for given project ID.
+        :param project_id: ID of project whose versions are to be retrieved.
+        :return: List of project versions objects.
+        """
+        print("...retrieving project versions...")
+        response = await self.http_client.get(f"projects/{project_id}/versions")
+        return cast(List[Dict], response)
+
+    async def commit(self, version_id: str, commit_data: DiffDataType) -> DiffDataType:
+        """
+        Commits data to version.
+        :param version_id: ID of version to save commit data to.
+        :param commit_data: Contains artifacts and trace links to modify.
+        :return: Commit response.
+        """
+        response = await self.http_client.post(f"projects/versions/{version_id}/commit", data=commit_data)  # type:ignore
+        return cast(DiffDataType, response)
+
+    async def summarize(self, version_id: str) -> Dict:
+        """
+        Summarizes project.
+        :param version_id: ID of version of artifacts to use.
+        :return: Job response.
+        """
+        print("...starting summarize project job...")
+        response = await self.http_client.post(f"projects/versions/{version_id}/summarize", data={})
+        return cast(Dict, response)
+
+    async def summarize_artifacts(self, version_id: str, artifact_ids: List[str]) -> List[Dict]:
+        """
+        Summarizes artifacts given.
+        :param version_id: ID of version containing artifacts.
+        :param artifact_ids: IDs of artifacts to summarize.
+        :return: The summarized artifacts.
+        """
+        print("...summarizing artifacts...")
+        endpoint = f"projects/versions/{version_id}/artifacts/summarize"
+        payload = {"artifacts": artifact_ids}
+        response = await self.http_client.post(endpoint, data=payload)
+        return cast(List[Dict], response)
+
+    async def summarize_artifacts_batched(self, version_id: str, artifact_ids: List[str], batch_size: int) -> List[Dict]:
+        """
+        Summarizes artifacts in batches submitted concurrently.
+        :param version_id: ID of version containing artifacts.
+        :param artifact_ids: IDs of artifacts to summarize.
+        :param batch_size: The maximum number of artifacts per request.
+        :return: The summarized artifacts.
+        """
+        batches = [artifact_ids[i:i + batch_size] for i in range(0, len(artifact_ids), batch_size)]
+        batch_responses = await asyncio.gather(*[self.summarize_artifacts(version_id, batch) for batch in batches])
+        return [a for batch_response in batch_responses for a in batch_response]
+
+    async def get_user_jobs(self) -> List[Dict]:
+        """
+        Retrieves list of jobs started by current user.
+        :return: List of jobs started by current user.
+        """
+        response = await self.http_client.get(f"jobs/user")
+        return cast(List[Dict], response)
+
+    async def get_job(self, job_id: str) -> Dict:
+        """
+        Retrieves job by ID.
+        :param job_id: ID of job.
+        :return: Job Dict.
+        """
+        jobs = await self.get_user_jobs()
+        job_query = [job for job in jobs if job["id"] == job_id]
+
+        if len(job_query) == 0:
+            raise Exception("Job not found in user jobs.")
+        job = job_query[0]
+        return job
+
+    async def wait_for_job(self, job_id: str) -> None:
+        """
+        Waits until jobs is finished.
+        :param job_id: ID of job to wait for.
+        :return: None
+        """
+        running = True
+        job = None
+        progress_bar = tqdm(desc="Waiting for Job...")
+        while running:
+            job = await self.get_job(job_id)
+            if job["status"] == "IN_PROGRESS":
+                await asyncio.sleep(2)
+                progress_bar.update()
+            else:
+                running = False
+        progress_bar.close()
+        job_status = "NOT STARTED" if job is None else job["status"]
+        print(f"Job finished with status: {job_status}")
+
+    async def create_version(self, project_id: str, version_type: str) -> Dict:
+        """
+        Creates new project version.
+        :param project_id: ID of project.
+        :param version_type: Type of version to create (e.g. major.minor.revision)
+        :return: Project version dict.
+        """
+        assert version_type in ["revision", "major", "minor"]
+        project_version = await self.http_client.post(f"projects/{project_id}/versions/{version_type}")
+        return cast(Dict, project_version)
+
+    async def search_by_prompt(self, query: str, version_id: str, search_types: List[str]) -> List[str]:
+        """
+        Searches artifacts against query.
+        :param query: The prompt used to search for related artifacts.
+        :param version_id: ID of the version of the project to search.
+        :param search_types: The types of artifacts to search in.
+        :return: Artifact Ids of related artifacts.
+        """
+        payload = {
+            "mode": "PROMPT",
+            "prompt": query,
+            "searchTypes": search_types
+        }
+        res = await self.http_client.post(f"search/{version_id}", payload)
+        return cast(List[str], res["artifactIds"])
+
+    async def create_project(self, name: str, description: str) -> Dict:
+        """
+        Creates new project.
+        :param name: Name of the project.
+        :param description: Description of the project.
+        :return: The request response.
+        """
+        payload = {"name": name, "description": description}
+        response = await self.http_client.post("projects", data=payload)
+        return cast(Dict, response)
+
+    async def delete_project(self, project_id: str) -> None:
+        """
+        Deletes project with given ID.
+        :param project_id: ID of project to delete.
+        :return: Response to request.
+        """
+        await self.http_client.delete(f"projects/{project_id}")
+
+    async def _get_or_store(self, entity_type: str, entity_id: str, get_lambda: Callable, use_store: bool = True) -> Dict:
+        """
+        Checks store for entity, if found returns it, otherwise get_lambda is awaited and processed.
+        :param entity_type: The type of entity being retrieved.
+        :param entity_id: ID of entity.
+        :param get_lambda: Coroutine function used to retrieve entity data.
+        :param use_store: Whether to use store to save results.
+        :return: The entity data.
+        """
+        if use_store and self.store.has(entity_type, entity_id):
+            return cast(Dict, self.store.get(entity_type, entity_id))
+        else:
+            entity_data = await get_lambda()
+            if use_store:
+                self.store.save(entity_type, entity_id, entity_data)
+            return cast(Dict, entity_data)
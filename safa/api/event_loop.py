@@ -0,0 +1,41 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the event loop shared by all SAFA clients, starting it in a background thread if necessary.
+    :return: The shared event loop.
+    """
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="safa-event-loop", daemon=True)
+            _loop_thread.start()
+        return _loop
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs coroutine on the shared event loop and blocks until it has finished.
+    :param coroutine: The coroutine to run.
+    :return: The result of the coroutine.
+    """
+    loop = get_event_loop()
+    if threading.current_thread() is _loop_thread:
+        coroutine.close()
+        raise Exception("Cannot block on the shared event loop from within itself, await the coroutine instead.")
+    future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
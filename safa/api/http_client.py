@@ -1,8 +1,11 @@
+import threading
 import traceback
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 import requests
 
+from safa.utils.profiler import span
+
 
 class HttpClient:
     def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None, global_parameters: Optional[Dict[str, Any]] = None):
@@ -14,8 +17,26 @@ class HttpClient:
         """
         self.base_url = base_url
         self.headers = headers if headers else {}
-        self.session = requests.Session()
+        self.cookies = requests.cookies.RequestsCookieJar()
+        self._thread_sessions = threading.local()
         self.global_parameters: Dict[str, str] = global_parameters if global_parameters else {}
+        self.on_unauthorized: Optional[Callable[[], None]] = None
+        self._auth_lock = threading.Lock()
+        self._n_reauthentications = 0
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Returns the session of the calling thread, creating one if necessary, since sessions are not thread-safe.
+        Sessions share the cookies of the client, whose jar is thread-safe.
+        :return: The session of the calling thread.
+        """
+        session = getattr(self._thread_sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.cookies = self.cookies
+            self._thread_sessions.session = session
+        return session
 
     def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """
@@ -62,21 +83,34 @@ class HttpClient:
         """
         if error is None:
             error = f"Could not find cookie {cookie_name}"
-        if cookie_name not in self.session.cookies:
+        if cookie_name not in self.cookies:
             raise Exception(error)
-        return self.session.cookies[cookie_name]
+        return self.cookies[cookie_name]
 
-    def _request(self, method: str, endpoint_rel_path: str, **kwargs) -> Any:
+    def _request(self, method: str, endpoint_rel_path: str, reauthenticate: bool = True, **kwargs) -> Any:
         """
         Performs an HTTP request.
+        If the session has expired, `on_unauthorized` is called to authenticate again and the request is retried once.
         :param method: The method of the request (e.g. POST, PUT, DELETE, GET)
         :param endpoint_rel_path: Relative path to endpoint from base url.
+        :param reauthenticate: Whether to authenticate again and retry if request is unauthorized.
         :param kwargs: Additional keyword arguments to request method.
         :return: JSON response to request.
         """
         url = f"{self.base_url}/{endpoint_rel_path}"
         kwargs.update(**self.global_parameters)
-        response = self.session.request(method, url, headers=self.headers, **kwargs)
+        n_reauthentications = self._n_reauthentications
+        with span(f"http.{method}", endpoint=endpoint_rel_path):
+            response = self.session.request(method, url, headers=self.headers, **kwargs)
+
+        if response.status_code == 401 and reauthenticate and self.on_unauthorized is not None:
+            with self._auth_lock:
+                if self._n_reauthentications == n_reauthentications:  # otherwise a concurrent request already did
+                    print("...session expired, logging in again...")
+                    self.on_unauthorized()
+                    self._n_reauthentications += 1
+            with span(f"http.{method}", endpoint=endpoint_rel_path):
+                response = self.session.request(method, url, headers=self.headers, **kwargs)
 
         try:
             response.raise_for_status()
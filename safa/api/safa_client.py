@@ -1,9 +1,8 @@
-import time
-from typing import Callable, Dict, List, Optional, cast
+from typing import Dict, List, Optional
 
-from tqdm import tqdm
-
-from safa.api.constants import SAFA_AUTH_TOKEN, STORE_PROJECT_KEY
+from safa.api.async_http_client import AsyncHttpClient
+from safa.api.async_safa_client import AsyncSafaClient
+from safa.api.event_loop import run_sync
 from safa.api.http_client import HttpClient
 from safa.api.safa_store import SafaStore
 from safa.config.safa_config import SafaConfig
@@ -15,6 +14,7 @@ class SafaClient:
     def __init__(self, http_client: HttpClient, store: Optional[SafaStore] = None):
         """
         Creates new client to interact with SAFA api.
+        Requests are performed by an asynchronous client running on the shared event loop.
         :param store: Used to store intermediate results.
         :param http_client: Client used to make HTTP requests.
         """
@@ -22,38 +22,65 @@ class SafaClient:
             store = SafaStore()
         self.http_client = http_client
         self.store = store
+        self.async_client = AsyncSafaClient(AsyncHttpClient(http_client), store=store)
 
     def login(self, config: Optional[SafaConfig] = None, email: Optional[str] = None, password: Optional[str] = None) -> None:
         """
-        Authenticates user using SAFA credentials.
+        Authenticates user using SAFA credentials, reusing the session token of a previous login while it is valid.
         :param config: Safa configuration.
         :param email: SAFA account email.
         :param password: SAFA account password.
         :return: Auth token.
         """
-        if config is None and (email is None or password is None):
-            raise Exception("Expected config or email and password.")
-        if config:
-            email = config.user_config.email
-            password = config.user_config.password
-        self.http_client.post("login", {"email": email, "password": password})
-        if SAFA_AUTH_TOKEN not in self.http_client.session.cookies:
-            raise Exception("Login failed, SAFA-TOKEN not found in cookies")
+        run_sync(self.async_client.login(config=config, email=email, password=password))
 
-    def get_version(self, version_id: str, **kwargs) -> Dict:
+    def get_version(self, version_id: str, base_version_id: Optional[str] = None, **kwargs) -> Dict:
         """
         Retrieves project with version ID.
         :param version_id: ID of version of project to retrieve.
+        :param base_version_id: ID of a cached version of the same project, only the changes since are retrieved.
         :param kwargs: Additional keyword arguments to get_or_store.
         :return: The project data.
         """
+        return run_sync(self.async_client.get_version(version_id, base_version_id=base_version_id, **kwargs))
 
-        def get_data():
-            print("...retrieving project data...")
-            project_data = self.http_client.get(f"projects/versions/{version_id}")
-            return project_data
+    def get_versions(self, version_ids: List[str], **kwargs) -> List[Dict]:
+        """
+        Retrieves many project versions concurrently.
+        :param version_ids: IDs of the versions to retrieve.
+        :param kwargs: Additional keyword arguments to get_version.
+        :return: The project data of each version, in the same order as given.
+        """
+        return run_sync(self.async_client.get_versions(version_ids, **kwargs))
+
+    def get_version_delta(self, base_version_id: str, version_id: str) -> DiffDataType:
+        """
+        Retrieves the changes made to project between two versions.
+        :param base_version_id: ID of the version to calculate changes from.
+        :param version_id: ID of the version to calculate changes to.
+        :return: The artifacts and traces added, modified, and removed.
+        """
+        return run_sync(self.async_client.get_version_delta(base_version_id, version_id))
 
-        return self._get_or_store(STORE_PROJECT_KEY, version_id, get_data, **kwargs)
+    def get_version_from_delta(self, base_version_id: str, version_id: str) -> Dict:
+        """
+        Constructs project data for version by applying changes since base version to its cached data.
+        :param base_version_id: ID of version whose data is cached.
+        :param version_id: ID of version to construct.
+        :return: The project data at version.
+        """
+        return run_sync(self.async_client.get_version_from_delta(base_version_id, version_id))
+
+    def apply_commit(self, version_id: str, commit_response: DiffDataType, base_version_id: Optional[str] = None) -> None:
+        """
+        Patches cached project data with commit response instead of retrieving the project again.
+        When base version is given, its cached data is moved to the committed version.
+        :param version_id: ID of version that commit was made to.
+        :param commit_response: The response to the commit containing the saved entities.
+        :param base_version_id: ID of cached version that committed version was created from.
+        :return: None
+        """
+        self.async_client.apply_commit(version_id, commit_response, base_version_id=base_version_id)
 
     def get_projects(self, **kwargs) -> List[Dict]:
         """
@@ -61,9 +88,7 @@ class SafaClient:
         :param kwargs: Additional keyword arguments to get_or_store
         :return: List of projects.
         """
-        print("...retrieving projects...")
-        result = self.http_client.get("projects")
-        return cast(List[Dict], result)
+        return run_sync(self.async_client.get_projects(**kwargs))
 
     def get_project_versions(self, project_id: str) -> List[Dict]:
         """
@@ -71,9 +96,7 @@ class SafaClient:
         :param project_id: ID of project whose versions are to be retrieved.
         :return: List of project versions objects.
         """
-        print("...retrieving project versions...")
-        response = self.http_client.get(f"projects/{project_id}/versions")
-        return cast(List[Dict], response)
+        return run_sync(self.async_client.get_project_versions(project_id))
 
     def commit(self, version_id: str, commit_data: DiffDataType) -> DiffDataType:
         """
@@ -82,36 +105,41 @@ class SafaClient:
         :param commit_data: Contains artifacts and trace links to modify.
         :return: Commit response.
         """
-        response = self.http_client.post(f"projects/versions/{version_id}/commit", data=commit_data)  # type:ignore
-        return cast(DiffDataType, response)
+        return run_sync(self.async_client.commit(version_id, commit_data))
 
-    def summarize(self, version_id: str):
+    def summarize(self, version_id: str) -> Dict:
         """
         Summarizes project.
         :param version_id: ID of version of artifacts to use.
         :return: Job response.
         """
-        print("...starting summarize project job...")
-        response = self.http_client.post(f"projects/versions/{version_id}/summarize", data={})
-        return cast(Dict, response)
+        return run_sync(self.async_client.summarize(version_id))
 
-    def summarize_artifacts(self, version_id: str, artifact_ids: List[str]):
+    def summarize_artifacts(self, version_id: str, artifact_ids: List[str]) -> List[Dict]:
         """
         Summarizes artifacts given.
-        :return:
+        :param version_id: ID of version containing artifacts.
+        :param artifact_ids: IDs of artifacts to summarize.
+        :return: The summarized artifacts.
         """
-        print("...summarizing artifacts...")
-        endpoint = f"projects/versions/{version_id}/artifacts/summarize"
-        payload = {"artifacts": artifact_ids}
-        return self.http_client.post(endpoint, data=payload)
+        return run_sync(self.async_client.summarize_artifacts(version_id, artifact_ids))
+
+    def summarize_artifacts_batched(self, version_id: str, artifact_ids: List[str], batch_size: int) -> List[Dict]:
+        """
+        Summarizes artifacts in batches submitted concurrently.
+        :param version_id: ID of version containing artifacts.
+        :param artifact_ids: IDs of artifacts to summarize.
+        :param batch_size: The maximum number of artifacts per request.
+        :return: The summarized artifacts.
+        """
+        return run_sync(self.async_client.summarize_artifacts_batched(version_id, artifact_ids, batch_size))
 
     def get_user_jobs(self) -> List[Dict]:
         """
         Retrieves list of jobs started by current user.
         :return: List of jobs started by current user.
         """
-        response = self.http_client.get(f"jobs/user")
-        return cast(List[Dict], response)
+        return run_sync(self.async_client.get_user_jobs())
 
     def get_job(self, job_id: str) -> Dict:
         """
@@ -119,33 +147,15 @@ class SafaClient:
         :param job_id: ID of job.
         :return: Job Dict.
         """
-        jobs = self.get_user_jobs()
-        job_query = [job for job in jobs if job["id"] == job_id]
-
-        if len(job_query) == 0:
-            raise Exception("Job not found in user jobs.")
-        job = job_query[0]
-        return job
+        return run_sync(self.async_client.get_job(job_id))
 
-    def wait_for_job(self, job_id: str):
+    def wait_for_job(self, job_id: str) -> None:
         """
         Waits until jobs is finished.
-        :param job_id:
-        :return:
-        """
-        running = True
-        job = None
-        progress_bar = tqdm(desc="Waiting for Job...")
-        while running:
-            job = self.get_job(job_id)
-            if job["status"] == "IN_PROGRESS":
-                time.sleep(2)
-                progress_bar.update()
-            else:
-                running = False
-        progress_bar.close()
-        job_status = "NOT STARTED" if job is None else job["status"]
-        print(f"Job finished with status: {job_status}")
+        :param job_id: ID of job to wait for.
+        :return: None
+        """
+        run_sync(self.async_client.wait_for_job(job_id))
 
     def create_version(self, project_id: str, version_type: str) -> Dict:
         """
@@ -154,9 +164,7 @@ class SafaClient:
         :param version_type: Type of version to create (e.g. major.minor.revision)
         :return: Project version dict.
         """
-        assert version_type in ["revision", "major", "minor"]
-        project_version = self.http_client.post(f"projects/{project_id}/versions/{version_type}")
-        return cast(Dict, project_version)
+        return run_sync(self.async_client.create_version(project_id, version_type))
 
     def search_by_prompt(self, query: str, version_id: str, search_types: List[str]) -> List[str]:
         """
@@ -166,13 +174,7 @@ class SafaClient:
         :param search_types: The types of artifacts to search in.
         :return: Artifact Ids of related artifacts.
         """
-        payload = {
-            "mode": "PROMPT",
-            "prompt": query,
-            "searchTypes": search_types
-        }
-        res = self.http_client.post(f"search/{version_id}", payload)
-        return cast(List[str], res["artifactIds"])
+        return run_sync(self.async_client.search_by_prompt(query, version_id, search_types))
 
     def create_project(self, name: str, description: str) -> Dict:
         """
@@ -181,9 +183,7 @@ class SafaClient:
         :param description: Description of the project.
         :return: The request response.
         """
-        payload = {"name": name, "description": description}
-        response = self.http_client.post("projects", data=payload)
-        return cast(Dict, response)
+        return run_sync(self.async_client.create_project(name, description))
 
     def delete_project(self, project_id: str) -> None:
         """
@@ -191,21 +191,4 @@ class SafaClient:
         :param project_id: ID of project to delete.
         :return: Response to request.
         """
-        self.http_client.delete(f"projects/{project_id}")
-
-    def _get_or_store(self, entity_type: str, entity_id: str, get_lambda: Callable, use_store: bool = True) -> Dict:
-        """
-        Checks store for entity, if found returns it, otherwise get_lambda is called and processed.
-        :param entity_type: The type of entity being retrieved.
-        :param entity_id: ID of entity.
-        :param get_lambda: Callable used to retrieve entity data.
-        :param use_store: Whether to use store to save results.
-        :return: The entity data.
-        """
-        if use_store and self.store.has(entity_type, entity_id):
-            return cast(Dict, self.store.get(entity_type, entity_id))
-        else:
-            entity_data = get_lambda()
-            if use_store:
-                self.store.save(entity_type, entity_id, entity_data)
-            return cast(Dict, entity_data)
+        run_sync(self.async_client.delete_project(project_id))
@@ -1,5 +1,7 @@
 import json
-from typing import Any, Dict, Optional
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
 
 from safa.api.constants import STORE_ENTITIES
 from safa.utils.fs import read_json_file
@@ -16,6 +18,8 @@ class SafaStore:
         """
         self.cache_file_path = cache_file_path
         self.project_data = self.__create_empty_data()
+        self._write_deferrals = 0
+        self._has_pending_write = False
         self.__load_cache_file()
 
     def has(self, entity_type: str, entity_id: str, assert_has: bool = False) -> bool:
@@ -67,15 +71,56 @@ class SafaStore:
         del self.project_data[entity_type][entity_id]
         self.__write_to_disk()
 
+    def move(self, entity_type: str, entity_id: str, new_entity_id: str) -> None:
+        """
+        Moves entity data to new ID.
+        :param entity_type: Type of entity.
+        :param entity_id: Current ID of entity.
+        :param new_entity_id: ID to store entity data under.
+        :return: None
+        """
+        self.__has_entity_type(entity_type, assert_has=True)
+        self.project_data[entity_type][new_entity_id] = self.project_data[entity_type].pop(entity_id)
+        self.__write_to_disk()
+
+    @contextmanager
+    def defer_writes(self) -> Iterator[None]:
+        """
+        Defers writing store to disk until the outermost context exits, even if exited by an error.
+        :return: Context in which writes are deferred.
+        """
+        self._write_deferrals += 1
+        try:
+            yield
+        finally:
+            self._write_deferrals -= 1
+            if self._write_deferrals == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes store to disk if it changed while writes were deferred.
+        :return: None
+        """
+        if not self._has_pending_write:
+            return
+        self._has_pending_write = False
+        self.__write_to_disk()
+
     def __write_to_disk(self) -> None:
         """
-        Writes store data to cache location.
+        Writes store data to cache location, only readable by the current user since it contains session tokens.
+        While writes are deferred, the write is postponed until the store is flushed.
         :return: None
         """
         if self.cache_file_path is None:
             return
-        with open(self.cache_file_path, "w") as f:
+        if self._write_deferrals > 0:
+            self._has_pending_write = True
+            return
+        with open(os.open(self.cache_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
             f.write(json.dumps(self.project_data, indent=4))
+        os.chmod(self.cache_file_path, 0o600)
 
     def __load_cache_file(self) -> None:
         """
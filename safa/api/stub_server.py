@@ -0,0 +1,500 @@
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from safa.api.constants import SAFA_AUTH_TOKEN
+from safa.constants import SAFA_DATETIME_FORMAT
+from safa.data.commits import DiffDataType, create_empty_diff
+
+StubResponse = Tuple[int, Any]
+RouteHandler = Callable[..., StubResponse]
+
+STUB_AUTH_TOKEN = "stub-token"
+STUB_ARTIFACT_TYPES = ["Code", "Commit"]
+STUB_REQUEST_LATENCY = float(os.environ.get("SAFA_STUB_REQUEST_LATENCY", 0))
+STUB_JOB_LATENCY = float(os.environ.get("SAFA_STUB_JOB_LATENCY", 0))
+STUB_FAILURE_RATE = float(os.environ.get("SAFA_STUB_FAILURE_RATE", 0))
+
+
+class StubSafaApi:
+    def __init__(self, request_latency: float = STUB_REQUEST_LATENCY, job_latency: float = STUB_JOB_LATENCY,
+                 failure_rate: float = STUB_FAILURE_RATE, seed: Optional[int] = None):
+        """
+        Creates in-memory stand-in of the SAFA API storing projects and their versions.
+        Every request is counted per route so that callers can measure how chatty an operation is.
+        :param request_latency: Seconds each request waits before being handled.
+        :param job_latency: Seconds a summarization job stays in progress.
+        :param failure_rate: Fraction of authenticated requests that fail with a server error.
+        :param seed: Seed used to decide which requests fail.
+        """
+        self.request_latency = request_latency
+        self.job_latency = job_latency
+        self.failure_rate = failure_rate
+        self.projects: Dict[str, Dict] = {}
+        self.versions: Dict[str, Dict] = {}
+        self.version_artifacts: Dict[str, Dict[str, Dict]] = {}
+        self.version_traces: Dict[str, Dict[str, Dict]] = {}
+        self.jobs: List[Dict] = []
+        self.request_counts: Counter = Counter()
+        self.failure_counts: Counter = Counter()
+        self._job_completions: Dict[str, Tuple[float, str]] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes: List[Tuple[str, re.Pattern, str, RouteHandler]] = []
+        self._add_route("POST", r"login", self.login)
+        self._add_route("GET", r"projects", self.get_projects)
+        self._add_route("POST", r"projects", self.create_project)
+        self._add_route("DELETE", r"projects/(?P<project_id>[^/]+)", self.delete_project)
+        self._add_route("GET", r"projects/versions/(?P<version_id>[^/]+)", self.get_version)
+        self._add_route("GET", r"projects/delta/(?P<base_version_id>[^/]+)/(?P<version_id>[^/]+)", self.get_version_delta)
+        self._add_route("GET", r"projects/(?P<project_id>[^/]+)/versions", self.get_project_versions)
+        self._add_route("POST", r"projects/(?P<project_id>[^/]+)/versions/(?P<version_type>major|minor|revision)",
+                        self.create_version)
+        self._add_route("POST", r"projects/versions/(?P<version_id>[^/]+)/commit", self.commit)
+        self._add_route("POST", r"projects/versions/(?P<version_id>[^/]+)/summarize", self.summarize)
+        self._add_route("POST", r"projects/versions/(?P<version_id>[^/]+)/artifacts/summarize", self.summarize_artifacts)
+        self._add_route("GET", r"jobs/user", self.get_user_jobs)
+        self._add_route("POST", r"search/(?P<version_id>[^/]+)", self.search)
+
+    def handle(self, method: str, path: str, body: Optional[Dict], cookies: Dict[str, str]) -> StubResponse:
+        """
+        Routes request to its handler.
+        :param method: The HTTP method of the request.
+        :param path: The path of the request relative to the base url.
+        :param body: The JSON body of the request.
+        :param cookies: The cookies sent with request.
+        :return: The status code and JSON body of response.
+        """
+        path = path.strip("/").split("?")[0]
+        if self.request_latency > 0:
+            time.sleep(self.request_latency)
+        for route_method, route_pattern, route_name, route_handler in self._routes:
+            route_match = route_pattern.fullmatch(path)
+            if route_method != method or route_match is None:
+                continue
+            with self._lock:
+                self.request_counts[route_name] += 1
+                if route_handler == self.login:
+                    return route_handler(body or {})
+                if cookies.get(SAFA_AUTH_TOKEN) != STUB_AUTH_TOKEN:
+                    return 401, {"message": "Not authenticated."}
+                if self.failure_rate > 0 and self._rng.random() < self.failure_rate:
+                    self.failure_counts[route_name] += 1
+                    return 503, {"message": "Simulated failure."}
+                self._complete_jobs()
+                return route_handler(body or {}, **route_match.groupdict())
+        return 404, {"message": f"No route for {method} {path}."}
+
+    def login(self, body: Dict) -> StubResponse:
+        """
+        Accepts any credentials.
+        :param body: Contains email and password.
+        :return: Empty response, the authentication cookie is set by the server.
+        """
+        return 200, {}
+
+    def get_projects(self, body: Dict) -> StubResponse:
+        """
+        :param body: Ignored.
+        :return: The list of projects.
+        """
+        return 200, [self._get_project_json(p_id) for p_id in self.projects.keys()]
+
+    def create_project(self, body: Dict) -> StubResponse:
+        """
+        Creates project with an empty initial version.
+        :param body: Contains name and description of project.
+        :return: The project and its initial version.
+        """
+        project_id = str(uuid.uuid4())
+        self.projects[project_id] = {"projectId": project_id, "name": body["name"], "description": body.get("description", "")}
+        project_version = self._add_version(project_id, (1, 0, 0))
+        return 200, {**self._get_project_json(project_id), "projectVersion": project_version}
+
+    def delete_project(self, body: Dict, project_id: str) -> StubResponse:
+        """
+        Deletes project and its versions.
+        :param body: Ignored.
+        :param project_id: ID of project to delete.
+        :return: Empty response.
+        """
+        if project_id not in self.projects:
+            return 404, {"message": f"Project {project_id} does not exist."}
+        del self.projects[project_id]
+        for version_id in [v_id for v_id, v in self.versions.items() if v["projectId"] == project_id]:
+            del self.versions[version_id]
+            del self.version_artifacts[version_id]
+            del self.version_traces[version_id]
+        return 200, {}
+
+    def get_project_versions(self, body: Dict, project_id: str) -> StubResponse:
+        """
+        :param body: Ignored.
+        :param project_id: ID of project whose versions are returned.
+        :return: The versions of the project.
+        """
+        return 200, [v for v in self.versions.values() if v["projectId"] == project_id]
+
+    def create_version(self, body: Dict, project_id: str, version_type: str) -> StubResponse:
+        """
+        Creates version containing a copy of the latest version's entities.
+        :param body: Ignored.
+        :param project_id: ID of project to create version in.
+        :param version_type: One of major, minor, or revision.
+        :return: The created version.
+        """
+        latest_version = self._get_latest_version(project_id)
+        major, minor, revision = latest_version["majorVersion"], latest_version["minorVersion"], latest_version["revision"]
+        if version_type == "major":
+            version_numbers = (major + 1, 0, 0)
+        elif version_type == "minor":
+            version_numbers = (major, minor + 1, 0)
+        else:
+            version_numbers = (major, minor, revision + 1)
+        project_version = self._add_version(project_id, version_numbers, base_version_id=latest_version["versionId"])
+        return 200, project_version
+
+    def get_version(self, body: Dict, version_id: str) -> StubResponse:
+        """
+        :param body: Ignored.
+        :param version_id: ID of version to retrieve.
+        :return: The project data at version.
+        """
+        if version_id not in self.versions:
+            return 404, {"message": f"Version {version_id} does not exist."}
+        project_version = self.versions[version_id]
+        project = self.projects[project_version["projectId"]]
+        return 200, {
+            **self._get_project_json(project["projectId"]),
+            "projectVersion": project_version,
+            "specification": project.get("specification"),
+            "artifactTypes": [{"name": t} for t in STUB_ARTIFACT_TYPES],
+            "artifacts": list(self.version_artifacts[version_id].values()),
+            "traces": list(self.version_traces[version_id].values())
+        }
+
+    def get_version_delta(self, body: Dict, base_version_id: str, version_id: str) -> StubResponse:
+        """
+        Calculates entities changed between versions.
+        :param body: Ignored.
+        :param base_version_id: ID of version to calculate changes from.
+        :param version_id: ID of version to calculate changes to.
+        :return: The added, modified, and removed entities.
+        """
+        if base_version_id not in self.versions or version_id not in self.versions:
+            return 404, {"message": "Version does not exist."}
+        return 200, {
+            "artifacts": self._calculate_delta(self.version_artifacts[base_version_id], self.version_artifacts[version_id]),
+            "traces": self._calculate_delta(self.version_traces[base_version_id], self.version_traces[version_id])
+        }
+
+    def commit(self, body: DiffDataType, version_id: str) -> StubResponse:
+        """
+        Saves changes to version, assigning ids to new entities.
+        :param body: The commit request.
+        :param version_id: ID of version to commit to.
+        :return: The committed entities with their ids.
+        """
+        artifacts = self.version_artifacts[version_id]
+        traces = self.version_traces[version_id]
+        response = create_empty_diff()
+
+        for mod_type in ["added", "modified"]:
+            for artifact in body["artifacts"][mod_type]:  # type: ignore
+                saved_artifact = {**artifact, "id": artifacts.get(artifact["name"], artifact).get("id", str(uuid.uuid4()))}
+                artifacts[artifact["name"]] = saved_artifact
+                response["artifacts"][mod_type].append(saved_artifact)  # type: ignore
+        for artifact in body["artifacts"]["removed"]:
+            removed_artifact = artifacts.pop(artifact["name"], artifact)
+            response["artifacts"]["removed"].append(removed_artifact)
+
+        for mod_type in ["added", "modified"]:
+            for trace in body["traces"][mod_type]:  # type: ignore
+                trace_key = f"{trace['sourceName']}*{trace['targetName']}"
+                trace_id = traces[trace_key]["traceLinkId"] if trace_key in traces else str(uuid.uuid4())
+                saved_trace = {**trace,
+                               "traceLinkId": trace_id,
+                               "sourceId": artifacts.get(trace["sourceName"], {}).get("id"),
+                               "targetId": artifacts.get(trace["targetName"], {}).get("id")}
+                traces[trace_key] = saved_trace
+                response["traces"][mod_type].append(saved_trace)  # type: ignore
+        for trace in body["traces"]["removed"]:
+            removed_trace = traces.pop(f"{trace['sourceName']}*{trace['targetName']}", trace)
+            response["traces"]["removed"].append(removed_trace)
+
+        return 200, response
+
+    def summarize(self, body: Dict, version_id: str) -> StubResponse:
+        """
+        Starts job summarizing every artifact in version. Summaries are saved once job completes.
+        :param body: Ignored.
+        :param version_id: ID of version to summarize.
+        :return: The summarization job.
+        """
+        job = {
+            "id": str(uuid.uuid4()),
+            "name": "Project Summarization",
+            "status": "IN_PROGRESS",
+            "startedAt": datetime.now().strftime(SAFA_DATETIME_FORMAT)
+        }
+        self.jobs.append(job)
+        self._job_completions[job["id"]] = (time.monotonic() + self.job_latency, version_id)
+        self._complete_jobs()
+        return 200, job
+
+    def summarize_artifacts(self, body: Dict, version_id: str) -> StubResponse:
+        """
+        Summarizes artifacts with given ids without saving summaries.
+        :param body: Contains the ids of the artifacts to summarize.
+        :param version_id: ID of version containing artifacts.
+        :return: The summary of each artifact.
+        """
+        id2artifact = {a["id"]: a for a in self.version_artifacts[version_id].values()}
+        return 200, [{"id": a_id, "summary": self.create_summary(id2artifact[a_id])}
+                     for a_id in body["artifacts"] if a_id in id2artifact]
+
+    def get_user_jobs(self, body: Dict) -> StubResponse:
+        """
+        :param body: Ignored.
+        :return: Jobs started by user.
+        """
+        return 200, self.jobs
+
+    def search(self, body: Dict, version_id: str) -> StubResponse:
+        """
+        Finds artifacts containing the words in prompt.
+        :param body: Contains prompt and the artifact types to search.
+        :param version_id: ID of version to search.
+        :return: IDs of artifacts matching prompt.
+        """
+        query_words = set(body["prompt"].lower().split())
+        search_types = body.get("searchTypes") or STUB_ARTIFACT_TYPES
+        artifact_ids = [a["id"] for a in self.version_artifacts[version_id].values()
+                        if a["type"] in search_types and query_words & set(f"{a['summary']} {a['body']}".lower().split())]
+        return 200, {"artifactIds": artifact_ids}
+
+    def get_request_count(self) -> int:
+        """
+        :return: The total number of requests received.
+        """
+        return sum(self.request_counts.values())
+
+    def _complete_jobs(self) -> None:
+        """
+        Completes jobs whose latency has passed, saving the summaries of their version.
+        :return: None
+        """
+        now = time.monotonic()
+        for job in self.jobs:
+            if job["id"] not in self._job_completions:
+                continue
+            completes_at, version_id = self._job_completions[job["id"]]
+            if now < completes_at:
+                continue
+            del self._job_completions[job["id"]]
+            for artifact in self.version_artifacts.get(version_id, {}).values():
+                artifact["summary"] = self.create_summary(artifact)
+            job["status"] = "COMPLETED"
+
+    @staticmethod
+    def create_summary(artifact: Dict) -> str:
+        """
+        Creates deterministic summary of artifact.
+        :param artifact: The artifact to summarize.
+        :return: The summary.
+        """
+        first_line = next((line.strip() for line in artifact.get("body", "").splitlines() if line.strip()), "")
+        return f"{artifact['name']} ({artifact['type']}): {first_line[:80]}"
+
+    def _add_route(self, method: str, path_pattern: str, handler: RouteHandler) -> None:
+        """
+        Registers handler for requests matching method and path.
+        :param method: The HTTP method.
+        :param path_pattern: Regular expression matching the path relative to base url.
+        :param handler: Function receiving the request body and path parameters.
+        :return: None
+        """
+        route_path = re.sub(r"\(\?P<(\w+)>[^)]+\)", r"{\1}", path_pattern)
+        route_name = f"{method} {route_path}"
+        self._routes.append((method, re.compile(path_pattern), route_name, handler))
+
+    def _add_version(self, project_id: str, version_numbers: Tuple[int, int, int], base_version_id: Optional[str] = None) -> Dict:
+        """
+        Creates version of project.
+        :param project_id: ID of project.
+        :param version_numbers: The major, minor, and revision numbers.
+        :param base_version_id: ID of version whose entities are copied into new version.
+        :return: The version created.
+        """
+        version_id = str(uuid.uuid4())
+        major, minor, revision = version_numbers
+        project_version = {"versionId": version_id, "projectId": project_id,
+                           "majorVersion": major, "minorVersion": minor, "revision": revision}
+        self.versions[version_id] = project_version
+        base_artifacts = self.version_artifacts[base_version_id] if base_version_id else {}
+        self.version_artifacts[version_id] = {name: {**a} for name, a in base_artifacts.items()}
+        self.version_traces[version_id] = dict(self.version_traces[base_version_id]) if base_version_id else {}
+        return project_version
+
+    def _get_latest_version(self, project_id: str) -> Dict:
+        """
+        :param project_id: ID of project.
+        :return: The version with the highest version numbers.
+        """
+        project_versions = [v for v in self.versions.values() if v["projectId"] == project_id]
+        return max(project_versions, key=lambda v: (v["majorVersion"], v["minorVersion"], v["revision"]))
+
+    def _get_project_json(self, project_id: str) -> Dict:
+        """
+        :param project_id: ID of project.
+        :return: Project identifiers and description.
+        """
+        project = self.projects[project_id]
+        return {"projectId": project_id, "name": project["name"], "description": project["description"]}
+
+    @staticmethod
+    def _calculate_delta(base_entities: Dict[str, Dict], entities: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """
+        Compares entities across versions.
+        :param base_entities: Map of entity key to entity in base version.
+        :param entities: Map of entity key to entity in target version.
+        :return: The added, modified, and removed entities.
+        """
+        return {
+            "added": [e for k, e in entities.items() if k not in base_entities],
+            "modified": [e for k, e in entities.items() if k in base_entities and base_entities[k] != e],
+            "removed": [e for k, e in base_entities.items() if k not in entities]
+        }
+
+
+class StubSafaServer:
+    def __init__(self, api: Optional[StubSafaApi] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Creates HTTP server serving stub API in a background thread.
+        :param api: The stub API to serve, a new one is created if none is given.
+        :param host: The host to bind to.
+        :param port: The port to bind to, zero picks a free port.
+        """
+        self.api = api if api else StubSafaApi()
+        self.server = ThreadingHTTPServer((host, port), self._create_handler(self.api))
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        :return: The URL that clients should use as base url.
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> "StubSafaServer":
+        """
+        Starts serving requests in a background thread.
+        :return: The started server.
+        """
+        self._thread = threading.Thread(target=self.server.serve_forever, name="safa-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops serving requests.
+        :return: None
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "StubSafaServer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    @staticmethod
+    def _create_handler(api: StubSafaApi) -> type:
+        """
+        Creates request handler class forwarding requests to API.
+        :param api: The stub API handling requests.
+        :return: The request handler class.
+        """
+
+        class StubRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+            def do_PUT(self) -> None:
+                self._handle("PUT")
+
+            def do_DELETE(self) -> None:
+                self._handle("DELETE")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # requests are counted by the api instead
+
+            def _handle(self, method: str) -> None:
+                content_length = int(self.headers.get("Content-Length", 0))
+                request_content = self.rfile.read(content_length) if content_length > 0 else b""
+                body = json.loads(request_content) if request_content else None
+                cookies = dict(c.strip().split("=", 1) for c in self.headers.get("Cookie", "").split(";") if "=" in c)
+
+                status, response_body = api.handle(method, self.path, body, cookies)
+
+                response_content = json.dumps(response_body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response_content)))
+                if self.path.strip("/") == "login" and status == 200:
+                    self.send_header("Set-Cookie", f"{SAFA_AUTH_TOKEN}={STUB_AUTH_TOKEN}; Path=/; HttpOnly")
+                self.end_headers()
+                self.wfile.write(response_content)
+
+        return StubRequestHandler
+
+
+def main() -> None:
+    """
+    Serves stub API until interrupted.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Serves an in-memory stand-in of the SAFA API.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=8080, help="Port to bind to")
+    parser.add_argument("--request-latency", type=float, default=STUB_REQUEST_LATENCY, help="Seconds each request waits")
+    parser.add_argument("--job-latency", type=float, default=STUB_JOB_LATENCY, help="Seconds jobs stay in progress")
+    parser.add_argument("--failure-rate", type=float, default=STUB_FAILURE_RATE, help="Fraction of requests that fail")
+    parser.add_argument("--seed", type=int, help="Seed used to decide which requests fail")
+    args = parser.parse_args()
+
+    api = StubSafaApi(request_latency=args.request_latency, job_latency=args.job_latency, failure_rate=args.failure_rate,
+                      seed=args.seed)
+    server = StubSafaServer(api, host=args.host, port=args.port)
+    print(f"Stub SAFA API listening, point safa at it with: export SAFA_BASE_URL={server.base_url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+        print(f"Requests served: {dict(api.request_counts)}")
+        print(f"Simulated failures: {dict(api.failure_counts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import os
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Generic, List, Type, TypeVar
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Generic, Iterator, List, Type, TypeVar
 
 from safa.config.factory import ConfigFactory
 
@@ -11,6 +12,8 @@ ConfigType = TypeVar("ConfigType", bound="BaseConfig")
 @dataclass(repr=False)
 class BaseConfig(Generic[ConfigType], ABC):
     config_dir_path: str
+    _write_deferrals: int = field(default=0, init=False, repr=False, compare=False)
+    _has_pending_write: bool = field(default=False, init=False, repr=False, compare=False)
 
     @staticmethod
     @abstractmethod
@@ -40,11 +43,44 @@ class BaseConfig(Generic[ConfigType], ABC):
     def save(self) -> None:
         """
         Extracts properties from config and writes them as ENV file.
-        :param env_file_path: Path to save env file.
+        While writes are deferred, the write is postponed until the config is flushed.
         :return: None
         """
+        if self.is_deferring_writes():
+            self._has_pending_write = True
+            return
         ConfigFactory.save(self, self.get_file_path())
 
+    def flush(self) -> None:
+        """
+        Writes config to ENV file if changes were saved while writes were deferred.
+        :return: None
+        """
+        if not self._has_pending_write:
+            return
+        self._has_pending_write = False
+        ConfigFactory.save(self, self.get_file_path())
+
+    def is_deferring_writes(self) -> bool:
+        """
+        :return: Whether saves are currently being deferred.
+        """
+        return self._write_deferrals > 0
+
+    @contextmanager
+    def defer_writes(self) -> Iterator[None]:
+        """
+        Defers writing config to disk until the outermost context exits, even if exited by an error.
+        :return: Context in which saves are deferred.
+        """
+        self._write_deferrals += 1
+        try:
+            yield
+        finally:
+            self._write_deferrals -= 1
+            if self._write_deferrals == 0:
+                self.flush()
+
     def is_configured(self) -> bool:
         """
         :return: Whether config has values for all properties.
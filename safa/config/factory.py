@@ -1,7 +1,7 @@
 import os
 from typing import Dict, Generic, List, Type, TypeVar
 
-from safa.utils.fs import read_file, write_file_content
+from safa.utils.fs import read_file, write_file_atomic
 
 ConfigType = TypeVar("ConfigType")
 
@@ -24,7 +24,7 @@ class ConfigFactory(Generic[ConfigType]):
         if len(env_line_items) == 0:
             return
         env_content = "\n".join(env_line_items)
-        write_file_content(env_file_path, env_content)
+        write_file_atomic(env_file_path, env_content)
 
     @staticmethod
     def create(obj: Type[ConfigType], **kwargs) -> ConfigType:
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import List
 
 from safa.config.base_config import BaseConfig
-from safa.constants import LLM_ENV_FILE
+from safa.constants import DEFAULT_LLM_ROUTES, LLM_ENV_FILE
 
 
 @dataclass(repr=False)
@@ -10,9 +10,11 @@ class LLMConfig(BaseConfig):
     """
     :param llm_provider: Currently only supporting anthropic.
     :param llm_key: Key to LLM provider.
+    :param llm_routes: Models used for each prompt size as `model:max_prompt_tokens,...,model`.
     """
     llm_key: str
     llm_provider: str = "anthropic"
+    llm_routes: str = DEFAULT_LLM_ROUTES
 
     @staticmethod
     def get_file_name() -> str:
@@ -20,7 +22,7 @@ class LLMConfig(BaseConfig):
 
     @staticmethod
     def get_display_properties() -> List[str]:
-        return ["llm_provider"]
+        return ["llm_provider", "llm_routes"]
 
     def set_key(self, llm_key: str) -> None:
         """
@@ -73,8 +73,15 @@ class ProjectConfig(BaseConfig):
         self.commit_id = commit_id
 
         self.save()
-        if self.version_id:
-            print(f"New project has been set: https://app.safa.ai/versions/{self.version_id}")
+        if self.version_id and not self.is_deferring_writes():
+            self.print_version_url()
+
+    def print_version_url(self) -> None:
+        """
+        Prints link to the current project version.
+        :return: None
+        """
+        print(f"New project has been set: https://app.safa.ai/versions/{self.version_id}")
 
     def clear_project(self) -> None:
         """
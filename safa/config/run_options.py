@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Optional
+
+SINCE_LAST_COMMITS = "since-last"
+
+
+@dataclass
+class RunOptions:
+    """
+    Options given on the command line for the current run, they are not saved.
+    :param commits: Commits to push, either `since-last` or a git revision range (e.g. main~3..main).
+    Defaults to `since-last` when not interactive.
+    :param version_type: The type of version created when pushing a single commit (major, minor, or revision).
+    Defaults to revision when not interactive.
+    :param yes: Whether to answer yes to confirmations.
+    :param auto_commit: Whether the committer commits its generated message without opening the commit menu.
+    The committer also does so when answering yes to confirmations.
+    :param update_summary: Whether to summarize the project after pushing. Defaults to False when not interactive.
+    """
+    commits: Optional[str] = None
+    version_type: Optional[str] = None
+    yes: bool = False
+    auto_commit: bool = False
+    update_summary: bool = False
+
+    def is_interactive(self) -> bool:
+        """
+        :return: Whether the user may be prompted for input.
+        """
+        return not self.yes and not self.auto_commit
+
+    def confirm(self) -> Optional[bool]:
+        """
+        :return: True if confirmations are answered by options, None if user should be prompted.
+        Confirmations are answered yes whenever the user may not be prompted.
+        """
+        return None if self.is_interactive() else True
+
+    def confirm_update_summary(self) -> Optional[bool]:
+        """
+        :return: Whether to summarize project after push, None if user should be prompted.
+        """
+        if self.update_summary:
+            return True
+        return None if self.is_interactive() else False
@@ -1,6 +1,7 @@
 import os
-from dataclasses import dataclass
-from typing import List, Optional, cast
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, cast
 
 from dotenv import load_dotenv
 
@@ -8,8 +9,10 @@ from safa.config.base_config import BaseConfig
 from safa.config.llm_config import LLMConfig
 from safa.config.project_config import ProjectConfig
 from safa.config.repo_config import RepoConfig
+from safa.config.run_options import RunOptions
 from safa.config.user_config import UserConfig
-from safa.constants import CACHE_FILE, CONFIG_FOLDER, VECTOR_STORE_FOLDER_NAME
+from safa.constants import CACHE_FILE, CONFIG_FOLDER, DAEMON_SOCKET_FILE, PUSH_JOURNAL_FILE, SPEC_STORE_FOLDER_NAME, \
+    SUMMARY_CACHE_FILE, USAGE_FILE, VECTOR_STORE_FOLDER_NAME
 
 
 @dataclass(repr=False)
@@ -19,6 +22,7 @@ class SafaConfig:
     project_config: ProjectConfig
     llm_config: LLMConfig
     config_dir_path: str
+    run_options: RunOptions = field(default_factory=RunOptions)
     _registered_configs = ["repo_config", "user_config", "project_config", "llm_config"]
 
     def __repr__(self) -> str:
@@ -38,6 +42,25 @@ class SafaConfig:
             config.save()
         print("Safa configuration has been saved.")
 
+    @contextmanager
+    def defer_writes(self) -> Iterator[None]:
+        """
+        Defers writing child-configs to disk until context exits.
+        :return: Context in which saves are deferred.
+        """
+        with ExitStack() as stack:
+            for config_name in self._registered_configs:
+                stack.enter_context(self.get_config(config_name).defer_writes())
+            yield
+
+    def flush(self) -> None:
+        """
+        Writes child-configs with changes saved while writes were deferred.
+        :return: None
+        """
+        for config_name in self._registered_configs:
+            self.get_config(config_name).flush()
+
     def is_configured(self) -> bool:
         """
         Whether all necessary SAFA variables are configured.
@@ -70,6 +93,36 @@ class SafaConfig:
         """
         return os.path.join(self.config_dir_path, CACHE_FILE)
 
+    def get_push_journal_path(self) -> str:
+        """
+        :return: Returns path to journal of the current push.
+        """
+        return os.path.join(self.config_dir_path, PUSH_JOURNAL_FILE)
+
+    def get_daemon_socket_path(self) -> str:
+        """
+        :return: Returns path to socket of the commit message daemon.
+        """
+        return os.path.join(self.config_dir_path, DAEMON_SOCKET_FILE)
+
+    def get_summary_cache_path(self) -> str:
+        """
+        :return: Returns path to cache of the summaries generated for staged changes.
+        """
+        return os.path.join(self.config_dir_path, SUMMARY_CACHE_FILE)
+
+    def get_spec_store_path(self) -> str:
+        """
+        :return: Returns path to embeddings of the project specification's sections.
+        """
+        return os.path.join(self.config_dir_path, SPEC_STORE_FOLDER_NAME)
+
+    def get_usage_path(self) -> str:
+        """
+        :return: Returns path to daily aggregates of LLM token usage and latency.
+        """
+        return os.path.join(self.config_dir_path, USAGE_FILE)
+
     def get_config(self, config_name: str) -> BaseConfig:
         """
         Retrieves child-config by name.
@@ -37,7 +37,13 @@ CODE_TYPE = "Code"
 #
 CONFIG_FOLDER = ".safa"
 VECTOR_STORE_FOLDER_NAME = "vector_store"
+SPEC_STORE_FOLDER_NAME = "spec_store"
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 CACHE_FILE = "cache.json"
+PUSH_JOURNAL_FILE = "push_journal.jsonl"
+DAEMON_SOCKET_FILE = "daemon.sock"
+SUMMARY_CACHE_FILE = "summary_cache.json"
+USAGE_FILE = "usage.json"
 DEFAULT_BASE_URL = "https://dev.api.safa.ai"
 
 PROJECT_ENV_FILE = "project.env"
@@ -53,4 +59,6 @@ SAFA_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
 #
 # Committer
 #
-SUMMARIZATION_THRESHOLD = 25
+DEFAULT_SUMMARIZATION_THRESHOLD = 25
+DEFAULT_SUMMARIZATION_PROJECT_FRACTION = 0.5
+DEFAULT_LLM_ROUTES = "claude-3-haiku-20240307:4000,claude-3-sonnet-20240229"
@@ -0,0 +1,58 @@
+import os
+import sys
+from typing import List, Optional
+
+from safa.daemon.protocol import GENERATE_ACTION, get_daemon_socket_path, send_request
+
+HOOK_TIMEOUT = float(os.environ.get("SAFA_HOOK_TIMEOUT", 60))
+SKIPPED_SOURCES = ["message", "merge", "squash", "commit"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of the prepare-commit-msg hook. Asks the running daemon to generate a message for the staged changes
+    and writes it above the existing content of the message file. Only imports what is needed to reach the daemon so
+    that commits stay fast, and never fails the commit.
+    :param argv: The arguments git passes to the hook (message file, source, and commit).
+    :return: Exit code.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 0:
+        print("Usage: python -m safa.daemon.hook MESSAGE_FILE [SOURCE] [COMMIT]", file=sys.stderr)
+        return 0
+    message_file_path = argv[0]
+    source = argv[1] if len(argv) > 1 else None
+    if source in SKIPPED_SOURCES:
+        return 0
+
+    message = request_commit_message(get_daemon_socket_path(os.getcwd()))
+    if message:
+        with open(message_file_path) as f:
+            existing_content = f.read()
+        with open(message_file_path, "w") as f:
+            f.write(message + "\n" + existing_content)
+    return 0
+
+
+def request_commit_message(socket_path: str, timeout: float = HOOK_TIMEOUT) -> Optional[str]:
+    """
+    Requests commit message for the staged changes from daemon.
+    :param socket_path: Path to the daemon's socket.
+    :param timeout: Seconds to wait for the message.
+    :return: The commit message, None if daemon is not running or failed to generate one.
+    """
+    if not os.path.exists(socket_path):
+        return None
+    try:
+        response = send_request(socket_path, {"action": GENERATE_ACTION}, timeout=timeout)
+    except Exception as e:
+        print(f"SAFA daemon did not respond: {e}", file=sys.stderr)
+        return None
+    if "error" in response:
+        print(f"SAFA daemon failed to generate commit message: {response['error']}", file=sys.stderr)
+        return None
+    return response.get("message")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
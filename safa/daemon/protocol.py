@@ -0,0 +1,126 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Any, Callable, Dict, cast
+
+from safa.constants import CONFIG_FOLDER, DAEMON_SOCKET_FILE
+
+DAEMON_TIMEOUT = float(os.environ.get("SAFA_DAEMON_TIMEOUT", 120))
+
+PING_ACTION = "ping"
+SHUTDOWN_ACTION = "shutdown"
+GENERATE_ACTION = "generate"
+
+RequestHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def get_daemon_socket_path(repo_path: str) -> str:
+    """
+    :param repo_path: Path to repository served by daemon.
+    :return: Path to the daemon's socket within the repository's configuration folder.
+    """
+    return os.path.join(repo_path, CONFIG_FOLDER, DAEMON_SOCKET_FILE)
+
+
+def send_request(socket_path: str, request: Dict[str, Any], timeout: float = DAEMON_TIMEOUT) -> Dict[str, Any]:
+    """
+    Sends request to daemon and waits for its response.
+    :param socket_path: Path to the daemon's socket.
+    :param request: The request containing the action to perform.
+    :param timeout: Seconds to wait for connecting and for the response.
+    :return: The daemon's response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(encode_message(request))
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise Exception("Daemon closed connection without responding.")
+    return cast(Dict[str, Any], json.loads(line))
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """
+    :param message: The message to send.
+    :return: Message as a single line of JSON.
+    """
+    return json.dumps(message).encode() + b"\n"
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        """
+        Reads a single request and responds with the result of its action or the error raised.
+        :return: None
+        """
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = self.server.handle_message(json.loads(line))
+        except Exception as e:
+            response = {"error": str(e)}
+        self.wfile.write(encode_message(response))
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, handlers: Dict[str, RequestHandler]):
+        """
+        Creates server listening on unix socket, only readable by the current user.
+        :param socket_path: Path to create socket at.
+        :param handlers: Map of action to function creating its response.
+        """
+        remove_stale_socket(socket_path)
+        super().__init__(socket_path, DaemonRequestHandler)
+        os.chmod(socket_path, 0o600)
+        self.socket_path = socket_path
+        self.handlers = handlers
+
+    def handle_message(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Performs the request's action.
+        :param request: The request containing the action to perform.
+        :return: The response.
+        """
+        action = request.get("action")
+        if action == PING_ACTION:
+            return {"pid": os.getpid()}
+        if action == SHUTDOWN_ACTION:
+            threading.Thread(target=self.shutdown).start()
+            return {}
+        if action not in self.handlers:
+            raise Exception(f"Unknown action: {action}")
+        return self.handlers[action](request)
+
+    def server_close(self) -> None:
+        """
+        Closes server and removes its socket.
+        :return: None
+        """
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """
+    Removes socket left by a daemon that did not shut down cleanly.
+    :param socket_path: Path to socket.
+    :return: None
+    """
+    if not os.path.exists(socket_path):
+        return
+    try:
+        send_request(socket_path, {"action": PING_ACTION}, timeout=1)
+    except OSError:
+        os.remove(socket_path)
+        return
+    raise Exception(f"Daemon is already running at {socket_path}.")
@@ -0,0 +1,124 @@
+import os
+import stat
+import sys
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import git
+
+from safa.api.safa_client import SafaClient
+from safa.config.project_config import ProjectConfig
+from safa.config.safa_config import SafaConfig
+from safa.daemon.protocol import DaemonServer, GENERATE_ACTION
+from safa.data.artifact import ArtifactJson
+from safa.tools.committer import create_artifact_name_lookup, create_file_changes
+from safa.utils.commits import to_commit_message
+from safa.utils.diff_summary import summarize_commit_changes
+from safa.utils.git_helpers import get_staged_diffs
+from safa.utils.llm_manager import get_llm_manager
+from safa.utils.llm_router import LLMRouter
+from safa.utils.menus.printers import print_title
+from safa.utils.spec_index import SpecIndex
+from safa.utils.summary_cache import SummaryCache
+from safa.utils.trivial_changes import summarize_trivial_changes
+from safa.utils.usage_ledger import UsageLedger
+
+COMMIT_HOOK_NAME = "prepare-commit-msg"
+COMMIT_HOOK_SCRIPT = """#!/bin/sh
+# Installed by safa, generates commit message using the running `safa daemon`.
+exec "{python_path}" -m safa.daemon.hook "$@"
+"""
+
+
+class SafaDaemon:
+    def __init__(self, config: SafaConfig, client: SafaClient, llm_manager=None):
+        """
+        Keeps the authenticated client, project data, summaries, and LLM manager loaded between commits.
+        :param config: Configuration of the repository served.
+        :param client: Authenticated client used to access SAFA API.
+        :param llm_manager: LLM manager used to summarize changes, created from config if not given.
+        """
+        self.config = config
+        self.client = client
+        usage_ledger = UsageLedger(config.get_usage_path())
+        self.llm_manager = llm_manager if llm_manager else get_llm_manager(config.llm_config, usage_ledger)
+        self.version_id: Optional[str] = None
+        self.project_data: Dict = {}
+        self.artifact_map: Dict[str, ArtifactJson] = {}
+        self.summary_cache = SummaryCache(config.get_summary_cache_path())
+        self.spec_index = SpecIndex(config.get_spec_store_path())
+        self.lock = threading.Lock()
+
+    def generate_commit_message(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generates commit message for the staged changes.
+        :param request: Ignored. The request from the hook.
+        :return: Response containing commit message.
+        """
+        repo = git.Repo(self.config.repo_config.repo_path)
+        file2diff = get_staged_diffs(repo)
+        if len(file2diff) == 0:
+            raise Exception("No changes staged for commit.")
+        trivial_summary = summarize_trivial_changes(repo)
+        if trivial_summary:
+            return {"message": to_commit_message(*trivial_summary)}
+        project_data, artifact_map = self.get_project_data()
+        file_changes = create_file_changes(file2diff, artifact_map, repo)
+        specification = self.spec_index.retrieve(project_data["specification"], file_changes)
+        title, changes = summarize_commit_changes(self.llm_manager, file_changes, specification,
+                                                  summary_cache=self.summary_cache)
+        return {"message": to_commit_message(title, changes)}
+
+    def get_project_data(self) -> Tuple[Dict, Dict[str, ArtifactJson]]:
+        """
+        Returns project data of the configured version, only retrieving it again once a push changes the version.
+        :return: Project data and artifact name lookup.
+        """
+        with self.lock:
+            version_id = ProjectConfig.create(self.config.config_dir_path).get_version_id()
+            if version_id != self.version_id:
+                self.project_data = self.client.get_version(version_id)
+                self.artifact_map = create_artifact_name_lookup(self.project_data["artifacts"])
+                self.version_id = version_id
+            return self.project_data, self.artifact_map
+
+
+def run_daemon(config: SafaConfig, client: SafaClient) -> None:
+    """
+    Serves commit messages to the prepare-commit-msg hook until interrupted.
+    :param config: Configuration of the repository served.
+    :param client: Authenticated client used to access SAFA API.
+    :return: None
+    """
+    print_title("SAFA Daemon")
+    daemon = SafaDaemon(config, client)
+    daemon.get_project_data()
+    with DaemonServer(config.get_daemon_socket_path(), {GENERATE_ACTION: daemon.generate_commit_message}) as server:
+        print(f"Listening on {server.socket_path} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    if isinstance(daemon.llm_manager, LLMRouter):
+        daemon.llm_manager.print_metrics()
+    print("Daemon stopped.")
+
+
+def install_commit_hook(repo_path: str) -> str:
+    """
+    Installs prepare-commit-msg hook asking the daemon for a commit message.
+    :param repo_path: Path to the repository to install hook in.
+    :return: Path to the hook.
+    """
+    repo = git.Repo(repo_path)
+    hooks_path = os.path.join(repo.git_dir, "hooks")
+    hook_path = os.path.join(hooks_path, COMMIT_HOOK_NAME)
+    if os.path.exists(hook_path):
+        with open(hook_path) as f:
+            if "safa.daemon.hook" not in f.read():
+                raise Exception(f"Hook already exists at {hook_path}, add `python -m safa.daemon.hook \"$@\"` to it.")
+    os.makedirs(hooks_path, exist_ok=True)
+    with open(hook_path, "w") as f:
+        f.write(COMMIT_HOOK_SCRIPT.format(python_path=sys.executable))
+    os.chmod(hook_path, os.stat(hook_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return hook_path
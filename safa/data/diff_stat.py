@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class DiffStat:
+    files: int = 0
+    insertions: int = 0
+    deletions: int = 0
+
+    def __str__(self) -> str:
+        """
+        :return: Summary of changes in the format used by git (e.g. 2 files changed, 3 insertions(+), 1 deletion(-)).
+        """
+        files_label = "file" if self.files == 1 else "files"
+        insertions_label = "insertion" if self.insertions == 1 else "insertions"
+        deletions_label = "deletion" if self.deletions == 1 else "deletions"
+        return (f"{self.files} {files_label} changed, "
+                f"{self.insertions} {insertions_label}(+), "
+                f"{self.deletions} {deletions_label}(-)")
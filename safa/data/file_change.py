@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from typing import Optional
+
+MISSING_BLOB_ID = "-"
 
 
 @dataclass
@@ -7,3 +10,14 @@ class FileChange:
     diff: str
     content_before: str
     summary: str
+    blob_before: Optional[str] = None
+    blob_after: Optional[str] = None
+    content_after: Optional[str] = None
+
+    def get_cache_key(self) -> Optional[str]:
+        """
+        :return: Key identifying the content of the file before and after the change, None if content is unknown.
+        """
+        if self.blob_before is None and self.blob_after is None:
+            return None
+        return f"{self.blob_before or MISSING_BLOB_ID}:{self.blob_after or MISSING_BLOB_ID}"
@@ -13,14 +13,21 @@ sys.path.append(SRC_PATH)
 
 from safa.api.client_factory import create_safa_client
 from safa.constants import safa_banner
+from safa.daemon.server import install_commit_hook, run_daemon
 from safa.tool_registrar import TOOL_FUNCTIONS, TOOL_GROUPS, TOOL_NAMES, TOOL_PERMISSIONS
+from safa.tools.projects.push_all import FAILED_STATUS, PUSH_ALL_WORKERS, run_push_all
 from safa.utils.fs import clean_path
 from safa.utils.menus.printers import print_title
+from safa.utils.profiler import get_profiler
 
+from safa.config.run_options import SINCE_LAST_COMMITS, RunOptions
 from safa.config.safa_config import SafaConfig
 from safa.utils.menus.inputs import input_option
 
 OneOrMany = Dict[str, str] | Dict[str, List[str]]
+PUSH_ALL_COMMAND = "push-all"
+DAEMON_COMMAND = "daemon"
+INSTALL_HOOK_COMMAND = "install-hook"
 
 
 def main() -> None:
@@ -29,19 +36,46 @@ def main() -> None:
     :return: None
     """
     setup_main()
-    repo_path, env_file_path, tool = parse_args()
+    args = parse_args()
     print("\n", safa_banner.strip(), "\n\n")
 
-    config = SafaConfig.from_repo(repo_path, root_env_file_path=env_file_path)
-    if not config.is_configured():
-        configure(config)
-
-    client = create_safa_client(config)
-
-    print_title("Configuration")
-    print(config)
-
-    run_tool_loop(config, client, tool=tool)
+    profiler = get_profiler()
+    if args.profile:
+        profiler.enable()
+
+    try:
+        if args.command == PUSH_ALL_COMMAND:
+            results = run_push_all(args.manifest, env_file_path=args.env, max_workers=args.workers, report_path=args.report)
+            if any(r.status == FAILED_STATUS for r in results):
+                sys.exit(1)
+            return
+
+        config = SafaConfig.from_repo(args.repo_path, root_env_file_path=args.env)
+        config.run_options = RunOptions(commits=args.commits, version_type=args.version_type, yes=args.yes,
+                                        auto_commit=args.auto_commit, update_summary=args.update_summary)
+        if args.command == INSTALL_HOOK_COMMAND:
+            hook_path = install_commit_hook(config.repo_config.repo_path)
+            print(f"Installed hook at {hook_path}, start `safa {DAEMON_COMMAND}` to generate commit messages.")
+            return
+        if not config.is_configured():
+            if not config.run_options.is_interactive():
+                sys.exit("SAFA is not configured, run `safa` interactively to configure it.")
+            configure(config)
+
+        client = create_safa_client(config)
+
+        print_title("Configuration")
+        print(config)
+
+        if args.command == DAEMON_COMMAND:
+            run_daemon(config, client)
+            return
+        run_tool_loop(config, client, tool=args.tool)
+    finally:
+        if args.profile:
+            profiler.print_summary()
+            if args.profile_output:
+                profiler.write_chrome_trace(args.profile_output)
 
 
 def run_tool_loop(config: SafaConfig, client: SafaClient, tool: Optional[str] = None):
@@ -70,7 +104,8 @@ def run_tool_loop(config: SafaConfig, client: SafaClient, tool: Optional[str] =
         tool_func(config, client)
 
         if tool:
-            sys.exit("All Done :)")
+            print("All Done :)")
+            sys.exit(0)
 
 
 def filter_tools_by_permissions(tool_options: Dict, tool_groups: OneOrMany, tool_permissions: Dict,
@@ -103,18 +138,44 @@ def _filter_groups(groups: OneOrMany, valid_items: List[str]) -> Dict:
     return filtered_groups
 
 
-def parse_args():
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments, resolving paths to absolute paths.
+    :return: Parsed arguments.
+    """
     parser = argparse.ArgumentParser(description="A tool for processing repositories.")
+    parser.add_argument('command', nargs="?", choices=[PUSH_ALL_COMMAND, DAEMON_COMMAND, INSTALL_HOOK_COMMAND],
+                        help="Run headless command instead of tools")
     parser.add_argument('--tool', '-t', type=str, help="Specify the tool to use")
     parser.add_argument('--repo_path', '-r', type=str, help="Path to the repository directory")
     parser.add_argument('--env', '-e', type=str, help="Path to the environment file")
+    parser.add_argument('--profile', action="store_true", help="Print time spent in each stage when finished")
+    parser.add_argument('--profile-output', type=str, help="Path to write Chrome trace JSON of profiled stages")
+    parser.add_argument('--commits', type=str,
+                        help=f"Commits to push, either `{SINCE_LAST_COMMITS}` or a git revision range (e.g. main~3..main)")
+    parser.add_argument('--version-type', choices=["major", "minor", "revision"],
+                        help="Type of version created when pushing a single commit")
+    parser.add_argument('--yes', '-y', action="store_true", help="Answer yes to confirmations")
+    parser.add_argument('--auto-commit', action="store_true", help="Commit generated message without opening commit menu")
+    parser.add_argument('--update-summary', action="store_true", help="Summarize project after pushing commits")
+    parser.add_argument('--manifest', type=str, help="push-all: Path to file listing repository paths")
+    parser.add_argument('--workers', type=int, default=PUSH_ALL_WORKERS, help="push-all: Repositories pushed at once")
+    parser.add_argument('--report', type=str, help="push-all: Path to write JSON report to")
 
     args = parser.parse_args()
-
-    repo_path = clean_path(args.repo_path) if args.repo_path else os.path.abspath("")
-    env_file_path = clean_path(args.env) if args.env else None
-
-    return repo_path, env_file_path, args.tool
+    if args.command == PUSH_ALL_COMMAND and not args.manifest:
+        parser.error(f"{PUSH_ALL_COMMAND} requires --manifest")
+    if (args.yes or args.auto_commit) and not args.tool and not args.command:
+        parser.error("--yes and --auto-commit require --tool")
+
+    args.repo_path = clean_path(args.repo_path) if args.repo_path else os.path.abspath("")
+    args.env = clean_path(args.env) if args.env else None
+    args.profile_output = clean_path(args.profile_output) if args.profile_output else None
+    args.manifest = clean_path(args.manifest) if args.manifest else None
+    args.report = clean_path(args.report) if args.report else None
+    args.profile = args.profile or args.profile_output is not None
+
+    return args
 
 
 def setup_main():
@@ -9,6 +9,7 @@ from safa.tools.projects.push import run_push_commit
 from safa.tools.projects.refresh import refresh_project
 from safa.tools.projects.select import list_projects
 from safa.tools.search import run_search
+from safa.tools.usage import run_usage_report
 
 TOOL_FUNCTIONS: Dict[str, Callable] = {
     "committer": run_committer,
@@ -19,8 +20,8 @@ TOOL_FUNCTIONS: Dict[str, Callable] = {
     "list_projects": list_projects,
     "project": run_configure_project,
     "account": run_configure_account,
-    "jobs": run_job_module
-
+    "jobs": run_job_module,
+    "usage": run_usage_report
 }
 TOOL_PERMISSIONS: Dict[str, List[str]] = {
     "committer": ["user"],
@@ -31,7 +32,8 @@ TOOL_PERMISSIONS: Dict[str, List[str]] = {
     "list_projects": ["user"],
     "project": ["*"],
     "account": ["*"],
-    "jobs": ["user"]
+    "jobs": ["user"],
+    "usage": ["*"]
 }
 TOOL_NAMES: Dict[str, str] = {
     "committer": "Commit",
@@ -42,7 +44,8 @@ TOOL_NAMES: Dict[str, str] = {
     "list_projects": "List",
     "project": "Configure",
     "account": "Settings",
-    "jobs": "Jobs"
+    "jobs": "Jobs",
+    "usage": "Usage"
 }
 TOOL_GROUPS: Dict[str, List[str]] = {
     "Tools": [
@@ -58,6 +61,7 @@ TOOL_GROUPS: Dict[str, List[str]] = {
     ],
     "Safa": [
         "account",
-        "jobs"
+        "jobs",
+        "usage"
     ]
 }
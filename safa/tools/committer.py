@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional, Tuple
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
 
 import git
 
@@ -7,71 +8,135 @@ from safa.config.safa_config import SafaConfig
 from safa.data.artifact import ArtifactJson
 from safa.data.file_change import FileChange
 from safa.utils.commits import print_commit_message, to_commit_message
-from safa.utils.diff_summary import summarize_commit_changes
-from safa.utils.git_helpers import get_file_content_before, get_staged_diffs, stage_files
+from safa.utils.diff_summary import regenerate_commit_part, summarize_commit_changes
+from safa.utils.git_helpers import get_file_content_before, get_staged_blob_ids, get_staged_diffs, \
+    get_staged_file_content, stage_files
 from safa.utils.llm_manager import get_llm_manager
 from safa.utils.menus.inputs import input_int, input_option
 from safa.utils.menus.printers import print_title
+from safa.utils.spec_index import SpecIndex
+from safa.utils.summary_cache import SummaryCache
+from safa.utils.trivial_changes import summarize_trivial_changes
+from safa.utils.usage_ledger import UsageLedger
+
+REGENERATE_TITLE_OPTION = "Regenerate Title"
+REGENERATE_CHANGE_OPTION = "Regenerate Change"
+
+Regenerator = Callable[[str, List[str], Optional[int]], str]
 
 
 def run_committer(config: SafaConfig, client: SafaClient) -> None:
     """
     Reads staged changes and generates commit details (i.e. title, changes). Allows user to edit afterwards.
+    Trivial changes (e.g. renames, formatting, version bumps) are summarized without the LLM.
+    Only the sections of the project specification relevant to the staged files are sent to the LLM.
+    The title or a single change can be regenerated from the commit menu using the file summaries kept in memory.
+    Interrupting (Ctrl+C) a generation cancels its LLM requests and returns to the commit menu.
     :param config: The configuration of the tool.
     :param client: Client used to access SAFA API.
     :return: None.
     """
     print_title("Committer Tool")
-    project_data = get_project_data(config, client)
-    artifact_map = create_artifact_name_lookup(project_data["artifacts"])
-
     repo = git.Repo(config.repo_config.repo_path)
-    stage_files(repo)
+    stage_files(repo, interactive=config.run_options.is_interactive())
     file2diff = get_staged_diffs(repo)
     if len(file2diff) == 0:
         print("No changes staged for commit.")
     else:
-        file_changes = create_file_changes(file2diff, artifact_map, repo)
-        llm_manager = get_llm_manager(config.llm_config)
-        title, changes = summarize_commit_changes(llm_manager, file_changes, project_data["specification"])
-        run_commit_menu(repo, title, changes)
+        trivial_summary = summarize_trivial_changes(repo)
+        regenerate: Optional[Regenerator] = None
+        if trivial_summary:
+            print("...summarized trivial changes without LLM...")
+            title, changes = trivial_summary
+        else:
+            project_data = get_project_data(config, client)
+            artifact_map = create_artifact_name_lookup(project_data["artifacts"])
+            file_changes = create_file_changes(file2diff, artifact_map, repo)
+            llm_manager = get_llm_manager(config.llm_config, UsageLedger(config.get_usage_path()))
+            summary_cache = SummaryCache(config.get_summary_cache_path())
+            specification = SpecIndex(config.get_spec_store_path()).retrieve(project_data["specification"],
+                                                                             file_changes)
+            try:
+                title, changes = summarize_commit_changes(llm_manager, file_changes, specification,
+                                                          summary_cache=summary_cache)
+            except KeyboardInterrupt:
+                if not config.run_options.is_interactive():
+                    raise
+                print("\n...generation cancelled, write the commit message below...")
+                title, changes = "", []
+            file2summary = summary_cache.get_file_summaries(file_changes)
+            regenerate = partial(regenerate_commit_part, llm_manager, file_changes, file2summary)
+        if not config.run_options.is_interactive():
+            print_commit_message(title, changes)
+            repo.index.commit(to_commit_message(title, changes))
+        else:
+            run_commit_menu(repo, title, changes, regenerate=regenerate)
 
 
-def run_commit_menu(repo: git.Repo, title: str, changes: List[str]) -> Tuple[str, List[str]]:
+def run_commit_menu(repo: git.Repo, title: str, changes: List[str],
+                    regenerate: Optional[Regenerator] = None) -> Tuple[str, List[str]]:
     """
     Runs commit management menu.
     :param repo: Repository that commit is being applied to.
     :param title: The current title of the commit.
     :param changes: The current changes to the commit.
+    :param regenerate: Regenerates the title (change index None) or a change from the summarized file changes kept in
+    memory. Regenerate options are only shown if given.
     :return: None
     """
     print_title("Commit Menu")
-    menu_options = ["Edit Title", "Edit Change", "Remove Change", "Add Change", "Commit"]
+    menu_options = ["Edit Title", "Edit Change", "Remove Change", "Add Change"]
+    if regenerate:
+        menu_options += [REGENERATE_TITLE_OPTION, REGENERATE_CHANGE_OPTION]
+    menu_options.append("Commit")
     while True:
         print_commit_message(title, changes, format_type="numbered")
         selected_option = input_option(menu_options)
-        option_num = menu_options.index(selected_option)
 
-        if option_num == 0:
+        if selected_option == "Edit Title":
             title = input("New Title:")
-        elif option_num == 1:
+        elif selected_option == "Edit Change":
             change_num = input_int("Change ID:")
             changes[change_num - 1] = input("New Change:")
-        elif option_num == 2:
+        elif selected_option == "Remove Change":
             change_num = input_int("Change ID:")
             changes.pop(change_num - 1)
-        elif option_num == 3:
+        elif selected_option == "Add Change":
             changes.append(input("New Change:"))
-        elif option_num == 4:
+        elif regenerate and selected_option == REGENERATE_TITLE_OPTION:
+            title = run_regenerate(regenerate, title, changes, None)
+        elif regenerate and selected_option == REGENERATE_CHANGE_OPTION:
+            change_num = input_int("Change ID:")
+            changes[change_num - 1] = run_regenerate(regenerate, title, changes, change_num - 1)
+        elif selected_option == "Commit":
             repo.index.commit(to_commit_message(title, changes))
             return title, changes
         else:
             raise Exception("Invalid option")
 
 
+def run_regenerate(regenerate: Regenerator, title: str, changes: List[str], change_index: Optional[int]) -> str:
+    """
+    Regenerates the title or a change, keeping the current one if the user cancels (Ctrl+C) or the LLM fails.
+    :param regenerate: Regenerates the title or change.
+    :param title: The current title of the commit.
+    :param changes: The current changes to the commit.
+    :param change_index: Index of the change to regenerate, None to regenerate the title.
+    :return: The regenerated title or change, the current one if it could not be regenerated.
+    """
+    current = title if change_index is None else changes[change_index]
+    try:
+        return regenerate(title, changes, change_index)
+    except KeyboardInterrupt:
+        print("\n...regeneration cancelled...")
+    except Exception as e:
+        print(f"...regeneration failed: {e}...")
+    return current
+
+
 def create_file_changes(file2diff, artifact_map: Dict[str, ArtifactJson], repo) -> List[FileChange]:
     """
-    Augments file diffs with artifact summary and file before changes.
+    Augments file diffs with artifact summary and file before and after changes.
     :param file2diff: Map of file to its diffs for those to convert.
     :param artifact_map: Artifact name lookup table.
     :param repo: Git repository to use to get file state before change.
@@ -81,11 +146,15 @@ def create_file_changes(file2diff, artifact_map: Dict[str, ArtifactJson], repo)
     for file, diff in file2diff.items():
         file_artifact: Optional[ArtifactJson] = artifact_map.get(file, None)
         content_before = get_file_content_before(repo, file)
+        blob_before, blob_after = get_staged_blob_ids(repo, file)
         changes.append(FileChange(
             file=file,
             diff=diff,
             content_before=content_before,
-            summary=file_artifact["summary"] if file_artifact else None  # type: ignore
+            summary=file_artifact["summary"] if file_artifact else None,  # type: ignore
+            blob_before=blob_before,
+            blob_after=blob_after,
+            content_after=get_staged_file_content(repo, file) if blob_after else None
         ))
     return changes
 
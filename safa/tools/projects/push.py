@@ -1,33 +1,53 @@
 import os
 import sys
-from typing import Optional, Tuple, cast
+from typing import Dict, List, Optional, Tuple, cast
 
 import git
 from git import Commit
 from tqdm import tqdm
 
+from safa.api.constants import STORE_PROJECT_KEY
 from safa.api.safa_client import SafaClient
+from safa.config.run_options import SINCE_LAST_COMMITS
 from safa.config.safa_config import SafaConfig
-from safa.constants import LINE_LENGTH, SUMMARIZATION_THRESHOLD
+from safa.constants import DEFAULT_SUMMARIZATION_PROJECT_FRACTION, DEFAULT_SUMMARIZATION_THRESHOLD, LINE_LENGTH
 from safa.data.commits import DiffDataType, create_empty_diff
 from safa.utils.commit_store import CommitStore
-from safa.utils.commits import select_commits
+from safa.utils.commits import resolve_commits, select_commits
 from safa.utils.diffs import calculate_diff
 from safa.utils.menus.inputs import input_confirm, input_option
 from safa.utils.menus.printers import print_title, version_repr
+from safa.utils.push_journal import COMMIT_SENT, IDS_SAVED, SUMMARIES_SENT, VERSION_CREATED, PushJournal, PushJournalState
 
 MAJOR_INTERVAL = int(os.environ.get("SAFA_MAJOR_INTERVAL", 10))
 MINOR_INTERVAL = int(os.environ.get("SAFA_MINOR_INTERVAL", 10))
+SUMMARIZATION_THRESHOLD = int(os.environ.get("SAFA_SUMMARIZATION_THRESHOLD", DEFAULT_SUMMARIZATION_THRESHOLD))
+SUMMARIZATION_PROJECT_FRACTION = float(os.environ.get("SAFA_SUMMARIZATION_PROJECT_FRACTION",
+                                                      DEFAULT_SUMMARIZATION_PROJECT_FRACTION))
+SUMMARY_INTERVAL = int(os.environ.get("SAFA_SUMMARY_INTERVAL", 1))
+INCLUDE_DIFF_STAT = os.environ.get("SAFA_INCLUDE_DIFF_STAT", "false").lower() == "true"
+CONFIG_FLUSH_INTERVAL = int(os.environ.get("SAFA_CONFIG_FLUSH_INTERVAL", 25))
 
 
 def run_push_commit(config: SafaConfig, client: SafaClient, set_as_current_project: bool = False,
-                    version_intervals: Tuple[int, int] = (MAJOR_INTERVAL, MINOR_INTERVAL)):
+                    version_intervals: Tuple[int, int] = (MAJOR_INTERVAL, MINOR_INTERVAL),
+                    summary_interval: int = SUMMARY_INTERVAL, commits: Optional[List[Commit]] = None,
+                    version_type: Optional[str] = None, resume: Optional[bool] = None,
+                    update_summary: Optional[bool] = None):
     """
     Runs through git history and creates commits in SAFA.
+    Each step is recorded in a journal so that an interrupted push can be resumed without re-uploading commits.
     :param config: Configuration object containing repository path and other settings.
     :param set_as_current_project: Whether to force setting as current project.
     :param client: SAFA client to interact with SAFA API.
     :param version_intervals: Intervals for major and minor versions. See _get_version_type for more details.
+    :param summary_interval: Number of commits whose changed artifacts are summarized together.
+    Zero defers summaries until the end of the push.
+    :param commits: The commits to push, oldest first. User is prompted to select commits if none are given.
+    :param version_type: The type of version created when pushing a single commit. User is prompted if none is given.
+    :param resume: Whether to resume an unfinished push. User is prompted if none is given.
+    :param update_summary: Whether to summarize project after push. User is prompted if none is given.
+    Arguments that are not given default to the run options of the configuration.
     :return: None
     """
     print_title("Pushing Commits to Project")
@@ -37,51 +57,164 @@ def run_push_commit(config: SafaConfig, client: SafaClient, set_as_current_proje
         return
 
     repo = git.Repo(config.repo_config.repo_path)
-    s_commit: Optional[Commit] = None
-
-    project_id, version_id = config.project_config.get_project_config()
-    if config.project_config.has_commit_id():
-        s_commit = repo.commit(config.project_config.get_commit_id())
-    commits = select_commits(repo)
-
-    version_data = client.get_version(version_id)
-    store = CommitStore(version_data)
-
-    for i, commit in tqdm(list(enumerate(commits)), ncols=LINE_LENGTH):
-        # create new version
-        version_type = _get_version_type(i, version_intervals) if len(commits) > 1 else input_version_type()
-        project_version = client.create_version(project_id, version_type)
-        version_id = project_version["versionId"]
-
-        # Create commit data
-        commit_data = calculate_diff(repo, commit, starting_commit=s_commit, prefix=f"{version_repr(project_version)}: ")
-        store.add_ids(commit_data)
-        commit_response = client.commit(version_id, commit_data)
-        config.project_config.set_project(project_id, version_id, commit_id=commit.hexsha)
-        store.save_ids(commit_response)
-        summary_commit_data = _summarize_changed_files(config, client, commit_response)
-        if summary_commit_data:
-            summary_commit_response = client.commit(version_id, summary_commit_data)
-
-        # Post-processing
-        s_commit = commit
+    project_id, _ = config.project_config.get_project_config()
+    run_options = config.run_options
+    resume = resume if resume is not None else run_options.confirm()
+    update_summary = update_summary if update_summary is not None else run_options.confirm_update_summary()
+    journal = PushJournal(config.get_push_journal_path())
+    journal_state = journal.load()
+
+    if journal_state and resume is None:
+        resume = input_confirm(f"Resume unfinished push ({journal_state.get_resume_index()}/"
+                               f"{len(journal_state.commit_ids)} commits pushed)?", default_value="y")
+    if journal_state:
+        # config writes are deferred during a push, so the journal records the latest commit sent if the push crashed
+        pushed_commit_id, pushed_version_id = journal_state.get_pushed_progress()
+        config.project_config.set_project(project_id, pushed_version_id, commit_id=pushed_commit_id)
+    version_id = config.project_config.get_version_id()
+
+    if not journal_state or not resume:
+        if commits is None and (run_options.commits or not run_options.is_interactive()):
+            commits_option = run_options.commits if run_options.commits else SINCE_LAST_COMMITS
+            commits = resolve_commits(repo, commits_option, last_commit_id=config.project_config.commit_id)
+        start_commit_id = config.project_config.commit_id
+        commit_ids = [c.hexsha for c in (select_commits(repo) if commits is None else commits)]
+        journal_state = PushJournalState(commit_ids=commit_ids, start_commit_id=start_commit_id, start_version_id=version_id)
+        journal.start(commit_ids, start_commit_id, version_id)
+    if version_type is None:
+        version_type = run_options.version_type
+    if version_type is None and not run_options.is_interactive():
+        version_type = "revision"
+
+    commits = [repo.commit(c_id) for c_id in journal_state.commit_ids]
+    start_idx = journal_state.get_resume_index()
+    s_commit_id = journal_state.commit_ids[start_idx - 1] if start_idx > 0 else journal_state.start_commit_id
+    s_commit: Optional[Commit] = repo.commit(s_commit_id) if s_commit_id else None
+
+    # versions that are not cached are not stored either, so that their bodies are released once the records are built
+    store = CommitStore(client.get_version(version_id, use_store=client.store.has(STORE_PROJECT_KEY, version_id)))
+    store.print_summary()
+    pending_summaries: Dict[str, Dict] = {}
+    for saved_response in journal_state.get_unsummarized_responses():
+        _add_pending_summaries(pending_summaries, saved_response)
+
+    with config.defer_writes(), client.store.defer_writes():
+        for i in tqdm(range(start_idx, len(commits)), ncols=LINE_LENGTH):
+            commit = commits[i]
+
+            # create new version
+            project_version = journal_state.versions.get(i)
+            if project_version is None:
+                if len(commits) > 1:
+                    i_version_type = _get_version_type(i, version_intervals)
+                else:
+                    i_version_type = version_type if version_type else input_version_type()
+                project_version = client.create_version(project_id, i_version_type)
+                journal.record(VERSION_CREATED, index=i, version=project_version)
+            base_version_id, version_id = version_id, project_version["versionId"]
+
+            # Create commit data
+            commit_response = journal_state.commit_responses.get(i)
+            if commit_response is None:
+                commit_data = calculate_diff(repo, commit, starting_commit=s_commit, include_diff_stat=INCLUDE_DIFF_STAT,
+                                             prefix=f"{version_repr(project_version)}: ")
+                store.add_ids(commit_data)
+                commit_response = client.commit(version_id, commit_data)
+                journal.record(COMMIT_SENT, index=i, response=commit_response)
+                client.apply_commit(version_id, commit_response, base_version_id=base_version_id)
+            config.project_config.set_project(project_id, version_id, commit_id=commit.hexsha)
+            store.save_ids(commit_response)
+            journal.record(IDS_SAVED, index=i)
+            _add_pending_summaries(pending_summaries, commit_response)
+            if _is_summary_checkpoint(i, len(commits), summary_interval):
+                _commit_summaries(client, version_id, pending_summaries, store)
+                journal.record(SUMMARIES_SENT, index=i)
+
+            # Post-processing
+            s_commit = commit
+            if (i + 1) % CONFIG_FLUSH_INTERVAL == 0:
+                config.flush()
+                client.store.flush()
+
+        if len(pending_summaries) > 0:
+            _commit_summaries(client, version_id, pending_summaries, store)
+    journal.clear()
 
     if len(commits) > 0:
-        if input_confirm("Update project summary?"):
+        config.project_config.print_version_url()
+        if update_summary is None:
+            update_summary = input_confirm("Update project summary?")
+        if update_summary:
             summarization_job = client.summarize(version_id)
             client.wait_for_job(summarization_job["id"])
 
 
-def _summarize_changed_files(config: SafaConfig, client: SafaClient, diff: DiffDataType) -> Optional[DiffDataType]:
+def _add_pending_summaries(pending_summaries: Dict[str, Dict], commit_response: DiffDataType) -> None:
+    """
+    Records the latest revision of each artifact changed in commit so that it is summarized once.
+    :param pending_summaries: Map of artifact name to the latest revision of artifacts awaiting summarization.
+    :param commit_response: The response to the commit.
+    :return: None
+    """
+    for artifact in commit_response["artifacts"]["added"] + commit_response["artifacts"]["modified"]:
+        pending_summaries[artifact["name"]] = artifact
+    for artifact in commit_response["artifacts"]["removed"]:
+        pending_summaries.pop(artifact["name"], None)
+
+
+def _is_summary_checkpoint(iteration_idx: int, n_commits: int, summary_interval: int) -> bool:
+    """
+    Calculates whether pending summaries should be committed after the given iteration.
+    :param iteration_idx: The index of the iteration.
+    :param n_commits: The total number of commits being pushed.
+    :param summary_interval: Number of commits between summary commits, zero to summarize at the end only.
+    :return: True if pending summaries should be committed.
+    """
+    is_last_commit = iteration_idx == n_commits - 1
+    return is_last_commit or (summary_interval > 0 and (iteration_idx + 1) % summary_interval == 0)
+
+
+def _commit_summaries(client: SafaClient, version_id: str, pending_summaries: Dict[str, Dict],
+                      store: CommitStore) -> None:
+    """
+    Summarizes pending artifacts and sends their summaries in a single commit to the given version.
+    The store is updated with the new summaries so that later revisions of the artifacts keep them.
+    :param client: Client used to access SAFA API.
+    :param version_id: ID of the version containing the latest revision of the pending artifacts.
+    :param pending_summaries: Map of artifact name to the latest revision of artifacts awaiting summarization.
+    :param store: Store of the project's current artifacts.
+    :return: None
+    """
+    pending_diff = create_empty_diff()
+    pending_diff["artifacts"]["modified"] = list(pending_summaries.values())
+    pending_summaries.clear()
+
+    summary_commit_data = _summarize_changed_files(client, version_id, pending_diff, store)
+    if summary_commit_data:
+        summary_commit_response = client.commit(version_id, summary_commit_data)
+        client.apply_commit(version_id, summary_commit_response)
+        store.save_ids(summary_commit_response)
+
+
+def _summarize_changed_files(client: SafaClient, version_id: str, diff: DiffDataType, store: CommitStore,
+                             threshold: int = SUMMARIZATION_THRESHOLD,
+                             project_fraction: float = SUMMARIZATION_PROJECT_FRACTION) -> Optional[DiffDataType]:
     """
     Summarizes files changed since last push to SAFA.
+    Changes above threshold are summarized in concurrent batches, unless they make up a large fraction of the project,
+    in which case the whole project is summarized and the store is reloaded with the new summaries.
     --- Note ---
     This method is not for use outside of this module as its currently expected
      that the project data is going to be refreshed since the summaries are not being saved.
-    :param config: Configuration to SAFA account and project.
+    :param client: Client used to access SAFA API.
+    :param version_id: ID of the version containing the changed artifacts.
+    :param diff: The commit response containing the changed artifacts.
+    :param store: Store of the project's current artifacts, used to calculate the fraction of changed artifacts and to
+    skip summaries that are unchanged.
+    :param threshold: The maximum number of artifacts summarized per request.
+    :param project_fraction: The fraction of changed artifacts above which the whole project is summarized.
     :return: The commit request containing the new artifact summaries.
     """
-    version_id = config.project_config.get_version_id()
     changed_artifacts = diff["artifacts"]["modified"] + diff["artifacts"]["added"]
     id2artifact = {a["id"]: a for a in changed_artifacts}
     artifact_ids = list(id2artifact.keys())
@@ -92,17 +225,30 @@ def _summarize_changed_files(config: SafaConfig, client: SafaClient, diff: DiffD
 
     print(f"... found {len(id2artifact)} changed artifacts...")
 
-    if len(artifact_ids) <= SUMMARIZATION_THRESHOLD:
+    if len(artifact_ids) <= threshold:
         summarized_artifacts = client.summarize_artifacts(version_id, artifact_ids)
-        summary_diff = create_empty_diff()
-        for a_summarized in summarized_artifacts:
-            artifact = id2artifact[a_summarized["id"]]
-            artifact["summary"] = a_summarized["summary"]
-            summary_diff["artifacts"]["modified"].append(artifact)
-    else:
-        print(f"Found more than threshold ({SUMMARIZATION_THRESHOLD}) changed artifacts...")
+    elif store.artifact_store and len(artifact_ids) / len(store.artifact_store) >= project_fraction:
+        print(f"Changed artifacts make up more than {project_fraction:.0%} of project, summarizing project...")
         summarization_job = client.summarize(version_id)
         client.wait_for_job(summarization_job["id"])
+        project_data = client.get_version(version_id, use_store=False)
+        store.artifact_store = CommitStore.create_artifact_store(project_data["artifacts"])
+        return None
+    else:
+        print(f"Found more than threshold ({threshold}) changed artifacts, summarizing in batches...")
+        summarized_artifacts = client.summarize_artifacts_batched(version_id, artifact_ids, batch_size=threshold)
+
+    summary_diff = create_empty_diff()
+    for a_summarized in summarized_artifacts:
+        artifact = id2artifact[a_summarized["id"]]
+        artifact_record = store.artifact_store.get(artifact["name"])
+        if artifact_record and artifact_record.summary_hash == CommitStore.hash_summary(a_summarized["summary"]):
+            continue
+        artifact["summary"] = a_summarized["summary"]
+        summary_diff["artifacts"]["modified"].append(artifact)
+
+    if len(summary_diff["artifacts"]["modified"]) == 0:
+        print("Artifact summaries are unchanged.")
         return None
     return summary_diff
 
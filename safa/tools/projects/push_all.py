@@ -0,0 +1,136 @@
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+import git
+
+from safa.api.client_factory import create_safa_client
+from safa.api.http_client import HttpClient
+from safa.api.safa_client import SafaClient
+from safa.api.safa_store import SafaStore
+from safa.config.safa_config import SafaConfig
+from safa.tools.projects.push import run_push_commit
+from safa.utils.commits import get_commits_since
+from safa.utils.fs import clean_path, read_file, write_json
+from safa.utils.menus.printers import print_title
+
+PUSH_ALL_WORKERS = int(os.environ.get("SAFA_PUSH_ALL_WORKERS", 4))
+PUSH_ALL_VERSION_TYPE = os.environ.get("SAFA_PUSH_ALL_VERSION_TYPE", "revision")
+
+SUCCESS_STATUS = "success"
+SKIPPED_STATUS = "skipped"
+FAILED_STATUS = "failed"
+
+
+@dataclass
+class RepoPushResult:
+    """
+    :param repo_path: Path to the repository pushed.
+    :param status: One of success, skipped, or failed.
+    :param n_commits: Number of commits pushed.
+    :param duration: Seconds taken to push repository.
+    :param error: Reason the repository was skipped or failed.
+    """
+    repo_path: str
+    status: str
+    n_commits: int = 0
+    duration: float = 0
+    error: Optional[str] = None
+
+
+def run_push_all(manifest_path: str, env_file_path: Optional[str] = None, max_workers: int = PUSH_ALL_WORKERS,
+                 report_path: Optional[str] = None) -> List[RepoPushResult]:
+    """
+    Pushes the commits made since the last push of each repository in manifest without prompting.
+    Repositories share a single authenticated session and are pushed concurrently.
+    :param manifest_path: Path to file listing one repository path per line.
+    :param env_file_path: Additional env file loaded for each repository.
+    :param max_workers: The maximum number of repositories pushed at once.
+    :param report_path: Path to write JSON report to.
+    :return: The result of pushing each repository.
+    """
+    print_title("Push All")
+    repo_paths = read_manifest(manifest_path)
+    if len(repo_paths) == 0:
+        print("Manifest does not contain any repositories.")
+        return []
+
+    configs = [SafaConfig.from_repo(repo_path, root_env_file_path=env_file_path) for repo_path in repo_paths]
+    http_client = create_safa_client(configs[0]).http_client
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="safa-push") as executor:
+        results = list(executor.map(lambda config: push_repo(config, http_client), configs))
+    duration = time.perf_counter() - start
+
+    print_push_report(results, duration)
+    if report_path:
+        write_json(report_path, {"duration": duration, "repos": [asdict(r) for r in results]})
+        print(f"Report written to: {report_path}")
+    return results
+
+
+def push_repo(config: SafaConfig, http_client: HttpClient) -> RepoPushResult:
+    """
+    Pushes the commits made since the last push to the repository's project.
+    :param config: Configuration of the repository.
+    :param http_client: Authenticated client shared across repositories.
+    :return: The result of the push.
+    """
+    repo_path = config.repo_config.repo_path
+    if not config.project_config.has_project():
+        return RepoPushResult(repo_path, SKIPPED_STATUS, error="Project is not configured.")
+    if config.repo_config.base_url != http_client.base_url:
+        return RepoPushResult(repo_path, SKIPPED_STATUS, error=f"Expected base url to be {http_client.base_url}.")
+
+    start = time.perf_counter()
+    try:
+        repo = git.Repo(repo_path)
+        commits = get_commits_since(repo, config.project_config.commit_id)
+        if len(commits) > 0:
+            client = SafaClient(http_client, store=SafaStore(cache_file_path=config.get_cache_file_path()))
+            run_push_commit(config, client, commits=commits, version_type=PUSH_ALL_VERSION_TYPE, resume=True,
+                            update_summary=False)
+        return RepoPushResult(repo_path, SUCCESS_STATUS, n_commits=len(commits), duration=time.perf_counter() - start)
+    except Exception as e:
+        traceback.print_exc()
+        return RepoPushResult(repo_path, FAILED_STATUS, duration=time.perf_counter() - start, error=str(e))
+
+
+def read_manifest(manifest_path: str) -> List[str]:
+    """
+    Reads repository paths from manifest. Paths are either a JSON list or one per line, ignoring blank lines and
+    comments starting with #. Relative paths are resolved against the manifest's directory.
+    :param manifest_path: Path to manifest.
+    :return: Absolute paths to repositories.
+    """
+    manifest_content = read_file(manifest_path)
+    if manifest_content.lstrip().startswith("["):
+        repo_paths = json.loads(manifest_content)
+    else:
+        repo_paths = [line.strip() for line in manifest_content.splitlines()
+                      if len(line.strip()) > 0 and not line.strip().startswith("#")]
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    return [clean_path(os.path.join(manifest_dir, os.path.expanduser(p))) for p in repo_paths]
+
+
+def print_push_report(results: List[RepoPushResult], duration: float) -> None:
+    """
+    Prints the outcome of each repository and the totals across repositories.
+    :param results: The result of pushing each repository.
+    :param duration: Seconds taken to push all repositories.
+    :return: None
+    """
+    print_title("Push All Report")
+    for result in sorted(results, key=lambda r: r.duration, reverse=True):
+        error = f" ({result.error})" if result.error else ""
+        print(f"{result.status:<8} {result.duration:>7.2f}s {result.n_commits:>5} commits  {result.repo_path}{error}")
+
+    n_commits = sum(r.n_commits for r in results)
+    status_counts = {s: len([r for r in results if r.status == s]) for s in [SUCCESS_STATUS, SKIPPED_STATUS, FAILED_STATUS]}
+    status_summary = ", ".join(f"{n} {s}" for s, n in status_counts.items())
+    print(f"\n{len(results)} repositories ({status_summary}), {n_commits} commits pushed in {duration:.2f}s.")
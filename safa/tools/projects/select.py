@@ -27,6 +27,8 @@ def run_select_project(config: SafaConfig, client: SafaClient) -> Tuple[str, str
     selected_version = name2versions[selected_version_name]
     version_id = selected_version["versionId"]
 
+    if config.project_config.project_id == project_id and config.project_config.version_id:
+        client.get_version(version_id, base_version_id=config.project_config.version_id)
     config.project_config.set_project(project_id, version_id)
 
     return project_id, version_id
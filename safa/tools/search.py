@@ -10,9 +10,10 @@ from tqdm import tqdm
 
 from safa.api.safa_client import SafaClient
 from safa.config.safa_config import SafaConfig
-from safa.constants import LINE_LENGTH
+from safa.constants import EMBEDDING_MODEL, LINE_LENGTH
 from safa.utils.markdown import list_formatter
 from safa.utils.menus.printers import print_title
+from safa.utils.profiler import span, timed
 
 
 def run_search(config: SafaConfig, client: SafaClient, done_title: str = "done", k: int = 3):
@@ -31,8 +32,9 @@ def run_search(config: SafaConfig, client: SafaClient, done_title: str = "done",
 
     if os.path.isdir(vector_store_path):  # user should refresh if they want to create new one
         print("...reloading vector store...")
-        db = Chroma(embedding_function=HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2"),
-                    persist_directory=vector_store_path)
+        with span("embedding.load_vector_store"):
+            db = Chroma(embedding_function=HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL),
+                        persist_directory=vector_store_path)
     else:
         db = create_vector_store(project_data["artifacts"], vector_store_path=vector_store_path)
 
@@ -49,7 +51,8 @@ def run_search(config: SafaConfig, client: SafaClient, done_title: str = "done",
         if query.lower() == done_title.lower():
             return
         filter_dict = {"type": {"$in": search_types}}
-        docs = db.similarity_search_with_score(query, k=k, filter=filter_dict)  # type: ignore
+        with span("search.similarity_search"):
+            docs = db.similarity_search_with_score(query, k=k, filter=filter_dict)  # type: ignore
 
         print_title("Results")
         results = [f"({d.metadata['type']}) {d.metadata['name']}\n\t{d.page_content.split('.')[0]}" for d, score in docs if
@@ -57,6 +60,7 @@ def run_search(config: SafaConfig, client: SafaClient, done_title: str = "done",
         print(list_formatter(results), "\n")
 
 
+@timed("embedding.create_vector_store")
 def create_vector_store(artifacts: List[Dict], vector_store_path: str):
     print("...creating vector store...")
     if len(artifacts) == 0:
@@ -65,7 +69,8 @@ def create_vector_store(artifacts: List[Dict], vector_store_path: str):
     if os.path.exists(vector_store_path):
         shutil.rmtree(vector_store_path)
         time.sleep(.1)  # just need some time to finish dir deletes
-    embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+    with span("embedding.load_model"):
+        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
     documents = [get_artifact_document(a) for a in artifacts]
 
     try:
@@ -74,7 +79,8 @@ def create_vector_store(artifacts: List[Dict], vector_store_path: str):
         indices = range(0, len(documents), batch_size)
         for i in tqdm(indices, ncols=LINE_LENGTH):
             batch = documents[i:i + batch_size]
-            db.add_documents(batch)
+            with span("chroma.add_documents", n_documents=len(batch)):
+                db.add_documents(batch)
     except Exception as e:
         print(e)
         print("Database failed again :(")
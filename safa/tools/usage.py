@@ -0,0 +1,83 @@
+import os
+from typing import Dict, List, Optional
+
+from safa.api.safa_client import SafaClient
+from safa.config.safa_config import SafaConfig
+from safa.utils.llm_router import RouteMetrics
+from safa.utils.menus.printers import print_title
+from safa.utils.usage_ledger import UsageLedger, UsageTable, get_cost
+
+USAGE_REPORT_DAYS = int(os.environ.get("SAFA_USAGE_REPORT_DAYS", 14))
+
+
+def run_usage_report(config: SafaConfig, client: SafaClient) -> None:
+    """
+    Prints the LLM calls, latency, tokens, and cost of the repository per day, model, and prompt size.
+    :param config: Configuration of the repository.
+    :param client: Ignored. Client used to access SAFA API.
+    :return: None
+    """
+    print_title("LLM Usage")
+    print(f"Repository: {config.repo_config.repo_path}")
+    usage_table = UsageLedger(config.get_usage_path()).load()
+    if len(usage_table) == 0:
+        print("No LLM usage recorded yet.")
+        return
+    print("\n".join(create_usage_report(usage_table, USAGE_REPORT_DAYS)))
+
+
+def create_usage_report(usage_table: UsageTable, n_days: int) -> List[str]:
+    """
+    Creates report lines for the usage of the most recent days, followed by the totals of each prompt size.
+    :param usage_table: Usage per day, model, and prompt size.
+    :param n_days: Number of most recent days to report.
+    :return: Lines of the report.
+    """
+    lines = []
+    total_usage = RouteMetrics()
+    total_cost = 0.0
+    size2usage: Dict[str, RouteMetrics] = {}
+    for day in sorted(usage_table)[-n_days:]:
+        lines.append(f"\n{day}")
+        for model_name, model_usage in sorted(usage_table[day].items()):
+            for prompt_size, usage in sorted(model_usage.items(), key=lambda item: get_size_order(item[0])):
+                cost = get_cost(model_name, usage)
+                total_cost += cost or 0
+                total_usage.add(usage)
+                size2usage.setdefault(prompt_size, RouteMetrics()).add(usage)
+                lines.append(f"  {model_name} ({prompt_size} prompt tokens): {format_usage(usage)}, "
+                             f"{format_cost(cost)}")
+
+    lines.append("\nPer Prompt Size")
+    for prompt_size, usage in sorted(size2usage.items(), key=lambda item: get_size_order(item[0])):
+        lines.append(f"  {prompt_size} prompt tokens: {format_usage(usage)}")
+    lines.append(f"\nTotal: {format_usage(total_usage)}, {format_cost(total_cost)}")
+    return lines
+
+
+def format_usage(usage: RouteMetrics) -> str:
+    """
+    :param usage: Usage to format.
+    :return: Calls, mean latency, and tokens of usage.
+    """
+    mean_latency = usage.latency / usage.n_calls if usage.n_calls else 0
+    return f"{usage.n_calls} calls ({usage.n_hedged} hedged), {mean_latency:.2f}s mean latency, " \
+           f"{usage.prompt_tokens} prompt tokens ({usage.cache_read_tokens} read from cache), " \
+           f"{usage.output_tokens} output tokens, {usage.cancelled_prompt_tokens} prompt tokens of cancelled requests"
+
+
+def format_cost(cost: Optional[float]) -> str:
+    """
+    :param cost: Cost in USD, None if unknown.
+    :return: Formatted cost.
+    """
+    return "unknown cost" if cost is None else f"${cost:.4f}"
+
+
+def get_size_order(prompt_size: str) -> int:
+    """
+    :param prompt_size: Label of prompt size range (e.g. 1k-4k, >16k).
+    :return: Lower limit of range, used to sort ranges from smallest to largest.
+    """
+    lower_limit = prompt_size.lstrip(">").split("-")[0]
+    return int(lower_limit.replace("k", "000"))
@@ -0,0 +1,150 @@
+import ast
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from safa.data.file_change import FileChange
+
+CONDENSE_MIN_LINES = int(os.environ.get("SAFA_CONDENSE_MIN_LINES", 50))
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
+OMITTED_LINE = "..."
+
+Condenser = Callable[[str, Set[float]], Tuple[str, List[str]]]
+
+
+@dataclass
+class CondensedChange:
+    """
+    :param content_before: File before change with the bodies of unchanged symbols omitted.
+    :param changed_symbols: Qualified names of the symbols changed, before and after the change.
+    """
+    content_before: str
+    changed_symbols: List[str]
+
+
+def condense_file_change(change: FileChange) -> Optional[CondensedChange]:
+    """
+    Condenses the file before the change to the signatures of its symbols and the full source of the changed ones.
+    :param change: The file change to condense.
+    :return: The condensed change, None if file is small, has no condenser for its language, or cannot be parsed.
+    """
+    condenser = CONDENSERS.get(os.path.splitext(change.file)[1])
+    if condenser is None or not change.content_before or len(change.content_before.splitlines()) < CONDENSE_MIN_LINES:
+        return None
+    lines_before, lines_after = get_changed_lines(change.diff)
+    try:
+        content_before, symbols_before = condenser(change.content_before, lines_before)
+        symbols_after = condenser(change.content_after, lines_after)[1] if change.content_after else []
+    except SyntaxError:
+        return None
+    changed_symbols = symbols_before + [s for s in symbols_after if s not in symbols_before]
+    return CondensedChange(content_before, changed_symbols)
+
+
+def get_changed_lines(diff: str) -> Tuple[Set[float], Set[float]]:
+    """
+    Reads the lines removed and added by a unified diff, ignoring context lines.
+    Lines only inserted into the file before are placed between their neighbours (e.g. 3.5) so that they touch the
+    symbol enclosing both neighbours but not a symbol ending right before the insertion.
+    :param diff: The unified diff.
+    :return: Line numbers changed in the file before and after the change.
+    """
+    lines_before: Set[float] = set()
+    lines_after: Set[float] = set()
+    line_before = line_after = 0
+    for line in diff.splitlines():
+        hunk_match = HUNK_HEADER_PATTERN.match(line)
+        if hunk_match:
+            line_before = int(hunk_match.group(1)) - (0 if hunk_match.group(2) == "0" else 1)
+            line_after = int(hunk_match.group(3)) - (0 if hunk_match.group(4) == "0" else 1)
+        elif line.startswith("-") and not line.startswith("---"):
+            line_before += 1
+            lines_before.add(line_before)
+        elif line.startswith("+") and not line.startswith("+++"):
+            line_after += 1
+            lines_after.add(line_after)
+            lines_before.add(line_before + 0.5)
+        elif line.startswith(" "):
+            line_before += 1
+            line_after += 1
+    return lines_before, lines_after
+
+
+def condense_python(source: str, changed_lines: Set[float]) -> Tuple[str, List[str]]:
+    """
+    Condenses python source to the signatures of unchanged functions and classes, keeping the full source of changed
+    functions, the headers of the classes enclosing them, and changed module level statements.
+    :param source: The python source.
+    :param changed_lines: Line numbers changed in source.
+    :return: Condensed source and the qualified names of changed functions and classes.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines()
+    condensed_lines: List[str] = []
+    changed_symbols: List[str] = []
+    condense_python_body(tree.body, lines, changed_lines, condensed_lines, changed_symbols, "")
+    return "\n".join(condensed_lines), changed_symbols
+
+
+def condense_python_body(nodes: List[ast.stmt], lines: List[str], changed_lines: Set[float], condensed_lines: List[str],
+                         changed_symbols: List[str], scope: str) -> None:
+    """
+    Condenses statements in a module or class body.
+    :param nodes: The statements in body.
+    :param lines: The lines of the source.
+    :param changed_lines: Line numbers changed in source.
+    :param condensed_lines: The condensed lines, appended to.
+    :param changed_symbols: The qualified names of changed symbols, appended to.
+    :param scope: Qualified name of the class containing body, empty for module.
+    :return: None
+    """
+    for node in nodes:
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        end = node.end_lineno or node.lineno
+        is_changed = any(start <= line <= end for line in changed_lines)
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if is_changed:
+                condensed_lines.extend(lines[start - 1:end])
+            elif not condensed_lines or condensed_lines[-1].strip() != OMITTED_LINE:
+                condensed_lines.append(get_indent(lines[start - 1]) + OMITTED_LINE)
+            continue
+
+        header_end = max(start, node.body[0].lineno - 1)
+        header_lines = lines[start - 1:header_end]
+        symbol_name = f"{scope}.{node.name}" if scope else node.name
+        if not is_changed:
+            condensed_lines.extend(header_lines)
+            condensed_lines.append(get_indent(lines[node.body[0].lineno - 1]) + OMITTED_LINE)
+        elif isinstance(node, ast.ClassDef):
+            condensed_lines.extend(header_lines)
+            n_changed_symbols = len(changed_symbols)
+            condense_python_body(node.body, lines, changed_lines, condensed_lines, changed_symbols, symbol_name)
+            if len(changed_symbols) == n_changed_symbols:  # only the class itself (e.g. its attributes) changed
+                changed_symbols.append(symbol_name)
+        else:
+            condensed_lines.extend(lines[start - 1:end])
+            changed_symbols.append(symbol_name)
+
+
+def get_indent(line: str) -> str:
+    """
+    :param line: Line of source.
+    :return: The whitespace that line starts with.
+    """
+    return line[:len(line) - len(line.lstrip())]
+
+
+CONDENSERS: Dict[str, Condenser] = {
+    ".py": condense_python
+}
+
+
+def register_condenser(extension: str, condenser: Condenser) -> None:
+    """
+    Registers condenser for source files with given extension.
+    :param extension: File extension including dot (e.g. .py).
+    :param condenser: Function condensing source to changed lines, returning condensed source and changed symbols.
+    :return: None
+    """
+    CONDENSERS[extension] = condenser
@@ -1,15 +1,57 @@
-from typing import Dict, List
+import hashlib
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
 
 from safa.data.commits import DiffDataType
 
+RECORD_KEYS = {"id", "name", "type", "summary", "body"}
+
+
+@dataclass(slots=True)
+class ArtifactRecord:
+    """
+    :param id: ID of the artifact in SAFA.
+    :param name: Name of the artifact (e.g. file path).
+    :param type: Type of the artifact (e.g. Code).
+    :param summary: Summary of the artifact, copied to modified artifacts until they are summarized again.
+    :param fields: Remaining fields of the artifact except its body, None if it has none.
+    Commits replace artifacts, so the summary and fields are the only content needed by later commits.
+    """
+    id: str
+    name: str
+    type: str
+    summary: Optional[str]
+    fields: Optional[Dict[str, Any]]
+
+    @property
+    def summary_hash(self) -> Optional[str]:
+        """
+        :return: Hash of the artifact summary, None if artifact is not summarized.
+        """
+        return CommitStore.hash_summary(self.summary)
+
+
+@dataclass(slots=True)
+class TraceRecord:
+    """
+    :param id: ID of the trace link in SAFA.
+    :param source_id: ID of the source artifact.
+    :param target_id: ID of the target artifact.
+    """
+    id: str
+    source_id: Optional[str]
+    target_id: Optional[str]
+
 
 class CommitStore:
     def __init__(self, version_data: Dict):
         """
         Creates store to keep track of current artifacts in a timeline of commits.
+        Only the identifying information and summaries of entities are kept, their bodies are not.
         """
-        self.artifact_store: Dict[str, Dict] = self.create_artifact_store(version_data["artifacts"])
-        self.trace_store: Dict[str, Dict] = {}
+        self.artifact_store: Dict[str, ArtifactRecord] = self.create_artifact_store(version_data["artifacts"])
+        self.trace_store: Dict[str, TraceRecord] = self.create_trace_store(version_data.get("traces", []))
 
     def add_ids(self, commit_request: DiffDataType) -> None:
         """
@@ -35,15 +77,45 @@ class CommitStore:
 
         self._add_traces(commit_response["traces"]["added"])
         self._add_traces(commit_response["traces"]["modified"])
+        self._remove_traces(commit_response["traces"]["removed"])
+
+    def get_memory_usage(self) -> int:
+        """
+        Estimates the memory used by the store.
+        :return: Number of bytes used by the store's records and indices.
+        """
+        n_bytes = sys.getsizeof(self.artifact_store) + sys.getsizeof(self.trace_store)
+        for a_name, a_record in self.artifact_store.items():
+            n_bytes += sys.getsizeof(a_name) + sys.getsizeof(a_record)
+            n_bytes += sum(sys.getsizeof(v) for v in [a_record.id, a_record.type, a_record.summary, a_record.fields])
+            if a_record.fields:
+                n_bytes += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in a_record.fields.items())
+        for t_id, t_record in self.trace_store.items():
+            n_bytes += sys.getsizeof(t_id) + sys.getsizeof(t_record)
+            n_bytes += sum(sys.getsizeof(v) for v in [t_record.id, t_record.source_id, t_record.target_id])
+        return n_bytes
+
+    def print_summary(self) -> None:
+        """
+        Prints the number of entities in store and the memory they use.
+        :return: None
+        """
+        n_kilobytes = self.get_memory_usage() / 1024
+        print(f"...commit store: {len(self.artifact_store)} artifacts, "
+              f"{len(self.trace_store)} traces ({n_kilobytes:.1f} KB)...")
 
     def _add_artifacts(self, artifacts: List[Dict]) -> None:
         """
-        Adds artifacts to store.
+        Adds artifacts to store, keeping the summary of their previous revision if they have none.
         :param artifacts: Artifacts to add to store.
         :return: None
         """
         for artifact in artifacts:
-            self.artifact_store[artifact["name"]] = artifact
+            artifact_record = self.create_artifact_record(artifact)
+            previous_record = self.artifact_store.get(artifact["name"])
+            if not artifact_record.summary and previous_record:
+                artifact_record.summary = previous_record.summary
+            self.artifact_store[artifact["name"]] = artifact_record
 
     def _add_traces(self, traces: List[Dict]) -> None:
         """
@@ -52,22 +124,24 @@ class CommitStore:
         :return:None
         """
         for trace in traces:
-            t_id = f"{trace['sourceName']}*{trace['targetName']}"
-            self.trace_store[t_id] = trace
+            self.trace_store[self.get_tid(trace)] = self.create_trace_record(trace)
 
     def _update_artifacts(self, artifacts: List[Dict]) -> None:
         """
-        Updates artifacts with ID.
-        :param artifacts: The artifacts to add id to.
+        Updates artifacts with the fields of their previous revision, keeping their new body.
+        :param artifacts: The artifacts to add id, type, summary, and remaining fields to.
         :return: None
         """
         for artifact in artifacts:
             a_name = artifact["name"]
             if a_name not in self.artifact_store:
-                raise Exception("Artifact ({a_name}) has not been set in store.)")
-            previous_artifact = self.artifact_store[a_name]
-            for key, value in previous_artifact.items():
-                artifact[key] = value if key != "body" else artifact[key]
+                raise Exception(f"Artifact ({a_name}) has not been set in store.")
+            artifact_record = self.artifact_store[a_name]
+            if artifact_record.fields:
+                artifact.update(artifact_record.fields)
+            artifact["id"] = artifact_record.id
+            artifact["type"] = artifact_record.type
+            artifact["summary"] = artifact_record.summary
 
     def _update_traces(self, traces: List[Dict]) -> None:
         """
@@ -77,11 +151,13 @@ class CommitStore:
         """
         for trace in traces:
             t_id = self.get_tid(trace)
-            trace["id"] = self.trace_store[t_id]["id"]
+            if t_id not in self.trace_store:
+                raise Exception(f"Trace ({t_id}) has not been set in store.")
+            trace["id"] = self.trace_store[t_id].id
             if trace["sourceName"] in self.artifact_store:
-                trace["sourceId"] = self.artifact_store[trace["sourceName"]]
+                trace["sourceId"] = self.artifact_store[trace["sourceName"]].id
             if trace["targetName"] in self.artifact_store:
-                trace["targetId"] = self.artifact_store[trace["targetName"]]
+                trace["targetId"] = self.artifact_store[trace["targetName"]].id
 
     def _remove_artifacts(self, artifacts: List[Dict]) -> None:
         """
@@ -90,7 +166,16 @@ class CommitStore:
         :return: None
         """
         for artifact in artifacts:
-            del self.artifact_store[artifact["name"]]
+            self.artifact_store.pop(artifact["name"], None)
+
+    def _remove_traces(self, traces: List[Dict]) -> None:
+        """
+        Removes traces from store.
+        :param traces: The traces to remove.
+        :return: None
+        """
+        for trace in traces:
+            self.trace_store.pop(self.get_tid(trace), None)
 
     @staticmethod
     def get_tid(trace: Dict) -> str:
@@ -102,11 +187,54 @@ class CommitStore:
         return f"{trace['sourceName']}*{trace['targetName']}"
 
     @staticmethod
-    def create_artifact_store(artifacts: List[Dict]) -> Dict[str, Dict]:
+    def hash_summary(summary: Optional[str]) -> Optional[str]:
+        """
+        Hashes summary so that changes to it can be detected without storing it.
+        :param summary: The summary to hash.
+        :return: The hash of the summary, None if there is no summary.
+        """
+        if not summary:
+            return None
+        return hashlib.blake2b(summary.encode("utf-8"), digest_size=8).hexdigest()
+
+    @staticmethod
+    def create_artifact_record(artifact: Dict) -> ArtifactRecord:
+        """
+        Extracts identifying information and summary of artifact.
+        :param artifact: The artifact JSON.
+        :return: The artifact record.
+        """
+        fields = {k: v for k, v in artifact.items() if k not in RECORD_KEYS}
+        return ArtifactRecord(id=artifact["id"],
+                              name=artifact["name"],
+                              type=artifact["type"],
+                              summary=artifact.get("summary"),
+                              fields=fields if fields else None)
+
+    @staticmethod
+    def create_trace_record(trace: Dict) -> TraceRecord:
+        """
+        Extracts identifying information of trace.
+        :param trace: The trace link JSON.
+        :return: The trace record.
+        """
+        trace_id = trace["id"] if "id" in trace else trace["traceLinkId"]
+        return TraceRecord(id=trace_id, source_id=trace.get("sourceId"), target_id=trace.get("targetId"))
+
+    @staticmethod
+    def create_artifact_store(artifacts: List[Dict]) -> Dict[str, ArtifactRecord]:
         """
-        Creates map of artifact names to artifact.
+        Creates map of artifact names to artifact records.
         :param artifacts: List of artifacts to store.
         :return: Mapping.
         """
-        artifact_store = {a["name"]: a for a in artifacts}
-        return artifact_store
+        return {a["name"]: CommitStore.create_artifact_record(a) for a in artifacts}
+
+    @staticmethod
+    def create_trace_store(traces: List[Dict]) -> Dict[str, TraceRecord]:
+        """
+        Creates map of trace IDs (source*target) to trace records.
+        :param traces: List of traces to store.
+        :return: Mapping.
+        """
+        return {CommitStore.get_tid(t): CommitStore.create_trace_record(t) for t in traces}
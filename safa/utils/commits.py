@@ -5,9 +5,12 @@ from typing import Dict, List, Optional, Tuple, cast
 import git
 from git import Blob, Commit, Repo
 
+from safa.config.run_options import SINCE_LAST_COMMITS
+from safa.data.diff_stat import DiffStat
 from safa.utils.markdown import list_formatter
 from safa.utils.menus.inputs import input_option
 from safa.utils.menus.page_menu import input_menu_paged
+from safa.utils.profiler import timed
 
 
 def select_commits(repo: Repo) -> List[Commit]:
@@ -49,6 +52,33 @@ def input_commit(repo: Repo, **kwargs) -> Commit | List[Commit]:
     return id2commit[selected_commit_ids]
 
 
+def get_commits_since(repo: Repo, commit_id: Optional[str] = None, rev: str = "HEAD") -> List[Commit]:
+    """
+    Returns the commits made after commit.
+    :param repo: Repository to pull commits from.
+    :param commit_id: Hexsha of the commit to start after, all commits are returned if none is given.
+    :param rev: The revision whose history is returned.
+    :return: List of commits, oldest first.
+    """
+    rev_range = f"{commit_id}..{rev}" if commit_id else rev
+    return list(repo.iter_commits(rev=rev_range, reverse=True))
+
+
+def resolve_commits(repo: Repo, commits_option: str, last_commit_id: Optional[str] = None) -> List[Commit]:
+    """
+    Resolves commits given on the command line.
+    :param repo: Repository to pull commits from.
+    :param commits_option: Either `since-last` or a git revision range (e.g. main~3..main).
+    :param last_commit_id: Hexsha of the last commit pushed, used by `since-last`.
+    :return: List of commits, oldest first.
+    """
+    if commits_option == SINCE_LAST_COMMITS:
+        return get_commits_since(repo, last_commit_id)
+    if ".." not in commits_option:
+        return [repo.commit(commits_option)]
+    return list(repo.iter_commits(rev=commits_option, reverse=True))
+
+
 def get_last_repo_commit(repo: Optional[git.Repo] = None, repo_path: Optional[str] = None) -> Commit:
     """
     Returns the last commit at given repo.
@@ -62,21 +92,23 @@ def get_last_repo_commit(repo: Optional[git.Repo] = None, repo_path: Optional[st
     return last_commit
 
 
-def create_commit_artifact(repo: Repo, commit: Commit, prefix: str = "") -> Dict:
+def create_commit_artifact(commit: Commit, prefix: str = "", diff_stat: Optional[DiffStat] = None) -> Dict:
     """
     Creates artifact containing commit title and changes.
-    :param repo: Project repository.
     :param commit: Commit to convert to artifact.
     :param prefix: Prefix to add to commit artifact name.
+    :param diff_stat: Number of files and lines changed in commit, appended to body if given.
     :return: Artifact.
     """
-    diff = repo.git.diff(commit.parents[0], commit) if commit.parents else "FIRST COMMIT BUG"
     commit_message = str(commit.message)
     title, changes = from_commit_message(commit_message)
+    body = "\n".join(changes)
+    if diff_stat is not None:
+        body = f"{body}\n\n{diff_stat}" if body else str(diff_stat)
     return {
         "name": f"{prefix}{title}",
         "summary": "",
-        "body": "\n".join(changes),
+        "body": body,
         "type": "Commit"
     }
 
@@ -145,6 +177,7 @@ def select_branch(repo: git.Repo) -> str:
     return cast(str, branch_name)
 
 
+@timed("git.decode_blob")
 def decode_blob(blob: Optional[Blob] = None) -> str:
     """
     Decodes blob to string.
@@ -1,7 +1,14 @@
 import json
-from typing import Dict, List, Tuple, cast
+from typing import Dict, List, Optional, Tuple, cast
 
 from safa.data.file_change import FileChange
+from safa.utils.commits import to_commit_message
+from safa.utils.code_condenser import condense_file_change
+from safa.utils.llm_router import estimate_tokens
+from safa.utils.profiler import span, timed
+from safa.utils.prompt_cache import MessageContent, create_cached_content
+from safa.utils.structured_output import invoke_json
+from safa.utils.summary_cache import SummaryCache
 
 SUMMARIZE_INSTRUCTIONS = """
 You are a AI agent working on a software project to help users document their development practices.
@@ -13,6 +20,7 @@ Our job is detect what is changing and describe the system after the changes.
 The subsequent message will contain a change they have made across all files.
 Your job is the make sense of these changes and describe the new system behavior.
 Each of these messages will contain the file before the change, the file specification, and the diff of the changes.
+Files analyzed previously only contain the summary of their diff.
 
 Create a JSON object that:
 - summarizes each diff to describe how the code is changing
@@ -21,52 +29,148 @@ Create a JSON object that:
 """
 
 SUMMARIZE_FORMAT = {
-    "diffs": ["diff summary 1", "diff summary 2"],
+    "diffs": {"path/to/file_1": "diff summary 1", "path/to/file_2": "diff summary 2"},
     "changes": ["change 1", "change 2"],
     "title": "commit title"
 }
 
+SUMMARIZE_TOOL = {
+    "name": "summarize_commit",
+    "description": "Records the summary of the changes made across all files.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "diffs": {
+                "type": "object",
+                "description": "Map of each file path to the summary of its diff.",
+                "additionalProperties": {"type": "string"}
+            },
+            "changes": {
+                "type": "array",
+                "description": "The changes to the system functionality.",
+                "items": {"type": "string"}
+            },
+            "title": {"type": "string", "description": "The commit title."}
+        },
+        "required": ["diffs", "changes", "title"]
+    }
+}
+
+REGENERATE_INSTRUCTIONS = """
+You are a AI agent helping users write commit messages.
+
+You will receive the current commit message and the summary of the changes made to each file.
+Rewrite only the requested part of the commit message so that it accurately and concisely describes the changes.
+The rewritten part should be consistent with the rest of the commit message but not repeat it.
+"""
+
+REGENERATE_FORMAT = {"text": "rewritten title or change"}
+
+REGENERATE_TOOL = {
+    "name": "rewrite_commit_part",
+    "description": "Records the rewritten title or change of the commit message.",
+    "input_schema": {
+        "type": "object",
+        "properties": {"text": {"type": "string", "description": "The rewritten title or change."}},
+        "required": ["text"]
+    }
+}
+
 EMPTY_PROJECT_SUMMARY = "Project summary has not been generated yet."
 
 
-def summarize_commit_changes(llm_manager, file_changes: List[FileChange], project_summary: str) -> Tuple[str, List[str]]:
+@timed("llm.summarize_commit_changes")
+def summarize_commit_changes(llm_manager, file_changes: List[FileChange], project_summary: str,
+                             summary_cache: Optional[SummaryCache] = None) -> Tuple[str, List[str]]:
     """
     Generates summary for list of changes.
     :param llm_manager: LLM manager used to summarize file changes.
     :param file_changes: File changes to summarize into one commit.
     :param project_summary: The project summary to include in system description.
+    :param summary_cache: Cache of previous summaries, only files whose changes are not cached are sent in full.
     :return: Title and changes across files.
     """
-    prompt = create_change_prompt(file_changes)
+    if summary_cache:
+        cached_message = summary_cache.get_message(file_changes)
+        if cached_message:
+            print("...using cached summary of staged changes...")
+            return cached_message
+    file2summary = summary_cache.get_file_summaries(file_changes) if summary_cache else {}
+
+    prompt = create_change_prompt(file_changes, file2summary=file2summary)
     system_prompt = "\n\n".join([SUMMARIZE_INSTRUCTIONS, get_format_prompt(SUMMARIZE_FORMAT)])
-    messages = [
+    # instructions and project summary form a stable prefix that the provider caches across commits
+    messages: List[Tuple[str, MessageContent]] = [
         ("system", system_prompt),
-        ("human", project_summary if project_summary else EMPTY_PROJECT_SUMMARY),
+        ("human", create_cached_content(project_summary if project_summary else EMPTY_PROJECT_SUMMARY)),
         ("human", prompt)
     ]
-    print("...generating...")
+    prompt_tokens = estimate_tokens(messages)
+    print(f"...generating ({prompt_tokens} prompt tokens, {len(file2summary)} files cached)...")
 
-    response = cast(str, llm_manager.invoke(messages).content)
-    response_json = parse_json(response)
+    with span("llm.invoke", prompt_tokens=prompt_tokens):
+        response_json = invoke_json(llm_manager, messages, SUMMARIZE_TOOL)
     diff_summaries = response_json["changes"]
     title = response_json["title"]
+    if summary_cache:
+        if isinstance(response_json.get("diffs"), dict):
+            file2summary.update(response_json["diffs"])
+        summary_cache.save(file_changes, file2summary, title, diff_summaries)
     return title, diff_summaries
 
 
-def create_change_prompt(changes: List[FileChange], delimiter="\n\n") -> str:
+@timed("llm.regenerate_commit_part")
+def regenerate_commit_part(llm_manager, file_changes: List[FileChange], file2summary: Dict[str, str], title: str,
+                           changes: List[str], change_index: Optional[int] = None) -> str:
+    """
+    Regenerates the title or a single change of the commit message, sending only the summaries of the file changes.
+    :param llm_manager: LLM manager used to rewrite the message.
+    :param file_changes: File changes in commit, files without summary are sent in full.
+    :param file2summary: Map of file to the summary of its change.
+    :param title: The current title of the commit.
+    :param changes: The current changes of the commit.
+    :param change_index: Index of the change to regenerate, None to regenerate the title.
+    :return: The regenerated title or change.
+    """
+    target = "the title" if change_index is None else f"change {change_index + 1} ({changes[change_index]})"
+    prompt = "\n\n".join([
+        f"# Current Commit Message\n{to_commit_message(title, changes, format_type='numbered')}",
+        create_change_prompt(file_changes, file2summary=file2summary),
+        f"Rewrite {target}."
+    ])
+    system_prompt = "\n\n".join([REGENERATE_INSTRUCTIONS, get_format_prompt(REGENERATE_FORMAT)])
+    messages: List[Tuple[str, MessageContent]] = [("system", system_prompt), ("human", prompt)]
+    print(f"...regenerating {target} ({estimate_tokens(messages)} prompt tokens)...")
+    response_json = invoke_json(llm_manager, messages, REGENERATE_TOOL)
+    return cast(str, response_json["text"]).strip()
+
+
+def create_change_prompt(changes: List[FileChange], delimiter="\n\n",
+                         file2summary: Optional[Dict[str, str]] = None) -> str:
     """
     Creates prompts detailing the file summary, file before commit, and file changes.
+    Large files in supported languages are condensed to the source of the symbols changed and the signatures of others.
     :param changes: List of file changes.
     :param delimiter: The delimiter to use between sections.
+    :param file2summary: Map of file to the summary of its change, used instead of the file and diff if present.
     :return: Prompt containing all file changes.
     """
     prompts = []
 
     for change in changes:
         change_prompts = [f"# File: {change.file}"]
+        if file2summary and change.file in file2summary:
+            change_prompts.append(f"## Summary Of Changes\n{file2summary[change.file]}")
+            prompts.append(delimiter.join(change_prompts))
+            continue
         if change.summary:
             change_prompts.append(f"## Original Specification\n{change.summary}")
-        if change.content_before:
+        condensed_change = condense_file_change(change)
+        if condensed_change:
+            if condensed_change.changed_symbols:
+                change_prompts.append("## Changed Symbols\n" + "\n".join(condensed_change.changed_symbols))
+            change_prompts.append(f"## File Before Change (unchanged code omitted)\n{condensed_change.content_before}")
+        elif change.content_before:
             change_prompts.append(f"## File Before Change\n{change.content_before}")
         change_prompts.append(f"## Changes\n{change.diff}")
         change_prompt = delimiter.join(change_prompts)
@@ -75,22 +179,6 @@ def create_change_prompt(changes: List[FileChange], delimiter="\n\n") -> str:
     return cast(str, delimiter.join(prompts))
 
 
-def parse_json(response: str) -> Dict:
-    """
-    Attempts to find the JSON block in response and parse it into an object.
-    :param response: String response from LLM.
-    :return: Parsed JSON.
-    """
-    start_index = response.find("```json")
-    end_index = response.find("```", start_index + 1)
-    json_str = response[start_index + 7:end_index]
-    try:
-        return cast(Dict, json.loads(json_str))
-    except Exception as e:
-        print(response)
-        raise e
-
-
 def get_format_prompt(example_json) -> str:
     """
     Generates prompt displaying the expected format of the json response.
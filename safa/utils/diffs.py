@@ -1,22 +1,28 @@
-from typing import Optional
+import difflib
+from typing import List, Optional, cast
 
 import git
-from git import Commit, Diff
+from git import Blob, Commit, Diff
 
 from safa.constants import EMPTY_TREE_HEXSHA
 from safa.data.artifact import create_artifact
 from safa.data.commits import DeltaType, DiffDataType
+from safa.data.diff_stat import DiffStat
 from safa.utils.commits import create_commit_artifact, decode_blob
+from safa.utils.profiler import timed
 
 BUG_FIX_FLAG = True
 
 
-def calculate_diff(repo: git.Repo, commit: Commit, starting_commit: Optional[Commit] = None, **commit_kwargs) -> DiffDataType:
+@timed("git.calculate_diff")
+def calculate_diff(repo: git.Repo, commit: Commit, starting_commit: Optional[Commit] = None, include_diff_stat: bool = False,
+                   **commit_kwargs) -> DiffDataType:
     """
     Calculates the differences to commit.
     :param repo: The repository to calculate diff for.
     :param commit: The commit whose final state is the one desired.
     :param starting_commit: The commit to start diff from, if none assume empty repository.
+    :param include_diff_stat: Whether to include the number of files and lines changed in the commit artifact.
     :param commit_kwargs: Kwargs passed to commit artifact construction.
     :return: Delta information.
     """
@@ -29,7 +35,8 @@ def calculate_diff(repo: git.Repo, commit: Commit, starting_commit: Optional[Com
     for diff in diffs:
         add_diff_to_delta(artifact_delta, diff)
 
-    commit_artifact = create_commit_artifact(repo, commit, **commit_kwargs)
+    diff_stat = calculate_diff_stat(diffs) if include_diff_stat else None
+    commit_artifact = create_commit_artifact(commit, diff_stat=diff_stat, **commit_kwargs)
     traces = [{
         "sourceName": a["name"],
         "targetName": commit_artifact["name"]
@@ -48,6 +55,35 @@ def calculate_diff(repo: git.Repo, commit: Commit, starting_commit: Optional[Com
     return commit_data
 
 
+def calculate_diff_stat(diffs: List[Diff]) -> DiffStat:
+    """
+    Counts the files and lines changed by comparing the blobs of the diffs, so that no patch is created.
+    :param diffs: The diffs of the commit.
+    :return: The number of files changed, lines inserted, and lines deleted.
+    """
+    diff_stat = DiffStat(files=len(diffs))
+    for diff in diffs:
+        lines_before, lines_after = read_blob_lines(diff.a_blob), read_blob_lines(diff.b_blob)
+        matcher = difflib.SequenceMatcher(None, lines_before, lines_after, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag in ["replace", "delete"]:
+                diff_stat.deletions += i2 - i1
+            if tag in ["replace", "insert"]:
+                diff_stat.insertions += j2 - j1
+    return diff_stat
+
+
+def read_blob_lines(blob: Optional[Blob]) -> List[bytes]:
+    """
+    :param blob: The blob to read.
+    :return: Lines of blob, none if blob does not exist or is binary.
+    """
+    if blob is None:
+        return []
+    content = cast(bytes, blob.data_stream.read())
+    return [] if b"\0" in content else content.splitlines()
+
+
 def add_diff_to_delta(delta_data: DeltaType, diff: Diff) -> None:
     """
     Translates diff to commit data.
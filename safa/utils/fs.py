@@ -1,6 +1,7 @@
 import json
 import os
 import shutil
+import tempfile
 from typing import Any, Dict, cast
 
 
@@ -15,6 +16,21 @@ def write_file_content(file_path: str, file_content: str) -> None:
         f.write(file_content)
 
 
+def write_file_atomic(file_path: str, file_content: str) -> None:
+    """
+    Writes content to temporary file then renames it to file path so readers never see a partially written file.
+    :param file_path: Path to file.
+    :param file_content: Content to write.
+    :return: None
+    """
+    file_dir = os.path.dirname(os.path.abspath(file_path))
+    with tempfile.NamedTemporaryFile("w", dir=file_dir, prefix=".tmp-", delete=False) as f:
+        f.write(file_content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f.name, file_path)
+
+
 def write_json(file_path: str, json_dict: Dict) -> None:
     """
     Writes dict as JSON to file.
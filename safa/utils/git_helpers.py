@@ -1,11 +1,13 @@
-from typing import Dict
+from typing import Dict, Optional, Tuple, cast
 
 import git
 
 from safa.utils.menus.inputs import input_option
 from safa.utils.menus.printers import print_title
+from safa.utils.profiler import timed
 
 
+@timed("git.get_staged_diffs")
 def get_staged_diffs(repo: git.Repo) -> Dict[str, str]:
     """
     Gets the changes changed and extracts their diffs.
@@ -43,10 +45,40 @@ def get_file_content_before(repo, file_path):
     return content_before
 
 
-def stage_files(repo: git.Repo) -> None:
+def get_staged_file_content(repo: git.Repo, file_path: str) -> Optional[str]:
+    """
+    Get the content of the file staged for commit.
+    :param repo: The repository that file exists in.
+    :param file_path: The path of the file.
+    :return: The staged content of the file, None if file is removed.
+    """
+    try:
+        return cast(str, repo.git.show(f':{file_path}'))
+    except git.exc.GitCommandError:
+        return None
+
+
+def get_staged_blob_ids(repo: git.Repo, file_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Gets the ids of the file's blob in HEAD and in the index, which identify its content before and after the change.
+    :param repo: The repository that file exists in.
+    :param file_path: The path of the file.
+    :return: Blob id before and after staged change, None where file does not exist.
+    """
+    try:
+        blob_before: Optional[str] = repo.head.commit.tree[file_path].hexsha
+    except (KeyError, ValueError):
+        blob_before = None
+    index_entry = repo.index.entries.get((file_path, 0))
+    blob_after = index_entry.hexsha if index_entry else None
+    return blob_before, blob_after
+
+
+def stage_files(repo: git.Repo, interactive: bool = True) -> None:
     """
     Displays the files that have been changed to the user and indicates which files are staged and which are not.
     :param repo: The repository to analyze.
+    :param interactive: Whether to prompt user to stage the unstaged files.
     :return: List of changed files and untracked files.
     """
     print_title("Repository")
@@ -61,7 +93,7 @@ def stage_files(repo: git.Repo) -> None:
         for i, file in enumerate(staged_files):
             print(f"{i + 1}. {file}")
 
-    if len(changed_files) == 0:
+    if len(changed_files) == 0 or not interactive:
         return
     to_stage = input_option(changed_files, title="Unstaged Files", many=True, page_items=len(changed_files))
     repo.index.add(to_stage)
@@ -0,0 +1,133 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+JSON_FENCE_PATTERN = re.compile(r"```(?:json)?[ \t]*\n?")
+CLOSING_BRACKETS = {"{": "}", "[": "]"}
+
+
+def repair_json(response: str) -> Optional[Dict]:
+    """
+    Finds the JSON object in response, with or without a code fence, and parses it.
+    Trailing commas are removed and truncated objects are closed, dropping their incomplete last value.
+    :param response: String response from LLM.
+    :return: Parsed JSON object, None if no object could be recovered.
+    """
+    json_str = extract_json_str(response)
+    if json_str is None:
+        return None
+    decoder = json.JSONDecoder()
+    for candidate in [json_str, remove_trailing_commas(json_str)]:
+        try:
+            return as_object(decoder.raw_decode(candidate)[0])
+        except ValueError:
+            continue
+
+    json_str = remove_trailing_commas(json_str)
+    _, in_string, boundaries = scan_json(json_str)
+    cut_indices = ([] if in_string else [len(json_str)]) + boundaries[::-1]
+    for cut_index in cut_indices:
+        try:
+            return as_object(json.loads(close_json(json_str[:cut_index])))
+        except ValueError:
+            continue
+    return None
+
+
+def extract_json_str(response: str) -> Optional[str]:
+    """
+    Returns response from the start of its JSON object, only looking inside the first code fence if there is one.
+    :param response: String response from LLM.
+    :return: The JSON object and anything following it, None if response contains no object.
+    """
+    fence_match = JSON_FENCE_PATTERN.search(response)
+    if fence_match:
+        end_index = response.find("```", fence_match.end())
+        response = response[fence_match.end():end_index if end_index >= 0 else len(response)]
+    start_index = response.find("{")
+    return response[start_index:] if start_index >= 0 else None
+
+
+def scan_json(json_str: str) -> Tuple[List[str], bool, List[int]]:
+    """
+    Scans JSON for the brackets left open at its end.
+    :param json_str: The (possibly truncated) JSON.
+    :return: Open brackets, whether JSON ends inside a string, and the indices where a value may be cut off (at commas
+    and after opening brackets).
+    """
+    open_brackets: List[str] = []
+    boundaries: List[int] = []
+    in_string = is_escaped = False
+    for i, c in enumerate(json_str):
+        if in_string:
+            if is_escaped:
+                is_escaped = False
+            elif c == "\\":
+                is_escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in CLOSING_BRACKETS:
+            open_brackets.append(c)
+            boundaries.append(i + 1)
+        elif c in "}]":
+            if open_brackets:
+                open_brackets.pop()
+        elif c == ",":
+            boundaries.append(i)
+    return open_brackets, in_string, boundaries
+
+
+def remove_trailing_commas(json_str: str) -> str:
+    """
+    Removes commas directly preceding a closing bracket, ignoring those in strings.
+    :param json_str: The JSON.
+    :return: JSON without trailing commas.
+    """
+    chars: List[str] = []
+    in_string = is_escaped = False
+    for c in json_str:
+        if in_string:
+            if is_escaped:
+                is_escaped = False
+            elif c == "\\":
+                is_escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "}]":
+            while chars and chars[-1].isspace():
+                chars.pop()
+            if chars and chars[-1] == ",":
+                chars.pop()
+        chars.append(c)
+    return "".join(chars)
+
+
+def close_json(json_str: str) -> str:
+    """
+    Closes the string and brackets left open by truncated JSON.
+    :param json_str: The truncated JSON.
+    :return: JSON with all brackets closed.
+    """
+    json_str = json_str.rstrip()
+    if json_str.endswith(","):
+        json_str = json_str[:-1]
+    open_brackets, in_string, _ = scan_json(json_str)
+    if in_string:
+        json_str += '"'
+    if json_str.endswith(":"):
+        json_str += "null"
+    return json_str + "".join(CLOSING_BRACKETS[b] for b in reversed(open_brackets))
+
+
+def as_object(value: Any) -> Dict:
+    """
+    :param value: Parsed JSON value.
+    :return: The value if it is an object.
+    """
+    if not isinstance(value, dict):
+        raise ValueError("Expected JSON object.")
+    return cast(Dict, value)
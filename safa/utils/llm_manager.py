@@ -1,23 +1,33 @@
-from typing import Callable, Dict, Tuple, Union
+import os
+from typing import Callable, Dict, Optional, Tuple
 
 from langchain_anthropic import ChatAnthropic
 
 from safa.config.llm_config import LLMConfig
+from safa.utils.llm_router import LLM_TIMEOUT, LLMRoute, LLMRouter, parse_llm_routes
+from safa.utils.prompt_cache import PROMPT_CACHING, PROMPT_CACHING_HEADERS
+from safa.utils.usage_ledger import UsageLedger
 
 MessageType = Tuple[str, str]
 
-LLMManager = Union[ChatAnthropic]
 DEFAULT_LLM_MANAGER = "anthropic"
+LLM_MAX_TOKENS = int(os.environ.get("SAFA_LLM_MAX_TOKENS", 4096))
 
-ALLOWED_MANAGERS: Dict[str, Callable[[str], ChatAnthropic]] = {
-    "anthropic": lambda k: ChatAnthropic(api_key=k, model_name='claude-3-sonnet-20240229', max_tokens=4096)  # type: ignore
+ALLOWED_MANAGERS: Dict[str, Callable[[str, LLMRoute], ChatAnthropic]] = {
+    "anthropic": lambda k, route: ChatAnthropic(api_key=k, model_name=route.model_name,  # type: ignore
+                                                max_tokens=LLM_MAX_TOKENS, default_request_timeout=LLM_TIMEOUT,
+                                                default_headers=PROMPT_CACHING_HEADERS if PROMPT_CACHING else None)
 }
 
 
-def get_llm_manager(llm_config: LLMConfig) -> ChatAnthropic:
+def get_llm_manager(llm_config: LLMConfig, usage_ledger: Optional[UsageLedger] = None) -> LLMRouter:
     """
-    Reads LLM manager from env variables.
+    Creates LLM manager routing each prompt to a model of the configured provider by its size.
+    :param llm_config: Configuration containing provider, key, and routing table.
+    :param usage_ledger: Ledger recording the usage of each request, if given.
     :return: LLM Manager
     """
-    llm_manager = ALLOWED_MANAGERS[llm_config.llm_provider](llm_config.llm_key)
-    return llm_manager
+    create_llm = ALLOWED_MANAGERS[llm_config.llm_provider]
+    routes = parse_llm_routes(llm_config.llm_routes)
+    return LLMRouter(routes, lambda route: create_llm(llm_config.llm_key, route),
+                     on_usage=usage_ledger.record if usage_ledger else None)
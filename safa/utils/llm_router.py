@@ -0,0 +1,263 @@
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple, cast
+
+from safa.api.event_loop import run_sync
+from safa.utils.menus.printers import print_title
+from safa.utils.profiler import span
+from safa.utils.prompt_cache import MessageContent, get_cache_usage, get_content_text, get_prompt_tokens
+
+CHARS_PER_TOKEN = 4
+ROUTE_DELIMITER = ","
+THRESHOLD_DELIMITER = ":"
+LLM_TIMEOUT = float(os.environ.get("SAFA_LLM_TIMEOUT", 120))
+LLM_HEDGE_PERCENTILE = float(os.environ.get("SAFA_LLM_HEDGE_PERCENTILE", 90))
+LLM_HEDGE_DELAY = float(os.environ.get("SAFA_LLM_HEDGE_DELAY", 30))
+LLM_HEDGE_MIN_SAMPLES = 5
+LLM_LATENCY_SAMPLES = 100
+
+
+@dataclass
+class LLMRoute:
+    """
+    :param model_name: The model used by route.
+    :param max_prompt_tokens: The largest prompt routed to model, None if there is no limit.
+    """
+    model_name: str
+    max_prompt_tokens: Optional[int] = None
+
+
+@dataclass
+class RouteMetrics:
+    """
+    :param n_calls: Number of prompts sent to route.
+    :param latency: Total seconds spent waiting on route.
+    :param prompt_tokens: Total tokens sent to route.
+    :param output_tokens: Total tokens generated by route.
+    :param cache_read_tokens: Total prompt tokens read from the provider's cache.
+    :param cache_creation_tokens: Total prompt tokens written to the provider's cache.
+    :param n_hedged: Number of additional requests sent because a request was slow or failed.
+    :param cancelled_prompt_tokens: Estimated prompt tokens of requests cancelled after another request responded.
+    The provider still bills them.
+    """
+    n_calls: int = 0
+    latency: float = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    n_hedged: int = 0
+    cancelled_prompt_tokens: int = 0
+
+    def add(self, other: "RouteMetrics") -> None:
+        """
+        Adds the calls, latency, and tokens of other metrics to these.
+        :param other: The metrics to add.
+        :return: None
+        """
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+class LLMRouter:
+    def __init__(self, routes: List[LLMRoute], create_llm: Callable[[LLMRoute], Any], timeout: float = LLM_TIMEOUT,
+                 hedge_percentile: float = LLM_HEDGE_PERCENTILE, hedge_delay: float = LLM_HEDGE_DELAY,
+                 on_usage: Optional[Callable[[str, int, RouteMetrics], None]] = None):
+        """
+        Sends each prompt to the first route whose token limit fits it.
+        Requests slower than the route's latency percentile are hedged with a second request, the first response wins.
+        :param routes: Routes ordered from smallest to largest limit, the last route receives all larger prompts.
+        :param create_llm: Creates the LLM of a route, called the first time a route is used.
+        :param timeout: Seconds to wait for a response before failing.
+        :param hedge_percentile: Latency percentile of route after which a hedged request is sent, 0 disables hedging.
+        :param hedge_delay: Seconds after which a hedged request is sent until route has enough latency samples.
+        :param on_usage: Called with the model, estimated prompt tokens, and usage of each successful request.
+        """
+        if len(routes) == 0:
+            raise Exception("Expected at least one LLM route.")
+        self.routes = routes
+        self.create_llm = create_llm
+        self.llms: Dict[str, Any] = {}
+        self.tool_llms: Dict[Tuple[str, str], Any] = {}
+        self.metrics: Dict[str, RouteMetrics] = {r.model_name: RouteMetrics() for r in routes}
+        self.latencies: Dict[str, Deque[float]] = {r.model_name: deque(maxlen=LLM_LATENCY_SAMPLES) for r in routes}
+        self.timeout = timeout
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.on_usage = on_usage
+
+    def invoke(self, messages: List[Tuple[str, MessageContent]], tool: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Sends messages to the model of the route selected by their size.
+        Interrupting (Ctrl+C) cancels the requests in flight and raises KeyboardInterrupt to the caller.
+        :param messages: The role and content of each message.
+        :param tool: Tool definition the model is forced to call, ignored by models without tool support.
+        :return: The model's response.
+        """
+        prompt_tokens = estimate_tokens(messages)
+        route = self.get_route(prompt_tokens)
+        llm = self.get_llm(route, tool)
+
+        call_metrics = RouteMetrics(n_calls=1)
+        start = time.perf_counter()
+        with span(f"llm.{route.model_name}", prompt_tokens=prompt_tokens):
+            response = run_sync(self.invoke_hedged(route, llm, messages, call_metrics))
+        call_metrics.latency = time.perf_counter() - start
+        self.latencies[route.model_name].append(call_metrics.latency)
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        call_metrics.prompt_tokens = get_prompt_tokens(response, prompt_tokens)
+        call_metrics.output_tokens = usage.get("output_tokens", 0)
+        call_metrics.cache_read_tokens, call_metrics.cache_creation_tokens = get_cache_usage(response)
+        self.metrics[route.model_name].add(call_metrics)
+        if self.on_usage:
+            self.on_usage(route.model_name, prompt_tokens, call_metrics)
+        print(f"...{route.model_name} responded in {call_metrics.latency:.2f}s ({prompt_tokens} prompt tokens, "
+              f"{call_metrics.cache_read_tokens} read from cache)...")
+        return response
+
+    async def invoke_hedged(self, route: LLMRoute, llm: Any, messages: List[Tuple[str, MessageContent]],
+                            call_metrics: RouteMetrics) -> Any:
+        """
+        Sends messages to LLM, sending them a second time if the first request is slower than the hedge delay or fails.
+        If every request sent fails, messages are retried once more unless the failed request was already retried.
+        The first successful response is returned and the other request is cancelled.
+        :param route: The route of LLM.
+        :param llm: The LLM to send messages to.
+        :param messages: The role and content of each message.
+        :param call_metrics: Metrics of the call, counts the hedged requests and the prompts of cancelled requests.
+        :return: The first successful response.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        hedge_delay = self.get_hedge_delay(route)
+        hedge_time = loop.time() + hedge_delay if hedge_delay is not None else None
+        requests: Set[asyncio.Future] = {asyncio.ensure_future(ainvoke_llm(llm, messages))}
+        error: Optional[BaseException] = None
+        is_retried = False
+        try:
+            while True:
+                wait_time = min(deadline, hedge_time) if hedge_time is not None else deadline
+                done, requests = await asyncio.wait(requests, timeout=max(0.0, wait_time - loop.time()),
+                                                    return_when=asyncio.FIRST_COMPLETED)
+                for request in done:
+                    if request.exception() is None:
+                        return request.result()
+                    error = request.exception()
+                is_failed = len(requests) == 0
+                if hedge_time is not None and (is_failed or loop.time() >= hedge_time):
+                    reason = "failed" if is_failed else f"slower than {hedge_delay:.1f}s"
+                    print(f"...{route.model_name} {reason}, sending hedged request...")
+                    requests.add(asyncio.ensure_future(ainvoke_llm(llm, messages)))
+                    call_metrics.n_hedged += 1
+                    hedge_time = None
+                    is_retried = is_failed
+                elif is_failed and not is_retried:
+                    print(f"...{route.model_name} failed, retrying...")
+                    requests.add(asyncio.ensure_future(ainvoke_llm(llm, messages)))
+                    call_metrics.n_hedged += 1
+                    is_retried = True
+                elif is_failed:
+                    raise cast(BaseException, error)
+                elif loop.time() >= deadline:
+                    raise Exception(f"{route.model_name} did not respond within {self.timeout:.0f}s.")
+        finally:
+            for request in requests:
+                request.cancel()
+            call_metrics.cancelled_prompt_tokens += len(requests) * estimate_tokens(messages)
+
+    def get_hedge_delay(self, route: LLMRoute) -> Optional[float]:
+        """
+        :param route: The route of the request.
+        :return: Seconds after which a hedged request is sent, None if hedging is disabled.
+        """
+        if self.hedge_percentile <= 0:
+            return None
+        latencies = sorted(self.latencies[route.model_name])
+        if len(latencies) < LLM_HEDGE_MIN_SAMPLES:
+            return self.hedge_delay
+        return latencies[round(self.hedge_percentile / 100 * (len(latencies) - 1))]
+
+    def get_llm(self, route: LLMRoute, tool: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Returns the LLM of route, creating it the first time route is used.
+        :param route: The route selected.
+        :param tool: Tool definition the LLM is forced to call, if the LLM supports tools.
+        :return: The LLM.
+        """
+        if route.model_name not in self.llms:
+            self.llms[route.model_name] = self.create_llm(route)
+        llm = self.llms[route.model_name]
+        if tool is None or not hasattr(llm, "bind_tools"):
+            return llm
+        tool_key = (route.model_name, tool["name"])
+        if tool_key not in self.tool_llms:
+            self.tool_llms[tool_key] = llm.bind_tools([tool], tool_choice=tool["name"])
+        return self.tool_llms[tool_key]
+
+    def print_metrics(self) -> None:
+        """
+        Prints the calls, latency, and tokens of each route used.
+        :return: None
+        """
+        print_title("LLM Routes")
+        for model_name, metrics in self.metrics.items():
+            if metrics.n_calls == 0:
+                continue
+            mean_latency = metrics.latency / metrics.n_calls
+            print(f"{model_name}: {metrics.n_calls} calls, {mean_latency:.2f}s mean latency, "
+                  f"{metrics.prompt_tokens} prompt tokens ({metrics.cache_read_tokens} read from cache, "
+                  f"{metrics.cache_creation_tokens} written to cache), {metrics.output_tokens} output tokens, "
+                  f"{metrics.n_hedged} hedged ({metrics.cancelled_prompt_tokens} prompt tokens cancelled)")
+
+    def get_route(self, prompt_tokens: int) -> LLMRoute:
+        """
+        :param prompt_tokens: The size of the prompt.
+        :return: The first route able to fit prompt, otherwise the last route.
+        """
+        for route in self.routes:
+            if route.max_prompt_tokens is None or prompt_tokens <= route.max_prompt_tokens:
+                return route
+        return self.routes[-1]
+
+
+async def ainvoke_llm(llm: Any, messages: List[Tuple[str, MessageContent]]) -> Any:
+    """
+    Sends messages to LLM without blocking the event loop, so the request can be cancelled.
+    :param llm: The LLM, using its async API if it has one.
+    :param messages: The role and content of each message.
+    :return: The model's response.
+    """
+    if hasattr(llm, "ainvoke"):
+        return await llm.ainvoke(messages)
+    return await asyncio.to_thread(llm.invoke, messages)
+
+
+def parse_llm_routes(routes_definition: str) -> List[LLMRoute]:
+    """
+    Parses routing table in the form `model:max_prompt_tokens,...,model`.
+    :param routes_definition: Comma delimited routes, each model is optionally followed by its prompt token limit.
+    :return: The routes ordered by their limit, routes without limit are last.
+    """
+    routes = []
+    for route_definition in routes_definition.split(ROUTE_DELIMITER):
+        route_definition = route_definition.strip()
+        if len(route_definition) == 0:
+            continue
+        model_name, _, max_prompt_tokens = route_definition.partition(THRESHOLD_DELIMITER)
+        if max_prompt_tokens and not max_prompt_tokens.strip().isdigit():
+            raise Exception(f"Expected token limit of route ({route_definition}) to be an integer.")
+        routes.append(LLMRoute(model_name.strip(), int(max_prompt_tokens) if max_prompt_tokens else None))
+    return sorted(routes, key=lambda r: (r.max_prompt_tokens is None, r.max_prompt_tokens or 0))
+
+
+def estimate_tokens(messages: List[Tuple[str, MessageContent]]) -> int:
+    """
+    Estimates the number of tokens in messages without loading a tokenizer.
+    :param messages: The role and content of each message.
+    :return: Approximate number of tokens.
+    """
+    return sum(len(get_content_text(content)) for _, content in messages) // CHARS_PER_TOKEN
@@ -0,0 +1,177 @@
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, TypeVar, cast
+
+from safa.utils.fs import write_json
+from safa.utils.menus.printers import print_title
+
+FuncType = TypeVar("FuncType", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """
+    :param name: The name of the stage timed (e.g. http.GET).
+    :param start: Seconds since profiler started when span started.
+    :param duration: Seconds span lasted.
+    :param thread_id: ID of thread that span ran in.
+    :param details: Additional information displayed in trace.
+    """
+    name: str
+    start: float
+    duration: float
+    thread_id: int
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class StageSummary:
+    count: int = 0
+    total: float = 0
+    max: float = 0
+
+    @property
+    def mean(self) -> float:
+        """
+        :return: Average seconds per span.
+        """
+        return self.total / self.count if self.count else 0
+
+
+class Profiler:
+    def __init__(self) -> None:
+        """
+        Creates profiler recording how long stages take. Recording is disabled until enabled.
+        """
+        self.enabled = False
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """
+        Starts recording spans.
+        :return: None
+        """
+        self.enabled = True
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, **details: Any) -> Iterator[None]:
+        """
+        Times the code run within context.
+        :param name: The name of the stage being timed.
+        :param details: Additional information displayed in trace.
+        :return: Context being timed.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            span = Span(name=name, start=start - self._origin, duration=end - start, thread_id=threading.get_ident(),
+                        details=details)
+            with self._lock:
+                self.spans.append(span)
+
+    def timed(self, name: str) -> Callable[[FuncType], FuncType]:
+        """
+        Creates decorator timing each call to function.
+        :param name: The name of the stage being timed.
+        :return: The decorator.
+        """
+
+        def decorator(func: FuncType) -> FuncType:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+
+            return cast(FuncType, wrapper)
+
+        return decorator
+
+    def get_summary(self) -> Dict[str, StageSummary]:
+        """
+        Aggregates spans by stage.
+        :return: Map of stage name to its summary, ordered by total time descending.
+        """
+        stage2summary: Dict[str, StageSummary] = {}
+        for span in self.spans:
+            summary = stage2summary.setdefault(span.name, StageSummary())
+            summary.count += 1
+            summary.total += span.duration
+            summary.max = max(summary.max, span.duration)
+        return dict(sorted(stage2summary.items(), key=lambda item: item[1].total, reverse=True))
+
+    def print_summary(self) -> None:
+        """
+        Prints per-stage count and timings to console.
+        :return: None
+        """
+        print_title("Profile")
+        stage2summary = self.get_summary()
+        if len(stage2summary) == 0:
+            print("No stages were recorded.")
+            return
+        name_width = max(len(name) for name in stage2summary.keys())
+        print(f"{'stage'.ljust(name_width)}  {'count':>6}  {'total(s)':>9}  {'mean(s)':>8}  {'max(s)':>8}")
+        for name, summary in stage2summary.items():
+            print(f"{name.ljust(name_width)}  {summary.count:>6}  {summary.total:>9.3f}  "
+                  f"{summary.mean:>8.3f}  {summary.max:>8.3f}")
+
+    def write_chrome_trace(self, file_path: str) -> None:
+        """
+        Writes spans in Chrome trace event format (viewable in chrome://tracing or Perfetto).
+        :param file_path: Path to write trace to.
+        :return: None
+        """
+        pid = os.getpid()
+        trace_events = [{
+            "name": span.name,
+            "cat": span.name.split(".")[0],
+            "ph": "X",
+            "ts": span.start * 1e6,
+            "dur": span.duration * 1e6,
+            "pid": pid,
+            "tid": span.thread_id,
+            "args": span.details
+        } for span in self.spans]
+        write_json(file_path, {"traceEvents": trace_events, "displayTimeUnit": "ms"})
+        print(f"Trace written to: {file_path}")
+
+
+PROFILER = Profiler()
+
+
+def span(name: str, **details: Any):
+    """
+    Times the code run within context using the global profiler.
+    :param name: The name of the stage being timed.
+    :param details: Additional information displayed in trace.
+    :return: Context being timed.
+    """
+    return PROFILER.span(name, **details)
+
+
+def timed(name: str) -> Callable[[FuncType], FuncType]:
+    """
+    Creates decorator timing each call to function using the global profiler.
+    :param name: The name of the stage being timed.
+    :return: The decorator.
+    """
+    return PROFILER.timed(name)
+
+
+def get_profiler() -> Profiler:
+    """
+    :return: The global profiler.
+    """
+    return PROFILER
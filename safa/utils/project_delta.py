@@ -0,0 +1,76 @@
+from typing import Callable, Dict, List
+
+from safa.data.commits import DeltaType, DiffDataType
+
+
+def apply_project_delta(project_data: Dict, delta: DiffDataType) -> Dict:
+    """
+    Patches project data in place so that it reflects the state after the delta.
+    :param project_data: The project data (e.g. version data) containing artifacts and traces.
+    :param delta: Contains the artifacts and traces added, modified, and removed.
+    :return: The patched project data.
+    """
+    if "artifacts" in project_data:
+        project_data["artifacts"] = _apply_entity_delta(project_data["artifacts"], delta["artifacts"], get_artifact_key)
+    if "traces" in project_data:
+        project_data["traces"] = _apply_entity_delta(project_data["traces"], delta["traces"], get_trace_key)
+    return project_data
+
+
+def normalize_delta(delta_response: Dict) -> DiffDataType:
+    """
+    Converts delta response into commit format where each modification type contains a list of entities.
+    Entities keyed by ID are flattened and modified entities containing before and after states are replaced by their after state.
+    :param delta_response: Delta between two versions of a project.
+    :return: The delta in commit format.
+    """
+    normalized: Dict = {}
+    for entity_type in ["artifacts", "traces"]:
+        entity_delta = delta_response.get(entity_type, {})
+        normalized[entity_type] = {mod_type: _to_entity_list(entity_delta.get(mod_type, []))
+                                   for mod_type in ["added", "removed", "modified"]}
+    return normalized  # type: ignore
+
+
+def get_artifact_key(artifact: Dict) -> str:
+    """
+    :param artifact: The artifact to key.
+    :return: The key used to identify artifact across versions.
+    """
+    return str(artifact["name"])
+
+
+def get_trace_key(trace: Dict) -> str:
+    """
+    :param trace: The trace to key.
+    :return: The key used to identify trace across versions.
+    """
+    return f"{trace['sourceName']}*{trace['targetName']}"
+
+
+def _apply_entity_delta(entities: List[Dict], entity_delta: DeltaType, get_key: Callable[[Dict], str]) -> List[Dict]:
+    """
+    Applies delta to list of entities.
+    :param entities: The current entities.
+    :param entity_delta: The entities added, modified, and removed.
+    :param get_key: Returns the key identifying an entity.
+    :return: List of entities after delta.
+    """
+    key2entity = {get_key(e): e for e in entities}
+    for entity in entity_delta["removed"]:
+        key2entity.pop(get_key(entity), None)
+    for entity in entity_delta["added"] + entity_delta["modified"]:
+        entity_key = get_key(entity)
+        previous_entity = key2entity.get(entity_key, {})
+        key2entity[entity_key] = {**previous_entity, **entity}
+    return list(key2entity.values())
+
+
+def _to_entity_list(entities: List | Dict) -> List[Dict]:
+    """
+    Converts entities to list, extracting the after state from modified entities.
+    :param entities: List of entities or map of entity ID to entity.
+    :return: List of entities.
+    """
+    entity_list = list(entities.values()) if isinstance(entities, dict) else entities
+    return [e["after"] if "after" in e else e for e in entity_list]
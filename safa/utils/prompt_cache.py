@@ -0,0 +1,65 @@
+import os
+from typing import Any, Dict, List, Tuple, Union
+
+MessageContent = Union[str, List[Dict[str, Any]]]
+
+CACHE_CONTROL = {"type": "ephemeral"}
+PROMPT_CACHING_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+PROMPT_CACHING = os.environ.get("SAFA_PROMPT_CACHING", "true").lower() == "true"
+
+
+def create_cached_content(text: str, prompt_caching: bool = PROMPT_CACHING) -> List[Dict[str, Any]]:
+    """
+    Marks the end of the stable prompt prefix so that the provider caches everything up to and including text.
+    Later prompts starting with the same prefix read it from the cache instead of processing it again.
+    :param text: The last content of the stable prefix.
+    :param prompt_caching: Whether to cache the prefix, otherwise text is returned without breakpoint.
+    :return: Message content with cache breakpoint.
+    """
+    if not prompt_caching:
+        return [{"type": "text", "text": text}]
+    return [{"type": "text", "text": text, "cache_control": CACHE_CONTROL}]
+
+
+def get_content_text(content: MessageContent) -> str:
+    """
+    :param content: Message content as text or content blocks.
+    :return: The text of the content.
+    """
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content)
+
+
+def get_cache_usage(response: Any) -> Tuple[int, int]:
+    """
+    Reads the prompt tokens read from and written to the provider's cache from the response's usage metadata.
+    :param response: The chat model's response.
+    :return: Number of tokens read from cache and number of tokens written to cache.
+    """
+    usage_metadata = getattr(response, "usage_metadata", None) or {}
+    token_details = usage_metadata.get("input_token_details") or {}
+    if "cache_read" in token_details or "cache_creation" in token_details:
+        return token_details.get("cache_read") or 0, token_details.get("cache_creation") or 0
+    response_metadata = getattr(response, "response_metadata", None) or {}
+    usage = response_metadata.get("usage") or {}
+    return usage.get("cache_read_input_tokens") or 0, usage.get("cache_creation_input_tokens") or 0
+
+
+def get_prompt_tokens(response: Any, estimated_tokens: int) -> int:
+    """
+    Reads the number of prompt tokens from the response's usage metadata, including those read from and written to the
+    cache. Anthropic reports cached tokens separately from its input tokens.
+    :param response: The chat model's response.
+    :param estimated_tokens: The estimated size of the prompt, returned if response has no usage metadata.
+    :return: Number of prompt tokens.
+    """
+    usage_metadata = getattr(response, "usage_metadata", None) or {}
+    if "input_tokens" not in usage_metadata:
+        return estimated_tokens
+    input_tokens = int(usage_metadata["input_tokens"])
+    token_details = usage_metadata.get("input_token_details") or {}
+    if "cache_read" in token_details or "cache_creation" in token_details:
+        return input_tokens
+    cache_read_tokens, cache_creation_tokens = get_cache_usage(response)
+    return input_tokens + cache_read_tokens + cache_creation_tokens
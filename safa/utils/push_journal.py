@@ -0,0 +1,140 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from safa.data.commits import DiffDataType
+from safa.utils.fs import read_file
+
+PUSH_STARTED = "push_started"
+VERSION_CREATED = "version_created"
+COMMIT_SENT = "commit_sent"
+IDS_SAVED = "ids_saved"
+SUMMARIES_SENT = "summaries_sent"
+
+
+@dataclass
+class PushJournalState:
+    """
+    :param commit_ids: Hexsha of each commit being pushed, in push order.
+    :param start_commit_id: Hexsha of the commit that the push started from.
+    :param start_version_id: ID of the project version that the push started from.
+    :param versions: Map of commit index to the project version created for it.
+    :param commit_responses: Map of commit index to the response of its commit.
+    :param ids_saved: Indices of commits whose ids have been saved.
+    :param summaries_sent: Indices of commits after which pending summaries were sent.
+    """
+    commit_ids: List[str]
+    start_commit_id: Optional[str]
+    start_version_id: str
+    versions: Dict[int, Dict] = field(default_factory=dict)
+    commit_responses: Dict[int, DiffDataType] = field(default_factory=dict)
+    ids_saved: Set[int] = field(default_factory=set)
+    summaries_sent: Set[int] = field(default_factory=set)
+
+    def get_resume_index(self) -> int:
+        """
+        :return: Index of the first commit whose step have not all been completed.
+        """
+        resume_idx = 0
+        while resume_idx in self.ids_saved:
+            resume_idx += 1
+        return resume_idx
+
+    def get_resume_version_id(self) -> str:
+        """
+        :return: ID of the version containing the latest commit sent to SAFA.
+        """
+        return self.get_pushed_progress()[1]
+
+    def get_pushed_progress(self) -> Tuple[Optional[str], str]:
+        """
+        :return: Hexsha of the latest commit sent to SAFA and the ID of the version containing it, the start of the push
+        if no commit was sent.
+        """
+        sent_indices = [i for i in self.commit_responses.keys() if i <= self.get_resume_index()]
+        if len(sent_indices) == 0:
+            return self.start_commit_id, self.start_version_id
+        last_sent_idx = max(sent_indices)
+        return self.commit_ids[last_sent_idx], str(self.versions[last_sent_idx]["versionId"])
+
+    def get_unsummarized_responses(self) -> List[DiffDataType]:
+        """
+        :return: Responses of saved commits whose artifacts have not been summarized yet.
+        """
+        last_summary_idx = max(self.summaries_sent) if self.summaries_sent else -1
+        return [self.commit_responses[i] for i in sorted(self.ids_saved) if i > last_summary_idx]
+
+
+class PushJournal:
+    def __init__(self, journal_file_path: str):
+        """
+        Creates write-ahead journal recording each step of a push so an interrupted push can be resumed.
+        :param journal_file_path: Path to the file containing journal entries.
+        """
+        self.journal_file_path = journal_file_path
+
+    def record(self, step: str, **step_data: Any) -> None:
+        """
+        Appends step to journal and flushes it to disk.
+        :param step: The name of the step completed.
+        :param step_data: Data needed to resume push after step.
+        :return: None
+        """
+        entry = json.dumps({"step": step, **step_data})
+        with open(self.journal_file_path, "a") as f:
+            f.write(entry + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def start(self, commit_ids: List[str], start_commit_id: Optional[str], start_version_id: str) -> None:
+        """
+        Clears previous journal and records the start of a new push.
+        :param commit_ids: Hexsha of each commit being pushed, in push order.
+        :param start_commit_id: Hexsha of the commit that the push starts from.
+        :param start_version_id: ID of the project version that the push starts from.
+        :return: None
+        """
+        self.clear()
+        self.record(PUSH_STARTED, commit_ids=commit_ids, start_commit_id=start_commit_id, start_version_id=start_version_id)
+
+    def load(self) -> Optional[PushJournalState]:
+        """
+        Reads journal of unfinished push.
+        :return: The state of the push or None if there is no unfinished push.
+        """
+        if not os.path.isfile(self.journal_file_path):
+            return None
+
+        state: Optional[PushJournalState] = None
+        for line in read_file(self.journal_file_path).splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break  # entry was interrupted while being written
+            step = entry["step"]
+            if step == PUSH_STARTED:
+                state = PushJournalState(commit_ids=entry["commit_ids"],
+                                         start_commit_id=entry["start_commit_id"],
+                                         start_version_id=entry["start_version_id"])
+            elif state is None:
+                continue
+            elif step == VERSION_CREATED:
+                state.versions[entry["index"]] = entry["version"]
+            elif step == COMMIT_SENT:
+                state.commit_responses[entry["index"]] = entry["response"]
+            elif step == IDS_SAVED:
+                state.ids_saved.add(entry["index"])
+            elif step == SUMMARIES_SENT:
+                state.summaries_sent.add(entry["index"])
+            else:
+                raise Exception(f"Unknown journal step: {step}")
+        return state
+
+    def clear(self) -> None:
+        """
+        Deletes journal once push has finished.
+        :return: None
+        """
+        if os.path.isfile(self.journal_file_path):
+            os.remove(self.journal_file_path)
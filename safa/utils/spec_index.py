@@ -0,0 +1,82 @@
+import hashlib
+import os
+import shutil
+from typing import Dict, List, Optional
+
+from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
+from langchain_huggingface.embeddings import HuggingFaceEmbeddings
+
+from safa.constants import EMBEDDING_MODEL
+from safa.data.file_change import FileChange
+from safa.utils.fs import read_file, write_file_atomic
+from safa.utils.profiler import span
+from safa.utils.spec_sections import SPEC_QUERY_CHARS, SPEC_TOKEN_BUDGET, SPEC_TOP_K, SpecSection, \
+    needs_retrieval, select_sections, split_specification
+
+SPEC_HASH_FILE = "spec_hash"
+
+
+class SpecIndex:
+    def __init__(self, store_path: str, top_k: int = SPEC_TOP_K, token_budget: int = SPEC_TOKEN_BUDGET):
+        """
+        Embeds the sections of the project specification to retrieve those relevant to staged changes.
+        :param store_path: Path to directory persisting the section embeddings.
+        :param top_k: Number of sections retrieved per changed file.
+        :param token_budget: Maximum number of tokens of the specification sent to the LLM.
+        """
+        self.store_path = store_path
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.embeddings: Optional[HuggingFaceEmbeddings] = None
+        self.db: Optional[Chroma] = None
+        self.spec_hash: Optional[str] = None
+        self.sections: List[SpecSection] = []
+
+    def retrieve(self, specification: str, file_changes: List[FileChange]) -> str:
+        """
+        Returns the sections of specification most relevant to the paths and diffs of the changed files.
+        :param specification: The project specification.
+        :param file_changes: The staged file changes.
+        :return: The relevant sections, the whole specification if it fits the token budget or prompt caching is on.
+        """
+        if not needs_retrieval(specification, self.token_budget):
+            return specification
+        db = self.load(specification)
+        section2distance: Dict[int, float] = {}
+        with span("spec.retrieve_sections", n_files=len(file_changes)):
+            for change in file_changes:
+                query = f"{change.file}\n{change.diff[:SPEC_QUERY_CHARS]}"
+                for doc, distance in db.similarity_search_with_score(query, k=self.top_k):
+                    index = doc.metadata["index"]
+                    section2distance[index] = min(distance, section2distance.get(index, distance))
+        ranked_indices = sorted(section2distance, key=lambda i: section2distance[i])
+        return select_sections(self.sections, ranked_indices, self.token_budget)
+
+    def load(self, specification: str) -> Chroma:
+        """
+        Loads the section embeddings of specification, embedding its sections again only when it changed.
+        :param specification: The project specification.
+        :return: The vector store containing the sections.
+        """
+        spec_hash = hashlib.sha256(specification.encode("utf-8")).hexdigest()
+        if self.db is not None and spec_hash == self.spec_hash:
+            return self.db
+        self.sections = split_specification(specification)
+        if self.embeddings is None:
+            with span("embedding.load_model"):
+                self.embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+
+        hash_path = os.path.join(self.store_path, SPEC_HASH_FILE)
+        if os.path.isfile(hash_path) and read_file(hash_path) == spec_hash:
+            with span("embedding.load_vector_store"):
+                self.db = Chroma(embedding_function=self.embeddings, persist_directory=self.store_path)
+        else:
+            if os.path.exists(self.store_path):
+                shutil.rmtree(self.store_path)
+            with span("chroma.add_documents", n_documents=len(self.sections)):
+                self.db = Chroma(embedding_function=self.embeddings, persist_directory=self.store_path)
+                self.db.add_documents([Document(s.content, metadata={"index": s.index}) for s in self.sections])
+            write_file_atomic(hash_path, spec_hash)
+        self.spec_hash = spec_hash
+        return self.db
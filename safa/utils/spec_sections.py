@@ -0,0 +1,86 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Set
+
+from safa.utils.llm_router import CHARS_PER_TOKEN
+from safa.utils.prompt_cache import PROMPT_CACHING
+
+SPEC_TOKEN_BUDGET = int(os.environ.get("SAFA_SPEC_TOKEN_BUDGET", 2000))
+SPEC_TOP_K = int(os.environ.get("SAFA_SPEC_TOP_K", 5))
+SPEC_QUERY_CHARS = 2000
+SECTION_HEADING_PATTERN = re.compile(r"^#{1,6}\s", re.MULTILINE)
+PARAGRAPH_PATTERN = re.compile(r"\n\s*\n")
+
+
+@dataclass
+class SpecSection:
+    """
+    :param index: Position of section in the specification.
+    :param content: The section, including its heading.
+    """
+    index: int
+    content: str
+
+    def get_n_tokens(self) -> int:
+        """
+        :return: Approximate number of tokens in section.
+        """
+        return len(self.content) // CHARS_PER_TOKEN
+
+
+def split_specification(specification: str) -> List[SpecSection]:
+    """
+    Splits specification into its markdown sections, or its paragraphs if it has no headings.
+    :param specification: The project specification.
+    :return: The non-empty sections in order.
+    """
+    heading_starts = [m.start() for m in SECTION_HEADING_PATTERN.finditer(specification)]
+    if heading_starts:
+        bounds = zip([0] + heading_starts, heading_starts + [len(specification)])
+        contents = [specification[start:end] for start, end in bounds]
+    else:
+        contents = PARAGRAPH_PATTERN.split(specification)
+    contents = [c.strip() for c in contents if c.strip()]
+    return [SpecSection(i, c) for i, c in enumerate(contents)]
+
+
+def select_sections(sections: List[SpecSection], ranked_indices: List[int], token_budget: int) -> str:
+    """
+    Selects the highest ranked sections fitting the token budget, skipping sections too large for the space left.
+    The most relevant section is always included so that the prompt is never left without context.
+    :param sections: The sections of the specification.
+    :param ranked_indices: Indices of the sections from most to least relevant.
+    :param token_budget: Maximum number of tokens in selected sections.
+    :return: The selected sections in the order they appear in the specification.
+    """
+    selected_indices: Set[int] = set()
+    n_tokens = 0
+    for index in ranked_indices:
+        section_tokens = sections[index].get_n_tokens()
+        if selected_indices and n_tokens + section_tokens > token_budget:
+            continue
+        selected_indices.add(index)
+        n_tokens += section_tokens
+    return "\n\n".join(s.content for s in sections if s.index in selected_indices)
+
+
+def fits_budget(specification: str, token_budget: int) -> bool:
+    """
+    :param specification: The project specification.
+    :param token_budget: Maximum number of tokens of the specification sent.
+    :return: Whether the whole specification fits the budget.
+    """
+    return len(specification) // CHARS_PER_TOKEN <= token_budget
+
+
+def needs_retrieval(specification: str, token_budget: int, prompt_caching: bool = PROMPT_CACHING) -> bool:
+    """
+    Retrieved sections change with the staged files, so the specification is only retrieved from when prompt caching is
+    disabled. Otherwise, the whole specification is sent as the stable prefix cached across commits.
+    :param specification: The project specification.
+    :param token_budget: Maximum number of tokens of the specification sent.
+    :param prompt_caching: Whether the specification is cached as the prompt prefix.
+    :return: Whether to send only the sections relevant to the staged files.
+    """
+    return bool(specification) and not prompt_caching and not fits_budget(specification, token_budget)
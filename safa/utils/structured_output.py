@@ -0,0 +1,83 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+from safa.utils.json_repair import repair_json
+from safa.utils.llm_router import LLMRouter
+from safa.utils.profiler import span
+from safa.utils.prompt_cache import MessageContent, get_content_text
+
+REPAIR_PROMPT = "Your response could not be used ({reason}). " \
+                "Respond with only the corrected JSON object containing the keys: {keys}."
+
+
+def invoke_json(llm_manager, messages: List[Tuple[str, MessageContent]], tool: Dict[str, Any]) -> Dict:
+    """
+    Requests JSON object matching the input schema of tool.
+    Models supporting tools are forced to call tool, others respond with text whose JSON is repaired locally.
+    A single repair request is sent only if the response cannot be recovered locally.
+    :param llm_manager: LLM manager used to send messages.
+    :param messages: The role and content of each message.
+    :param tool: Anthropic tool definition (name, description, input_schema) describing the object.
+    :return: The JSON object.
+    """
+    required_keys: List[str] = tool["input_schema"].get("required", [])
+    response_json, response_text = invoke_tool(llm_manager, messages, tool)
+    missing_keys = get_missing_keys(response_json, required_keys)
+    if not missing_keys:
+        return cast(Dict, response_json)
+
+    reason = "invalid JSON" if response_json is None else f"missing keys: {', '.join(missing_keys)}"
+    print(f"...repairing response ({reason})...")
+    repair_messages = messages + [
+        ("ai", response_text if response_text.strip() else "{}"),
+        ("human", REPAIR_PROMPT.format(reason=reason, keys=", ".join(required_keys)))
+    ]
+    with span("llm.repair_json"):
+        response_json, response_text = invoke_tool(llm_manager, repair_messages, tool)
+    if get_missing_keys(response_json, required_keys):
+        print(response_text)
+        raise Exception(f"Could not parse JSON response of LLM ({reason}).")
+    return cast(Dict, response_json)
+
+
+def invoke_tool(llm_manager, messages: List[Tuple[str, MessageContent]],
+                tool: Dict[str, Any]) -> Tuple[Optional[Dict], str]:
+    """
+    Sends messages, forcing the tool call if the LLM manager supports tools, and reads the JSON object in response.
+    :param llm_manager: LLM manager used to send messages.
+    :param messages: The role and content of each message.
+    :param tool: Tool definition describing the object.
+    :return: The JSON object (None if it could not be recovered) and the response as text.
+    """
+    if isinstance(llm_manager, LLMRouter):
+        response = llm_manager.invoke(messages, tool=tool)
+    else:
+        response = llm_manager.invoke(messages)
+    tool_input = get_tool_input(response, tool["name"])
+    if tool_input is not None:
+        return tool_input, json.dumps(tool_input)
+    response_text = get_content_text(response.content)
+    return repair_json(response_text), response_text
+
+
+def get_tool_input(response: Any, tool_name: str) -> Optional[Dict]:
+    """
+    :param response: The chat model's response.
+    :param tool_name: Name of the tool called.
+    :return: Arguments of the first call to tool, None if tool was not called.
+    """
+    for tool_call in getattr(response, "tool_calls", None) or []:
+        if tool_call.get("name") == tool_name and isinstance(tool_call.get("args"), dict):
+            return cast(Dict, tool_call["args"])
+    return None
+
+
+def get_missing_keys(response_json: Optional[Dict], required_keys: List[str]) -> List[str]:
+    """
+    :param response_json: The JSON object, None if it could not be parsed.
+    :param required_keys: Keys the object must contain.
+    :return: The required keys missing from object, all keys if there is no object.
+    """
+    if response_json is None:
+        return required_keys or ["object"]
+    return [k for k in required_keys if k not in response_json]
@@ -0,0 +1,93 @@
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from safa.data.file_change import FileChange
+from safa.utils.fs import read_json_file, write_file_atomic
+
+SUMMARY_CACHE_SIZE = int(os.environ.get("SAFA_SUMMARY_CACHE_SIZE", 1000))
+
+FILES_KEY = "files"
+MESSAGES_KEY = "messages"
+
+
+class SummaryCache:
+    def __init__(self, cache_file_path: Optional[str] = None, max_entries: int = SUMMARY_CACHE_SIZE):
+        """
+        Creates cache of the summaries generated for file changes, keyed by the blob ids of each file before and after
+        its change so that restaged or split changes are not analyzed again.
+        :param cache_file_path: Path to file to persist summaries in across runs.
+        :param max_entries: The number of file summaries and messages kept, the oldest are evicted first.
+        """
+        self.cache_file_path = cache_file_path
+        self.max_entries = max_entries
+        cache_data = read_json_file(cache_file_path) if cache_file_path else {}
+        self.file_summaries: Dict[str, str] = cache_data.get(FILES_KEY, {})
+        self.messages: Dict[str, Dict] = cache_data.get(MESSAGES_KEY, {})
+
+    def get_file_summaries(self, file_changes: List[FileChange]) -> Dict[str, str]:
+        """
+        :param file_changes: The staged file changes.
+        :return: Map of file to the summary of its change for those previously summarized.
+        """
+        file2summary = {}
+        for file_change in file_changes:
+            cache_key = file_change.get_cache_key()
+            if cache_key in self.file_summaries:
+                file2summary[file_change.file] = self.file_summaries[cache_key]
+        return file2summary
+
+    def get_message(self, file_changes: List[FileChange]) -> Optional[Tuple[str, List[str]]]:
+        """
+        :param file_changes: The staged file changes.
+        :return: Title and changes previously generated for the same file changes, None if not generated yet.
+        """
+        message_key = self.get_message_key(file_changes)
+        if message_key is None or message_key not in self.messages:
+            return None
+        message = self.messages[message_key]
+        return message["title"], list(message["changes"])
+
+    def save(self, file_changes: List[FileChange], file2summary: Dict[str, str], title: str, changes: List[str]) -> None:
+        """
+        Saves the summaries and message generated for file changes.
+        :param file_changes: The staged file changes.
+        :param file2summary: Map of file to the summary of its change.
+        :param title: The title generated for the file changes.
+        :param changes: The changes generated for the file changes.
+        :return: None
+        """
+        for file_change in file_changes:
+            cache_key = file_change.get_cache_key()
+            if cache_key and file_change.file in file2summary:
+                self._put(self.file_summaries, cache_key, file2summary[file_change.file])
+        message_key = self.get_message_key(file_changes)
+        if message_key:
+            self._put(self.messages, message_key, {"title": title, "changes": changes})
+        if self.cache_file_path:
+            write_file_atomic(self.cache_file_path, json.dumps({FILES_KEY: self.file_summaries,
+                                                                MESSAGES_KEY: self.messages}))
+
+    def _put(self, entries: Dict, key: str, value) -> None:
+        """
+        Adds entry as the newest, evicting the oldest entries beyond the cache size.
+        :param entries: The entries to add to.
+        :param key: The key of the entry.
+        :param value: The value of the entry.
+        :return: None
+        """
+        entries.pop(key, None)
+        entries[key] = value
+        while len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+
+    @staticmethod
+    def get_message_key(file_changes: List[FileChange]) -> Optional[str]:
+        """
+        :param file_changes: The staged file changes.
+        :return: Key identifying the set of file changes, None if the content of any file is unknown.
+        """
+        file_keys = [(c.file, c.get_cache_key()) for c in file_changes]
+        if len(file_keys) == 0 or any(k is None for _, k in file_keys):
+            return None
+        return "|".join(f"{file}@{key}" for file, key in sorted(file_keys))
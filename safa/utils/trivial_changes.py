@@ -0,0 +1,166 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import git
+
+from safa.utils.profiler import timed
+
+LOCKFILE_NAMES = {"package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "Pipfile.lock", "uv.lock",
+                  "Cargo.lock", "Gemfile.lock", "composer.lock", "go.sum"}
+MANIFEST_PATTERN = re.compile(r"(requirements.*\.txt|pyproject\.toml|setup\.(py|cfg)|package\.json|Cargo\.toml|go\.mod|"
+                              r"Gemfile|.*\.gemspec|pom\.xml|build\.gradle(\.kts)?|.*\.csproj|Chart\.yaml)")
+VERSION_PATTERN = re.compile(r"\d+(?:\.\d+)+[\w.+-]*")
+NAME_PATTERN = re.compile(r"[A-Za-z0-9_.@/-]+")
+INDENTATION_SENSITIVE_PATTERN = re.compile(r".*\.(py|pyi|pyx|yaml|yml|mk|sass|pug|haml|coffee|nim)|(GNU)?[Mm]akefile")
+
+RENAME_KIND = "rename"
+DELETE_KIND = "delete"
+FORMAT_KIND = "format"
+LOCKFILE_KIND = "lockfile"
+VERSION_KIND = "version"
+
+KIND_VERBS = {RENAME_KIND: "Rename", DELETE_KIND: "Remove", FORMAT_KIND: "Format", VERSION_KIND: "Bump",
+              LOCKFILE_KIND: "Update"}
+
+
+@dataclass
+class StagedChange:
+    """
+    :param status: Git status letter of the change (e.g. M, A, D, R).
+    :param path: Path of file after change.
+    :param old_path: Path of file before it was renamed.
+    :param similarity: Percent of content kept by a rename.
+    """
+    status: str
+    path: str
+    old_path: Optional[str] = None
+    similarity: int = 100
+
+
+@dataclass
+class TrivialChange:
+    """
+    :param kind: The rule matching the change (e.g. rename, delete, format, lockfile, version).
+    :param title: Title describing the change alone.
+    :param description: Bullet describing the change.
+    """
+    kind: str
+    title: str
+    description: str
+
+
+@timed("git.summarize_trivial_changes")
+def summarize_trivial_changes(repo: git.Repo) -> Optional[Tuple[str, List[str]]]:
+    """
+    Summarizes the staged changes without an LLM when every change is trivial, i.e. pure renames, deletions,
+    whitespace-only edits, lockfile updates, or single-line version edits.
+    :param repo: The repository whose staged changes are summarized.
+    :return: Title and changes, None if any change requires the LLM.
+    """
+    staged_changes = get_staged_changes(repo)
+    if len(staged_changes) == 0:
+        return None
+    trivial_changes = []
+    for staged_change in staged_changes:
+        trivial_change = match_trivial_change(repo, staged_change)
+        if trivial_change is None:
+            return None
+        trivial_changes.append(trivial_change)
+    return create_trivial_title(trivial_changes), [c.description for c in trivial_changes]
+
+
+def get_staged_changes(repo: git.Repo) -> List[StagedChange]:
+    """
+    Lists staged files with renames detected.
+    :param repo: The repository to read staged changes from.
+    :return: The staged changes.
+    """
+    staged_changes = []
+    for line in repo.git.diff("--cached", "--name-status", "-M").splitlines():
+        line_parts = line.split("\t")
+        status = line_parts[0]
+        if status.startswith("R"):
+            staged_changes.append(StagedChange("R", line_parts[2], old_path=line_parts[1], similarity=int(status[1:])))
+        else:
+            staged_changes.append(StagedChange(status[0], line_parts[-1]))
+    return staged_changes
+
+
+def match_trivial_change(repo: git.Repo, staged_change: StagedChange) -> Optional[TrivialChange]:
+    """
+    Applies the rules for trivial changes to staged change.
+    Changes to indentation are only formatting in languages where indentation has no meaning. Whitespace is never
+    removed entirely between characters, since it may be inside a string.
+    :param repo: The repository containing the change.
+    :param staged_change: The staged change.
+    :return: The trivial change, None if no rule applies.
+    """
+    path = staged_change.path
+    file_name = os.path.basename(path)
+    if staged_change.status == "R" and staged_change.similarity == 100:
+        return TrivialChange(RENAME_KIND, f"Rename {staged_change.old_path} to {path}",
+                             f"Renames {staged_change.old_path} to {path}.")
+    if staged_change.status == "D":
+        return TrivialChange(DELETE_KIND, f"Remove {path}", f"Removes {path}.")
+    if staged_change.status in ["A", "M"] and file_name in LOCKFILE_NAMES:
+        return TrivialChange(LOCKFILE_KIND, f"Update {file_name}", f"Updates locked dependency versions in {path}.")
+    if staged_change.status != "M":
+        return None
+    is_indentation_sensitive = INDENTATION_SENSITIVE_PATTERN.fullmatch(file_name)
+    whitespace_option = "--ignore-space-at-eol" if is_indentation_sensitive else "--ignore-space-change"
+    if repo.git.diff("--cached", whitespace_option, "--ignore-blank-lines", "--", path).strip() == "":
+        return TrivialChange(FORMAT_KIND, f"Format {path}", f"Reformats {path} without changing its content.")
+    return match_version_change(repo, path)
+
+
+def match_version_change(repo: git.Repo, path: str) -> Optional[TrivialChange]:
+    """
+    Matches changes replacing a single line with one differing only by a version number, either in a dependency
+    manifest or on a line mentioning a version (so that e.g. changing a float constant is not mistaken for one).
+    :param repo: The repository containing the change.
+    :param path: Path to the changed file.
+    :return: The version change, None if change is not a version edit.
+    """
+    diff_lines = repo.git.diff("--cached", "--unified=0", "--", path).splitlines()
+    removed_lines = [line[1:] for line in diff_lines if line.startswith("-") and not line.startswith("---")]
+    added_lines = [line[1:] for line in diff_lines if line.startswith("+") and not line.startswith("+++")]
+    if len(removed_lines) != 1 or len(added_lines) != 1:
+        return None
+    line_before, line_after = removed_lines[0], added_lines[0]
+    if not MANIFEST_PATTERN.fullmatch(os.path.basename(path)) and "version" not in line_after.lower():
+        return None
+    versions_before, versions_after = VERSION_PATTERN.findall(line_before), VERSION_PATTERN.findall(line_after)
+    if len(versions_before) == 0 or len(versions_before) != len(versions_after):
+        return None  # versions added or removed rather than changed
+    if VERSION_PATTERN.sub("", line_before) != VERSION_PATTERN.sub("", line_after):
+        return None
+
+    version_index = next((i for i, (v1, v2) in enumerate(zip(versions_before, versions_after)) if v1 != v2), None)
+    if version_index is None:
+        return None
+    version_before, version_after = versions_before[version_index], versions_after[version_index]
+    prefix_names = NAME_PATTERN.findall(line_after[:line_after.index(version_after)])
+    name = prefix_names[-1] if prefix_names else "version"
+    return TrivialChange(VERSION_KIND, f"Bump {name} to {version_after}",
+                         f"Bumps {name} from {version_before} to {version_after} in {path}.")
+
+
+def create_trivial_title(trivial_changes: List[TrivialChange]) -> str:
+    """
+    Creates commit title from the kinds of trivial changes made.
+    :param trivial_changes: The trivial changes in commit.
+    :return: The commit title.
+    """
+    titled_changes = [c for c in trivial_changes if c.kind != LOCKFILE_KIND] or trivial_changes
+    if len(titled_changes) == 1:
+        return titled_changes[0].title
+    kinds = [k for k in KIND_VERBS.keys() if any(c.kind == k for c in titled_changes)]
+    if kinds == [VERSION_KIND]:
+        return "Bump dependency versions"
+    if kinds == [LOCKFILE_KIND]:
+        return "Update lockfiles"
+    verbs = [KIND_VERBS[k] if i == 0 else KIND_VERBS[k].lower() for i, k in enumerate(kinds)]
+    verb_phrase = verbs[0] if len(verbs) == 1 else ", ".join(verbs[:-1]) + " and " + verbs[-1]
+    return f"{verb_phrase} files"
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+from dataclasses import asdict, fields
+from datetime import date
+from typing import Dict, List, Optional, Tuple, cast
+
+from safa.utils.fs import read_file, write_file_atomic
+from safa.utils.llm_router import RouteMetrics
+
+PROMPT_SIZE_LIMITS = [1000, 4000, 16000]
+CACHE_READ_PRICE_FACTOR = 0.1
+CACHE_CREATION_PRICE_FACTOR = 1.25
+
+# USD per million input and output tokens, matched by model name prefix
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "claude-3-haiku": (0.25, 1.25),
+    "claude-3-5-haiku": (0.80, 4.0),
+    "claude-3-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-opus": (15.0, 75.0)
+}
+
+# day -> model -> prompt size -> usage
+UsageTable = Dict[str, Dict[str, Dict[str, RouteMetrics]]]
+
+
+class UsageLedger:
+    def __init__(self, usage_file_path: str):
+        """
+        Persists the tokens, latency, and calls of each LLM request aggregated per day, model, and prompt size.
+        :param usage_file_path: Path to JSON file containing aggregates.
+        """
+        self.usage_file_path = usage_file_path
+        self.lock = threading.Lock()
+
+    def record(self, model_name: str, prompt_tokens: int, usage: RouteMetrics, day: Optional[str] = None) -> None:
+        """
+        Adds usage of a request to the aggregates of its day, model, and prompt size.
+        :param model_name: The model that responded.
+        :param prompt_tokens: Estimated size of the prompt, used to group requests.
+        :param usage: Usage of the request.
+        :param day: The day of the request in ISO format, defaults to today.
+        :return: None
+        """
+        day = day if day else date.today().isoformat()
+        with self.lock:
+            usage_table = self.load()
+            size2usage = usage_table.setdefault(day, {}).setdefault(model_name, {})
+            size2usage.setdefault(get_prompt_size(prompt_tokens), RouteMetrics()).add(usage)
+            usage_json = {d: {m: {s: asdict(u) for s, u in s2u.items()} for m, s2u in m2s.items()}
+                          for d, m2s in usage_table.items()}
+            os.makedirs(os.path.dirname(os.path.abspath(self.usage_file_path)), exist_ok=True)
+            write_file_atomic(self.usage_file_path, json.dumps(usage_json, indent=2))
+
+    def load(self) -> UsageTable:
+        """
+        :return: Usage aggregates per day, model, and prompt size, empty if file does not exist or is unreadable.
+        """
+        if not os.path.isfile(self.usage_file_path):
+            return {}
+        try:
+            usage_json = cast(Dict, json.loads(read_file(self.usage_file_path)))
+        except ValueError:
+            return {}
+        usage_keys = {f.name for f in fields(RouteMetrics)}
+        return {d: {m: {s: RouteMetrics(**{k: v for k, v in u.items() if k in usage_keys}) for s, u in s2u.items()}
+                    for m, s2u in m2s.items()}
+                for d, m2s in usage_json.items()}
+
+
+def get_prompt_size(prompt_tokens: int) -> str:
+    """
+    :param prompt_tokens: Estimated size of prompt.
+    :return: Label of the size range containing prompt (e.g. 1k-4k).
+    """
+    lower_limit = 0
+    for limit in PROMPT_SIZE_LIMITS:
+        if prompt_tokens < limit:
+            return f"{format_tokens(lower_limit)}-{format_tokens(limit)}"
+        lower_limit = limit
+    return f">{format_tokens(lower_limit)}"
+
+
+def format_tokens(n_tokens: int) -> str:
+    """
+    :param n_tokens: Number of tokens.
+    :return: Number of tokens in thousands (e.g. 4k).
+    """
+    return f"{n_tokens // 1000}k" if n_tokens >= 1000 else str(n_tokens)
+
+
+def get_cost(model_name: str, usage: RouteMetrics) -> Optional[float]:
+    """
+    Calculates the cost of usage, counting prompt tokens read from and written to the cache at their discounted and
+    increased price. Prompt tokens are expected to include cached tokens. Cancelled requests are billed for their
+    prompt only.
+    :param model_name: The model used.
+    :param usage: Tokens used.
+    :return: Cost in USD, None if the price of model is unknown.
+    """
+    prices: List[Tuple[float, float]] = [p for prefix, p in MODEL_PRICES.items() if model_name.startswith(prefix)]
+    if len(prices) == 0:
+        return None
+    input_price, output_price = prices[0]
+    uncached_tokens = max(usage.prompt_tokens - usage.cache_read_tokens - usage.cache_creation_tokens, 0)
+    uncached_tokens += usage.cancelled_prompt_tokens
+    input_cost = input_price * (uncached_tokens + CACHE_READ_PRICE_FACTOR * usage.cache_read_tokens
+                                + CACHE_CREATION_PRICE_FACTOR * usage.cache_creation_tokens)
+    return (input_cost + output_price * usage.output_tokens) / 1_000_000
@@ -0,0 +1,39 @@
+import json
+import time
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from safa.utils.prompt_cache import MessageContent, get_content_text
+
+
+@dataclass
+class FakeLLMResponse:
+    content: str
+
+
+class FakeLLM:
+    def __init__(self, latency: float = 0):
+        """
+        Creates stand-in for LLM manager that responds with a fixed commit summary.
+        :param latency: Seconds to wait before responding, simulating model latency.
+        """
+        self.latency = latency
+        self.n_calls = 0
+        self.prompt_chars = 0
+
+    def invoke(self, messages: List[Tuple[str, MessageContent]]) -> FakeLLMResponse:
+        """
+        Records the size of the prompt and responds in the format requested by the committer.
+        :param messages: The role and content of each message.
+        :return: Response containing JSON block with diffs, changes, and title.
+        """
+        self.n_calls += 1
+        self.prompt_chars += sum(len(get_content_text(content)) for _, content in messages)
+        if self.latency > 0:
+            time.sleep(self.latency)
+        response_json = {
+            "diffs": ["Updates generated code."],
+            "changes": ["Updates generated code."],
+            "title": "Update generated code"
+        }
+        return FakeLLMResponse(f"```json\n{json.dumps(response_json)}\n```")
@@ -0,0 +1,81 @@
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List
+
+from safa.api.stub_server import StubSafaApi
+
+BYTES_PER_MB = 1024 * 1024
+
+
+@dataclass
+class StageResult:
+    """
+    :param wall_time_s: Seconds taken by stage.
+    :param peak_memory_mb: Peak memory allocated by python objects during stage.
+    :param max_rss_mb: Peak resident memory of the process at the end of the stage, includes native allocations.
+    :param n_requests: Number of requests made to the SAFA API.
+    :param requests: Number of requests made per route.
+    :param metrics: Additional stage specific measurements.
+    """
+    wall_time_s: float = 0
+    peak_memory_mb: float = 0
+    max_rss_mb: float = 0
+    n_requests: int = 0
+    requests: Dict[str, int] = field(default_factory=dict)
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    def to_json(self) -> Dict:
+        """
+        :return: Result as JSON.
+        """
+        return asdict(self)
+
+
+@contextmanager
+def measure_stage(api: StubSafaApi) -> Iterator[StageResult]:
+    """
+    Measures the time, memory, and requests used by code run within context.
+    :param api: The stub API whose requests are counted.
+    :return: Result filled in once context exits. Stages may add their own metrics.
+    """
+    result = StageResult()
+    request_counts_before = dict(api.request_counts)
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.wall_time_s = time.perf_counter() - start
+        result.peak_memory_mb = tracemalloc.get_traced_memory()[1] / BYTES_PER_MB
+        tracemalloc.stop()
+        result.max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        result.requests = {route: count - request_counts_before.get(route, 0) for route, count in api.request_counts.items()
+                           if count > request_counts_before.get(route, 0)}
+        result.n_requests = sum(result.requests.values())
+
+
+def compare_to_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Compares stage results against baseline results.
+    Time and memory regress when they exceed the baseline by more than the tolerance, requests regress on any increase.
+    :param results: Map of stage name to its result JSON.
+    :param baseline: Map of stage name to its baseline result JSON.
+    :param tolerance: Fraction of the baseline that time and memory may grow by.
+    :return: Description of each regression found.
+    """
+    regressions = []
+    for stage_name, stage_result in results.items():
+        if stage_name not in baseline:
+            continue
+        stage_baseline = baseline[stage_name]
+        for metric in ["wall_time_s", "peak_memory_mb"]:
+            limit = stage_baseline[metric] * (1 + tolerance)
+            if stage_result[metric] > limit:
+                regressions.append(f"{stage_name}.{metric}: {stage_result[metric]:.3f} > {stage_baseline[metric]:.3f} "
+                                   f"(+{tolerance:.0%})")
+        if stage_result["n_requests"] > stage_baseline["n_requests"]:
+            regressions.append(f"{stage_name}.n_requests: {stage_result['n_requests']} > {stage_baseline['n_requests']}")
+    return regressions
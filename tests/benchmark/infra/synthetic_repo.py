@@ -0,0 +1,159 @@
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+from git import Actor, Repo
+
+from safa.utils.fs import write_file_content
+
+SYNTHETIC_AUTHOR = Actor("Benchmark", "benchmark@safa.ai")
+WORDS = ["account", "artifact", "commit", "config", "diff", "project", "search", "summary", "trace", "version"]
+
+
+@dataclass
+class SyntheticRepoSpec:
+    """
+    :param n_files: Number of files in the initial commit.
+    :param n_commits: Number of commits, including the initial commit.
+    :param binary_ratio: Fraction of files containing binary content.
+    :param file_lines: Number of lines in each text file.
+    :param files_per_commit: Number of files changed in each commit after the initial one.
+    :param seed: Seed used to generate content so that runs are comparable.
+    """
+    n_files: int = 50
+    n_commits: int = 10
+    binary_ratio: float = 0.1
+    file_lines: int = 60
+    files_per_commit: int = 5
+    seed: int = 0
+
+    def to_json(self) -> Dict:
+        """
+        :return: Spec as JSON.
+        """
+        return asdict(self)
+
+
+SIZE_PRESETS: Dict[str, SyntheticRepoSpec] = {
+    "small": SyntheticRepoSpec(n_files=50, n_commits=10),
+    "medium": SyntheticRepoSpec(n_files=500, n_commits=50, files_per_commit=20),
+    "large": SyntheticRepoSpec(n_files=2000, n_commits=200, files_per_commit=50)
+}
+
+
+def create_synthetic_repo(repo_path: str, spec: SyntheticRepoSpec) -> Repo:
+    """
+    Creates repository whose history follows spec. The first commit adds every file and later ones modify,
+    add, and delete a subset of them.
+    :param repo_path: Path to create repository at.
+    :param spec: The size and shape of the repository.
+    :return: The created repository.
+    """
+    rng = random.Random(spec.seed)
+    os.makedirs(repo_path, exist_ok=True)
+    repo = Repo.init(repo_path)
+
+    files: List[str] = [_create_file_name(rng, i, spec.binary_ratio) for i in range(spec.n_files)]
+    for file_name in files:
+        _write_file(rng, repo_path, file_name, spec.file_lines)
+    _commit(repo, files, [], "Initial commit\n\n- Adds project files.")
+
+    for commit_idx in range(1, spec.n_commits):
+        changed_files = rng.sample(files, min(spec.files_per_commit, len(files)))
+        for file_name in changed_files:
+            _write_file(rng, repo_path, file_name, spec.file_lines)
+
+        removed_files = []
+        if len(files) > 1 and rng.random() < 0.2:
+            removed_file = rng.choice([f for f in files if f not in changed_files] or files)
+            files.remove(removed_file)
+            os.remove(os.path.join(repo_path, removed_file))
+            removed_files.append(removed_file)
+        if rng.random() < 0.3:
+            added_file = _create_file_name(rng, spec.n_files + commit_idx, spec.binary_ratio)
+            _write_file(rng, repo_path, added_file, spec.file_lines)
+            files.append(added_file)
+            changed_files.append(added_file)
+
+        changes = "\n".join(f"- Updates {f}." for f in changed_files)
+        _commit(repo, [f for f in changed_files if f in files], removed_files, f"Commit {commit_idx}\n\n{changes}")
+    return repo
+
+
+def modify_files(repo: Repo, n_files: int, seed: int = 0) -> List[str]:
+    """
+    Modifies and stages text files in repository.
+    :param repo: The repository to modify.
+    :param n_files: The number of files to modify.
+    :param seed: Seed used to choose files and generate content.
+    :return: The modified files.
+    """
+    rng = random.Random(seed)
+    repo_path = str(repo.working_tree_dir)
+    text_files = sorted(f for f in repo.git.ls_files().splitlines() if f.endswith(".py"))
+    modified_files = rng.sample(text_files, min(n_files, len(text_files)))
+    for file_name in modified_files:
+        file_path = os.path.join(repo_path, file_name)
+        with open(file_path) as f:
+            lines = f.read().splitlines()
+        for line_idx in rng.sample(range(len(lines)), max(1, len(lines) // 10)):
+            lines[line_idx] = _create_line(rng)
+        write_file_content(file_path, "\n".join(lines) + "\n")
+    repo.index.add(modified_files)
+    return modified_files
+
+
+def _create_file_name(rng: random.Random, file_idx: int, binary_ratio: float) -> str:
+    """
+    Creates file name within a nested package.
+    :param rng: Random generator.
+    :param file_idx: Index used to make name unique.
+    :param binary_ratio: Probability that file is binary.
+    :return: Relative path to file.
+    """
+    extension = "bin" if rng.random() < binary_ratio else "py"
+    return os.path.join(f"pkg_{file_idx % 10}", f"module_{file_idx}.{extension}")
+
+
+def _write_file(rng: random.Random, repo_path: str, file_name: str, n_lines: int) -> None:
+    """
+    Writes random content to file, binary files are given random bytes.
+    :param rng: Random generator.
+    :param repo_path: Path to repository.
+    :param file_name: Relative path to file.
+    :param n_lines: Number of lines in text file.
+    :return: None
+    """
+    file_path = os.path.join(repo_path, file_name)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if file_name.endswith(".bin"):
+        with open(file_path, "wb") as f:
+            f.write(rng.randbytes(n_lines * 40))
+    else:
+        write_file_content(file_path, "\n".join(_create_line(rng) for _ in range(n_lines)) + "\n")
+
+
+def _create_line(rng: random.Random) -> str:
+    """
+    :param rng: Random generator.
+    :return: Line of python-like code.
+    """
+    name, value = rng.sample(WORDS, 2)
+    return f"{name}_{rng.randint(0, 999)} = get_{value}({rng.randint(0, 99)})"
+
+
+def _commit(repo: Repo, changed_files: List[str], removed_files: List[str], message: str) -> None:
+    """
+    Stages files and commits them.
+    :param repo: The repository to commit to.
+    :param changed_files: Files added or modified.
+    :param removed_files: Files deleted.
+    :param message: The commit message.
+    :return: None
+    """
+    if changed_files:
+        repo.index.add(changed_files)
+    if removed_files:
+        repo.index.remove(removed_files)
+    repo.index.commit(message, author=SYNTHETIC_AUTHOR, committer=SYNTHETIC_AUTHOR)
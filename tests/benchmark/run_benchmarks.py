@@ -0,0 +1,255 @@
+import argparse
+import contextlib
+import dataclasses
+import io
+import os
+import sys
+import tempfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+from git import Repo
+
+from safa.api.client_factory import create_safa_client
+from safa.api.safa_client import SafaClient
+from safa.api.stub_server import StubSafaServer
+from safa.config.safa_config import SafaConfig
+from safa.utils.commits import get_commits_since
+from safa.utils.fs import read_json_file, write_json
+from safa.utils.menus.printers import print_title
+from tests.benchmark.infra.fake_llm import FakeLLM
+from tests.benchmark.infra.measure import StageResult, compare_to_baseline, measure_stage
+from tests.benchmark.infra.synthetic_repo import SIZE_PRESETS, WORDS, SyntheticRepoSpec, create_synthetic_repo, modify_files
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+
+class BenchmarkContext:
+    def __init__(self, repo: Repo, config: SafaConfig, client: SafaClient, llm_latency: float):
+        """
+        Holds the state shared between benchmark stages.
+        :param repo: The synthetic repository.
+        :param config: Configuration pointing at the synthetic repository and stub server.
+        :param client: Client logged in to stub server.
+        :param llm_latency: Seconds the fake LLM waits before responding.
+        """
+        self.repo = repo
+        self.config = config
+        self.client = client
+        self.llm_latency = llm_latency
+        self.vector_store = None
+
+
+def run_push_stage(context: BenchmarkContext, result: StageResult) -> None:
+    """
+    Pushes every commit of the synthetic repository to the stub server.
+    :param context: The benchmark state.
+    :param result: Result to add metrics to.
+    :return: None
+    """
+    from safa.tools.projects.push import run_push_commit
+
+    commits = get_commits_since(context.repo)
+    run_push_commit(context.config, context.client, commits=commits, version_type="revision", resume=False,
+                    update_summary=False)
+    result.metrics["n_commits"] = len(commits)
+
+
+def run_committer_prompt_stage(context: BenchmarkContext, result: StageResult) -> None:
+    """
+    Builds the committer prompt for staged changes and sends it to the fake LLM.
+    :param context: The benchmark state.
+    :param result: Result to add metrics to.
+    :return: None
+    """
+    from safa.tools.committer import create_artifact_name_lookup, create_file_changes, get_project_data
+    from safa.utils.diff_summary import summarize_commit_changes
+    from safa.utils.git_helpers import get_staged_diffs
+
+    modified_files = modify_files(context.repo, n_files=10)
+    project_data = get_project_data(context.config, context.client)
+    artifact_map = create_artifact_name_lookup(project_data["artifacts"])
+    file2diff = get_staged_diffs(context.repo)
+    file_changes = create_file_changes(file2diff, artifact_map, context.repo)
+    fake_llm = FakeLLM(latency=context.llm_latency)
+    summarize_commit_changes(fake_llm, file_changes, project_data["specification"])
+    context.repo.git.reset("--hard", "HEAD")
+
+    result.metrics["n_files"] = len(modified_files)
+    result.metrics["prompt_chars"] = fake_llm.prompt_chars
+
+
+def run_vector_store_stage(context: BenchmarkContext, result: StageResult) -> None:
+    """
+    Embeds the artifacts of the pushed project into a new vector store.
+    :param context: The benchmark state.
+    :param result: Result to add metrics to.
+    :return: None
+    """
+    from safa.tools.search import create_vector_store
+
+    project_data = context.client.get_version(context.config.project_config.get_version_id())
+    context.vector_store = create_vector_store(project_data["artifacts"], context.config.get_vector_store_path())
+    result.metrics["n_artifacts"] = len(project_data["artifacts"])
+
+
+def run_search_stage(context: BenchmarkContext, result: StageResult) -> None:
+    """
+    Runs similarity searches against the vector store.
+    :param context: The benchmark state.
+    :param result: Result to add metrics to.
+    :return: None
+    """
+    if context.vector_store is None:
+        raise Exception("The vector_store stage must run before the search stage.")
+    for query in WORDS:
+        context.vector_store.similarity_search_with_score(query, k=3, filter={"type": {"$in": ["Code"]}})
+    result.metrics["n_queries"] = len(WORDS)
+
+
+STAGES: Dict[str, Callable[[BenchmarkContext, StageResult], None]] = {
+    "push": run_push_stage,
+    "committer_prompt": run_committer_prompt_stage,
+    "vector_store": run_vector_store_stage,
+    "search": run_search_stage
+}
+
+
+def run_benchmarks(spec: SyntheticRepoSpec, stages: List[str], llm_latency: float = 0, verbose: bool = False) -> Dict:
+    """
+    Creates synthetic repository and runs benchmark stages against a stub SAFA server.
+    :param spec: The shape of the synthetic repository.
+    :param stages: The names of the stages to run, in order.
+    :param llm_latency: Seconds the fake LLM waits before responding.
+    :param verbose: Whether to show the output of the stages.
+    :return: The spec and the result of each stage.
+    """
+    stage_results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir, StubSafaServer() as server:
+        repo_path = os.path.join(tmp_dir, "repo")
+        print(f"...creating synthetic repository ({spec.n_files} files, {spec.n_commits} commits)...")
+        repo = create_synthetic_repo(repo_path, spec)
+        config, client = _create_config_and_client(repo_path, server)
+        context = BenchmarkContext(repo, config, client, llm_latency=llm_latency)
+
+        for stage_name in stages:
+            print(f"...running {stage_name}...")
+            with _capture_output(verbose), measure_stage(server.api) as stage_result:
+                STAGES[stage_name](context, stage_result)
+            stage_results[stage_name] = stage_result.to_json()
+    return {"spec": spec.to_json(), "stages": stage_results}
+
+
+def print_results(results: Dict, regressions: Optional[List[str]] = None) -> None:
+    """
+    Prints the results of each stage and any regressions found.
+    :param results: The benchmark results.
+    :param regressions: Regressions found compared to baseline.
+    :return: None
+    """
+    print_title("Benchmark Results")
+    print(f"{'stage':<18}{'time(s)':>10}{'memory(MB)':>12}{'rss(MB)':>10}{'requests':>10}")
+    for stage_name, stage_result in results["stages"].items():
+        print(f"{stage_name:<18}{stage_result['wall_time_s']:>10.3f}{stage_result['peak_memory_mb']:>12.2f}"
+              f"{stage_result['max_rss_mb']:>10.1f}{stage_result['n_requests']:>10}")
+    if regressions is None:
+        return
+    if len(regressions) == 0:
+        print("\nNo regressions found compared to baseline.")
+    else:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"- {regression}")
+
+
+def main() -> None:
+    """
+    Runs benchmarks and compares them to baseline.
+    :return: None
+    """
+    args = _parse_args()
+    spec_overrides = {p: getattr(args, p) for p in ["n_files", "n_commits", "binary_ratio", "files_per_commit", "seed"]
+                      if getattr(args, p) is not None}
+    spec = dataclasses.replace(SIZE_PRESETS[args.size], **spec_overrides)
+    stages = [s.strip() for s in args.stages.split(",")]
+    for stage_name in stages:
+        if stage_name not in STAGES:
+            raise Exception(f"Expected stage ({stage_name}) to be one of {list(STAGES.keys())}")
+
+    results = run_benchmarks(spec, stages, llm_latency=args.llm_latency, verbose=args.verbose)
+    if args.output:
+        write_json(args.output, results)
+
+    if args.update_baseline:
+        write_json(args.baseline, results)
+        print_results(results)
+        print(f"Baseline written to: {args.baseline}")
+        return
+
+    regressions = None
+    if os.path.isfile(args.baseline):
+        baseline = read_json_file(args.baseline)
+        if baseline["spec"] != results["spec"]:
+            print("Baseline was recorded with a different spec, skipping comparison.")
+        else:
+            regressions = compare_to_baseline(results["stages"], baseline["stages"], tolerance=args.tolerance)
+    print_results(results, regressions)
+    if regressions:
+        sys.exit(1)
+
+
+def _create_config_and_client(repo_path: str, server: StubSafaServer) -> Tuple[SafaConfig, SafaClient]:
+    """
+    Creates configuration for repository with a new project on the stub server.
+    :param repo_path: Path to repository.
+    :param server: The running stub server.
+    :return: The configuration and a logged-in client.
+    """
+    config = SafaConfig.from_repo(repo_path)
+    config.repo_config.base_url = server.base_url
+    config.user_config.set_account("benchmark@safa.ai", "benchmark")
+    with _capture_output(verbose=False):
+        client = create_safa_client(config)
+        project_data = client.create_project("benchmark", "Synthetic repository used for benchmarks.")
+        config.project_config.set_project(project_data["projectId"], project_data["projectVersion"]["versionId"])
+    return config, client
+
+
+@contextlib.contextmanager
+def _capture_output(verbose: bool):
+    """
+    Hides stdout and stderr unless verbose.
+    :param verbose: Whether to show output.
+    :return: Context in which output is hidden.
+    """
+    if verbose:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def _parse_args() -> argparse.Namespace:
+    """
+    :return: Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks safa against synthetic repositories.")
+    parser.add_argument("--size", choices=list(SIZE_PRESETS.keys()), default="small", help="Preset repository size")
+    parser.add_argument("--files", dest="n_files", type=int, help="Number of files in initial commit")
+    parser.add_argument("--commits", dest="n_commits", type=int, help="Number of commits in repository")
+    parser.add_argument("--binary-ratio", dest="binary_ratio", type=float, help="Fraction of binary files")
+    parser.add_argument("--files-per-commit", dest="files_per_commit", type=int, help="Number of files changed per commit")
+    parser.add_argument("--seed", type=int, help="Seed used to generate repository")
+    parser.add_argument("--stages", default=",".join(STAGES.keys()), help="Comma separated stages to run")
+    parser.add_argument("--llm-latency", type=float, default=0, help="Seconds the fake LLM waits before responding")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Path to baseline results")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite baseline with results")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed growth in time and memory")
+    parser.add_argument("--output", help="Path to write results to")
+    parser.add_argument("--verbose", action="store_true", help="Show the output of each stage")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
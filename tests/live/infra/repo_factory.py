@@ -2,9 +2,9 @@ import os
 import shutil
 import uuid
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from git import Repo
+from git import Actor, Commit, Repo
 
 from safa.api.client_factory import create_safa_client
 from safa.api.safa_client import SafaClient
@@ -12,6 +12,8 @@ from safa.config.safa_config import SafaConfig
 from safa.utils.fs import write_file_content
 from tests.live.infra.constants import TEST_OUTPUT_DIR
 
+TEST_AUTHOR = Actor("Test", "test@safa.ai")
+
 
 @dataclass
 class RepoFactory:
@@ -37,20 +39,48 @@ class RepoFactory:
         os.makedirs(self.repo_path, exist_ok=True)
         self.repo = Repo.init(self.repo_path)
 
-    def commit_file(self, file_name: str, file_content: str, commit_msg: str = "Writing content to file") -> None:
+    def commit_file(self, file_name: str, file_content: str, commit_msg: str = "Writing content to file") -> Commit:
         """
         Writes content to file and commits it to the repo.
         :param file_name: Name of file.
         :param file_content: Contents of file.
         :param commit_msg: Message to commit with.
-        :return: None
+        :return: The commit.
+        """
+        return self.commit_files({file_name: file_content}, commit_msg)
+
+    def commit_files(self, file2content: Dict[str, str], commit_msg: str) -> Commit:
+        """
+        Writes content to files and commits them to the repo.
+        :param file2content: Map of file name to its content.
+        :param commit_msg: Message to commit with.
+        :return: The commit.
         """
-        assert self.repo_path is not None, f"Repository path is not initialized."
         assert self.repo is not None, f"Repository is not initialized."
-        file_path = os.path.join(self.repo_path, file_name)
-        write_file_content(file_path, file_content)
-        self.repo.index.add([file_path])
-        self.repo.index.commit(message=commit_msg)
+        self.repo.index.add(self.write_files(file2content))
+        return self.repo.index.commit(message=commit_msg, author=TEST_AUTHOR, committer=TEST_AUTHOR)
+
+    def commit_revisions(self, n_commits: int, start: int = 0) -> List[Commit]:
+        """
+        Commits revisions of a.py, each setting a to the number of the revision.
+        :param n_commits: Number of revisions to commit.
+        :param start: Number of the first revision.
+        :return: The commits, oldest first.
+        """
+        return [self.commit_file("a.py", f"a = {i}\n", f"Commit {i}\n\n- Sets a to {i}.")
+                for i in range(start, start + n_commits)]
+
+    def write_files(self, file2content: Dict[str, str]) -> List[str]:
+        """
+        Writes content to files in the working tree without staging them.
+        :param file2content: Map of file name to its content.
+        :return: Paths to the files written.
+        """
+        assert self.repo_path is not None, f"Repository path is not initialized."
+        file_paths = [os.path.join(self.repo_path, file_name) for file_name in file2content.keys()]
+        for file_path, file_content in zip(file_paths, file2content.values()):
+            write_file_content(file_path, file_content)
+        return file_paths
 
     def get_safa_client(self) -> Tuple[SafaConfig, SafaClient]:
         """
@@ -1,11 +1,13 @@
 import json
 import re
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 from unittest import TestCase
 
 import responses
 from requests import PreparedRequest
 
+from safa.api.async_http_client import AsyncHttpClient
+from safa.api.async_safa_client import AsyncSafaClient
 from safa.api.constants import SAFA_AUTH_TOKEN
 from safa.api.http_client import HttpClient
 from safa.api.safa_client import SafaClient
@@ -30,6 +32,16 @@ class Mocker:
         client = SafaClient(http_client=http_client)
         return client
 
+    @staticmethod
+    def get_async_client(max_concurrency: int = 8) -> AsyncSafaClient:
+        """
+        Returns asynchronous safa client with same base url as mocker.
+        :param max_concurrency: The maximum number of requests in flight at once.
+        :return: Async Safa Client.
+        """
+        http_client = AsyncHttpClient(HttpClient(Mocker.BASE_URL), max_concurrency=max_concurrency)
+        return AsyncSafaClient(http_client=http_client)
+
     @staticmethod
     def mock_auth(tc: TestCase, email: str = DEFAULT_EMAIL, password: str = DEFAULT_PASSWORD,
                   token_value: str = DEFAULT_AUTH_TOKEN) -> None:
@@ -76,9 +88,11 @@ class Mocker:
         )
 
     @staticmethod
-    def mock_get_project_data(tc: TestCase, project_data: Dict):
+    def mock_get_project_data(tc: TestCase, project_data: Dict, on_request: Optional[Callable] = None):
         def request_callback(request):
             Mocker.assert_auth_cookie(tc, request)
+            if on_request:
+                on_request(request)
             return 200, {}, json.dumps(project_data)
 
         responses.add_callback(
@@ -88,6 +102,49 @@ class Mocker:
             content_type='application/json'
         )
 
+    @staticmethod
+    def mock_get_version_delta(tc: TestCase, delta_data: Dict) -> None:
+        """
+        Mocks endpoint for retrieving the changes between two project versions.
+        :param tc: Test case used to assert request details.
+        :param delta_data: The delta to return in response.
+        :return: None
+        """
+
+        def request_callback(request):
+            Mocker.assert_auth_cookie(tc, request)
+            return 200, {}, json.dumps(delta_data)
+
+        responses.add_callback(
+            responses.GET,
+            re.compile(rf"{Mocker.BASE_URL}/projects/delta/[0-9a-fA-F-]+/[0-9a-fA-F-]+"),
+            callback=request_callback,
+            content_type='application/json'
+        )
+
+    @staticmethod
+    def mock_summarize_artifacts(tc: TestCase) -> List[List[str]]:
+        """
+        Mocks endpoint summarizing artifacts, responding with a summary for each requested artifact.
+        :param tc: Test case used to assert request details.
+        :return: List populated with the artifact IDs of each request received.
+        """
+        requested_batches: List[List[str]] = []
+
+        def request_callback(request):
+            Mocker.assert_auth_cookie(tc, request)
+            artifact_ids = json.loads(request.body)["artifacts"]
+            requested_batches.append(artifact_ids)
+            return 200, {}, json.dumps([{"id": a_id, "summary": f"summary of {a_id}"} for a_id in artifact_ids])
+
+        responses.add_callback(
+            responses.POST,
+            re.compile(rf"{Mocker.BASE_URL}/projects/versions/[0-9a-fA-F-]+/artifacts/summarize"),
+            callback=request_callback,
+            content_type='application/json'
+        )
+        return requested_batches
+
     @staticmethod
     def mock_create_project(tc: TestCase, project_data: Dict) -> None:
         """
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+import uuid
+from unittest import TestCase
+
+import responses
+
+from safa.api.http_client import HttpClient
+from tests.unit.mocker import Mocker
+
+
+class TestAsyncClient(TestCase):
+    @responses.activate
+    def test_get_versions_bounded_concurrency(self):
+        """
+        Tests that versions are retrieved concurrently without exceeding the maximum concurrency.
+        """
+        max_concurrency = 2
+        version_ids = [str(uuid.uuid4()) for _ in range(6)]
+        project_data = {"name": "blah"}
+        lock = threading.Lock()
+        counts = {"active": 0, "max_active": 0}
+
+        def on_request(request):
+            with lock:
+                counts["active"] += 1
+                counts["max_active"] = max(counts["max_active"], counts["active"])
+            time.sleep(0.05)
+            with lock:
+                counts["active"] -= 1
+
+        Mocker.mock_auth(self)
+        Mocker.mock_get_project_data(self, project_data, on_request=on_request)
+        client = Mocker.get_async_client(max_concurrency=max_concurrency)
+
+        async def run():
+            await client.login(email=Mocker.DEFAULT_EMAIL, password=Mocker.DEFAULT_PASSWORD)
+            return await client.get_versions(version_ids)
+
+        versions = asyncio.run(run())
+
+        self.assertEqual([project_data] * len(version_ids), versions)
+        self.assertEqual(max_concurrency, counts["max_active"])
+
+    @responses.activate
+    def test_sync_client_shares_session(self):
+        """
+        Tests that the synchronous client runs on the shared loop and shares the session cookies.
+        """
+        Mocker.mock_auth(self)
+        Mocker.mock_get_projects(self, Mocker.DEFAULT_PROJECTS)
+        client = Mocker.get_client()
+
+        client.login(email=Mocker.DEFAULT_EMAIL, password=Mocker.DEFAULT_PASSWORD)
+
+        self.assertIs(client.http_client.cookies, client.async_client.http_client.cookies)
+        self.assertEqual(Mocker.DEFAULT_PROJECTS, client.get_projects())
+
+    def test_session_per_thread(self):
+        """
+        Tests that each thread performs requests with its own session sharing the cookies of the client.
+        """
+        http_client = HttpClient("http://localhost")
+        thread_sessions = []
+        thread = threading.Thread(target=lambda: thread_sessions.append(http_client.session))
+        thread.start()
+        thread.join()
+
+        self.assertIs(http_client.session, http_client.session)
+        self.assertIsNot(http_client.session, thread_sessions[0])
+        self.assertIs(http_client.session.cookies, thread_sessions[0].cookies)
+
+    @responses.activate
+    def test_summarize_artifacts_batched(self):
+        """
+        Tests that artifacts are summarized in batches no larger than the batch size.
+        """
+        version_id = str(uuid.uuid4())
+        artifact_ids = [str(uuid.uuid4()) for _ in range(7)]
+
+        Mocker.mock_auth(self)
+        requested_batches = Mocker.mock_summarize_artifacts(self)
+        client = Mocker.get_client()
+        client.login(email=Mocker.DEFAULT_EMAIL, password=Mocker.DEFAULT_PASSWORD)
+
+        summarized_artifacts = client.summarize_artifacts_batched(version_id, artifact_ids, batch_size=3)
+
+        self.assertEqual([3, 3, 1], sorted([len(b) for b in requested_batches], reverse=True))
+        self.assertEqual(artifact_ids, [a["id"] for a in summarized_artifacts])
@@ -0,0 +1,62 @@
+import tempfile
+from unittest import TestCase
+
+from safa.utils.diffs import calculate_diff
+from tests.live.infra.repo_factory import RepoFactory
+
+
+class TestCalculateDiff(TestCase):
+    def setUp(self) -> None:
+        self.repo_dir = tempfile.TemporaryDirectory()
+        self.repo_factory = RepoFactory(repo_path=self.repo_dir.name)
+        self.repo = self.repo_factory.repo
+        self.first_commit = self.repo_factory.commit_files({"a.py": "a = 1\nb = 2\n", "b.py": "c = 3\n"}, "First commit")
+        self.second_commit = self.repo_factory.commit_files({"a.py": "a = 1\nb = 20\nc = 3\n"},
+                                                            "Second commit\n\nchanged a")
+
+    def tearDown(self) -> None:
+        self.repo_dir.cleanup()
+
+    def test_calculate_diff(self):
+        """
+        Tests that modified files are converted to artifacts along with the commit artifact.
+        """
+        commit_data = calculate_diff(self.repo, self.second_commit, starting_commit=self.first_commit)
+
+        modified_artifacts = commit_data["artifacts"]["modified"]
+        self.assertEqual(["a.py"], [a["name"] for a in modified_artifacts])
+        self.assertEqual("a = 1\nb = 20\nc = 3\n", modified_artifacts[0]["body"])
+        commit_artifact = commit_data["artifacts"]["added"][-1]
+        self.assertEqual("Commit", commit_artifact["type"])
+        self.assertEqual("changed a", commit_artifact["body"])
+
+    def test_calculate_diff_stat(self):
+        """
+        Tests that diff stat counts the files and lines changed by the commit.
+        """
+        commit_data = calculate_diff(self.repo, self.second_commit, starting_commit=self.first_commit, include_diff_stat=True)
+
+        commit_artifact = commit_data["artifacts"]["added"][-1]
+        self.assertEqual("changed a\n\n1 file changed, 2 insertions(+), 1 deletion(-)", commit_artifact["body"])
+        self.assertEqual(["a.py"], [a["name"] for a in commit_data["artifacts"]["modified"]])
+
+    def test_calculate_diff_stat_first_commit(self):
+        """
+        Tests that the diff stat of the first commit counts all lines of the added files.
+        """
+        commit_data = calculate_diff(self.repo, self.first_commit, include_diff_stat=True)
+
+        commit_artifact = commit_data["artifacts"]["added"][-1]
+        self.assertEqual("2 files changed, 3 insertions(+), 0 deletions(-)", commit_artifact["body"])
+        self.assertEqual(["a.py", "b.py"], [a["name"] for a in commit_data["artifacts"]["added"][:-1]])
+
+    def test_calculate_diff_stat_binary(self):
+        """
+        Tests that changed binary files are counted without lines.
+        """
+        commit = self.repo_factory.commit_file("image.png", "PNG\0\n", "Add image")
+
+        commit_data = calculate_diff(self.repo, commit, starting_commit=self.second_commit, include_diff_stat=True)
+
+        commit_artifact = commit_data["artifacts"]["added"][-1]
+        self.assertEqual("1 file changed, 0 insertions(+), 0 deletions(-)", commit_artifact["body"])
@@ -0,0 +1,92 @@
+import difflib
+from unittest import TestCase
+from unittest.mock import patch
+
+from safa.data.file_change import FileChange
+from safa.utils.code_condenser import condense_file_change, get_changed_lines
+from safa.utils.diff_summary import create_change_prompt
+
+SOURCE_BEFORE = '''import os
+
+LIMIT = 10
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+class Store:
+    name = "store"
+
+    def __init__(self, path):
+        self.path = path
+
+    @property
+    def size(self):
+        return os.path.getsize(self.path)
+
+    def load(self):
+        content = read(self.path)
+        return content[:LIMIT]
+'''
+
+
+class TestCodeCondenser(TestCase):
+    @patch("safa.utils.code_condenser.CONDENSE_MIN_LINES", 0)
+    def test_condense_python(self):
+        """
+        Tests that only the changed method and its enclosing class keep their source.
+        """
+        source_after = SOURCE_BEFORE.replace("content[:LIMIT]", "content[:LIMIT].strip()")
+        change = self.create_file_change(source_after)
+
+        condensed_change = condense_file_change(change)
+
+        self.assertEqual(["Store.load"], condensed_change.changed_symbols)
+        self.assertEqual('''...
+def read(path):
+    ...
+class Store:
+    ...
+    def __init__(self, path):
+        ...
+    @property
+    def size(self):
+        ...
+    def load(self):
+        content = read(self.path)
+        return content[:LIMIT]''', condensed_change.content_before)
+
+    @patch("safa.utils.code_condenser.CONDENSE_MIN_LINES", 0)
+    def test_condense_added_symbol(self):
+        """
+        Tests that symbols added are listed in the prompt and that unparsable files are sent whole.
+        """
+        source_after = SOURCE_BEFORE + "\n    def clear(self):\n        self.path = None\n"
+        prompt = create_change_prompt([self.create_file_change(source_after)])
+        self.assertIn("## Changed Symbols\nStore.clear", prompt)
+        self.assertNotIn("return os.path.getsize", prompt)
+
+        invalid_change = self.create_file_change(source_after)
+        invalid_change.content_before = SOURCE_BEFORE + "def ("
+        self.assertIsNone(condense_file_change(invalid_change))
+
+    def test_changed_lines(self):
+        """
+        Tests that only removed and added lines are changed and that insertions are placed between lines.
+        """
+        diff = "@@ -2,3 +2,3 @@\n a\n-b\n+c\n d\n@@ -10,0 +11,2 @@\n+e\n+f"
+        self.assertEqual(({3, 3.5, 10.5}, {3, 11, 12}), get_changed_lines(diff))
+
+    @staticmethod
+    def create_file_change(source_after: str) -> FileChange:
+        """
+        Creates change of module from its source before to the given source.
+        :param source_after: The source after the change.
+        :return: The file change.
+        """
+        diff = "\n".join(difflib.unified_diff(SOURCE_BEFORE.splitlines(), source_after.splitlines(), "a/store.py",
+                                              "b/store.py", lineterm="", n=0))
+        return FileChange(file="store.py", diff=diff, content_before=SOURCE_BEFORE, summary="",
+                          content_after=source_after)
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from safa.daemon.hook import main
+from safa.daemon.protocol import DaemonServer, GENERATE_ACTION, get_daemon_socket_path
+
+
+class TestCommitHook(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.dirname(get_daemon_socket_path(self.tmp_dir.name)))
+        self.message_file_path = os.path.join(self.tmp_dir.name, "COMMIT_EDITMSG")
+        with open(self.message_file_path, "w") as f:
+            f.write("# Please enter the commit message for your changes.\n")
+        self.cwd_patch = patch("os.getcwd", return_value=self.tmp_dir.name)
+        self.cwd_patch.start()
+
+    def tearDown(self) -> None:
+        self.cwd_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def test_writes_daemon_message(self):
+        """
+        Tests that the message generated by the daemon is written above the existing message and that messages given
+        on the command line are left untouched.
+        """
+        n_requests = []
+
+        def generate(request):
+            n_requests.append(request)
+            return {"message": "Update a\n\n- Sets a to 1."}
+
+        with DaemonServer(get_daemon_socket_path(self.tmp_dir.name), {GENERATE_ACTION: generate}) as server:
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                self.assertEqual(0, main([self.message_file_path, "message"]))
+                self.assertEqual(0, main([self.message_file_path]))
+            finally:
+                server.shutdown()
+                thread.join()
+
+        self.assertEqual(1, len(n_requests))
+        self.assertEqual("Update a\n\n- Sets a to 1.\n# Please enter the commit message for your changes.\n",
+                         self.read_message())
+        self.assertFalse(os.path.exists(get_daemon_socket_path(self.tmp_dir.name)))
+
+    def test_daemon_not_running(self):
+        """
+        Tests that the commit proceeds with the original message when the daemon is not running or fails.
+        """
+        self.assertEqual(0, main([self.message_file_path]))
+
+        with DaemonServer(get_daemon_socket_path(self.tmp_dir.name), {}) as server:
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                self.assertEqual(0, main([self.message_file_path]))
+            finally:
+                server.shutdown()
+                thread.join()
+
+        self.assertEqual("# Please enter the commit message for your changes.\n", self.read_message())
+
+    def read_message(self) -> str:
+        """
+        :return: Content of the commit message file.
+        """
+        with open(self.message_file_path) as f:
+            return f.read()
@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+from safa.data.artifact import create_artifact
+from safa.data.commits import create_empty_diff
+from safa.utils.commit_store import CommitStore
+
+
+class TestCommitStore(TestCase):
+    VERSION_DATA = {
+        "artifacts": [
+            {"id": "a1", "name": "a.py", "type": "Code", "body": "a", "summary": "Does a.", "attributes": {"k": "v"}},
+            {"id": "c1", "name": "commit", "type": "Commit", "body": "", "summary": ""}
+        ],
+        "traces": [
+            {"traceLinkId": "t1", "sourceName": "a.py", "targetName": "commit", "sourceId": "a1", "targetId": "c1"}
+        ]
+    }
+
+    def test_add_ids(self):
+        """
+        Tests that artifact and trace ids are added to commit request from the version data.
+        """
+        store = CommitStore(self.VERSION_DATA)
+        commit_request = create_empty_diff()
+        commit_request["artifacts"]["modified"].append({"name": "a.py", "type": "Code", "body": "a2", "summary": ""})
+        commit_request["traces"]["removed"].append({"sourceName": "a.py", "targetName": "commit"})
+
+        store.add_ids(commit_request)
+
+        modified_artifact = commit_request["artifacts"]["modified"][0]
+        self.assertEqual("a1", modified_artifact["id"])
+        self.assertEqual("a2", modified_artifact["body"])
+        removed_trace = commit_request["traces"]["removed"][0]
+        self.assertEqual({"id": "t1", "sourceId": "a1", "targetId": "c1"},
+                         {k: removed_trace[k] for k in ["id", "sourceId", "targetId"]})
+
+    def test_modified_artifact_keeps_summary(self):
+        """
+        Tests that modified artifacts keep the summary and fields of their previous revision but not its body.
+        """
+        store = CommitStore(self.VERSION_DATA)
+        commit_request = create_empty_diff()
+        commit_request["artifacts"]["modified"].append(create_artifact("a.py", "Code", body="a2"))
+
+        store.add_ids(commit_request)
+
+        modified_artifact = commit_request["artifacts"]["modified"][0]
+        self.assertEqual("Does a.", modified_artifact["summary"])
+        self.assertEqual({"k": "v"}, modified_artifact["attributes"])
+        self.assertEqual("a2", modified_artifact["body"])
+
+        summary_response = create_empty_diff()
+        summary_response["artifacts"]["modified"].append({**modified_artifact, "summary": "Does a2."})
+        store.save_ids(summary_response)
+        store.add_ids(commit_request)
+        self.assertEqual("Does a2.", commit_request["artifacts"]["modified"][0]["summary"])
+
+    def test_save_ids(self):
+        """
+        Tests that store keeps only identifying information of committed entities.
+        """
+        store = CommitStore(self.VERSION_DATA)
+        commit_response = create_empty_diff()
+        commit_response["artifacts"]["added"].append({"id": "b1", "name": "b.py", "type": "Code", "body": "b" * 1000, "summary": "Does b."})
+        commit_response["artifacts"]["removed"].append({"id": "a1", "name": "a.py", "type": "Code"})
+        commit_response["traces"]["added"].append({"id": "t2", "sourceName": "b.py", "targetName": "commit"})
+
+        store.save_ids(commit_response)
+
+        self.assertEqual({"b.py", "commit"}, set(store.artifact_store.keys()))
+        self.assertEqual(CommitStore.hash_summary("Does b."), store.artifact_store["b.py"].summary_hash)
+        self.assertFalse(hasattr(store.artifact_store["b.py"], "body"))
+        self.assertEqual("t2", store.trace_store["b.py*commit"].id)
+        self.assertLess(store.get_memory_usage(), 4096)
+
+    def test_missing_trace(self):
+        """
+        Tests that updating unknown traces raises a descriptive error.
+        """
+        store = CommitStore(self.VERSION_DATA)
+        commit_request = create_empty_diff()
+        commit_request["traces"]["modified"].append({"sourceName": "b.py", "targetName": "commit"})
+
+        with self.assertRaisesRegex(Exception, r"b.py\*commit"):
+            store.add_ids(commit_request)
@@ -0,0 +1,39 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from safa.config.safa_config import SafaConfig
+
+
+class TestConfigWrites(TestCase):
+    def test_defer_writes(self):
+        """
+        Tests that saves are written to disk once when the deferring context exits.
+        """
+        with tempfile.TemporaryDirectory() as repo_path:
+            config = SafaConfig.from_repo(repo_path)
+            project_config_path = config.project_config.get_file_path()
+
+            with config.defer_writes():
+                for i in range(3):
+                    config.project_config.set_project("project", f"version-{i}", commit_id=f"commit-{i}")
+                self.assertFalse(os.path.exists(project_config_path))
+
+            reloaded_config = SafaConfig.from_repo(repo_path)
+            self.assertEqual("version-2", reloaded_config.project_config.version_id)
+            self.assertEqual("commit-2", reloaded_config.project_config.commit_id)
+            self.assertEqual([], [f for f in os.listdir(config.config_dir_path) if f.startswith(".tmp-")])
+
+    def test_flush_on_error(self):
+        """
+        Tests that deferred writes are flushed when context exits with an error.
+        """
+        with tempfile.TemporaryDirectory() as repo_path:
+            config = SafaConfig.from_repo(repo_path)
+
+            with self.assertRaises(KeyboardInterrupt):
+                with config.defer_writes():
+                    config.project_config.set_project("project", "version", commit_id="commit")
+                    raise KeyboardInterrupt()
+
+            self.assertEqual("commit", SafaConfig.from_repo(repo_path).project_config.commit_id)
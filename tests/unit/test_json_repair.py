@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+from unittest import TestCase
+
+from safa.utils.diff_summary import SUMMARIZE_TOOL
+from safa.utils.json_repair import repair_json
+from safa.utils.llm_router import LLMRoute, LLMRouter
+from safa.utils.structured_output import invoke_json
+
+
+@dataclass
+class ToolResponse:
+    content: str
+    tool_calls: List[Dict] = field(default_factory=list)
+
+
+class SequenceLLM:
+    def __init__(self, responses: List[ToolResponse]):
+        self.responses = responses
+        self.messages: List[List] = []
+
+    def invoke(self, messages) -> ToolResponse:
+        self.messages.append(messages)
+        return self.responses[len(self.messages) - 1]
+
+
+class ToolLLM(SequenceLLM):
+    def bind_tools(self, tools: List[Dict], tool_choice: str) -> "ToolLLM":
+        self.tool_choice = tool_choice
+        return self
+
+
+class TestJsonRepair(TestCase):
+    def test_repair_json(self):
+        """
+        Tests that unfenced JSON, trailing commas, and truncated arrays are recovered locally.
+        """
+        expected = {"changes": ["a", "b"], "title": "t"}
+        self.assertEqual(expected, repair_json('```json\n{"changes": ["a", "b"], "title": "t"}\n```'))
+        self.assertEqual(expected, repair_json('Here it is: {"changes": ["a", "b",], "title": "t",} Done.'))
+        self.assertEqual({"title": 't, "x"', "changes": ["a", "b"]},
+                         repair_json('```json\n{"title": "t, \\"x\\"", "changes": ["a", "b", "trunc'))
+        self.assertEqual({"title": "t", "changes": []}, repair_json('{"title": "t", "changes": ['))
+        self.assertIsNone(repair_json("no json here"))
+        self.assertIsNone(repair_json("[1, 2]"))
+
+    def test_single_repair_request(self):
+        """
+        Tests that a single repair request is sent when the response is missing required keys.
+        """
+        repaired_response = ToolResponse('{"diffs": {}, "changes": ["a"], "title": "t"}')
+        llm = SequenceLLM([ToolResponse('{"changes": ["a"]'), repaired_response])
+
+        response_json = invoke_json(llm, [("human", "prompt")], SUMMARIZE_TOOL)
+
+        self.assertEqual("t", response_json["title"])
+        self.assertEqual(2, len(llm.messages))
+        self.assertIn("missing keys: diffs, title", llm.messages[1][-1][1])
+
+        failing_llm = SequenceLLM([ToolResponse("invalid"), ToolResponse("still invalid")])
+        with self.assertRaises(Exception):
+            invoke_json(failing_llm, [("human", "prompt")], SUMMARIZE_TOOL)
+
+    def test_structured_output(self):
+        """
+        Tests that models supporting tools are forced to call the tool and their arguments are used directly.
+        """
+        tool_input = {"diffs": {"a.py": "a"}, "changes": ["a"], "title": "t"}
+        llm = ToolLLM([ToolResponse("", [{"name": SUMMARIZE_TOOL["name"], "args": tool_input}])])
+        router = LLMRouter([LLMRoute("model")], lambda route: llm)
+
+        self.assertEqual(tool_input, invoke_json(router, [("human", "prompt")], SUMMARIZE_TOOL))
+        self.assertEqual(SUMMARIZE_TOOL["name"], llm.tool_choice)
@@ -0,0 +1,78 @@
+import threading
+import time
+from typing import List
+from unittest import TestCase
+
+from safa.utils.llm_router import LLMRoute, LLMRouter, estimate_tokens
+
+
+class DelayedLLM:
+    def __init__(self, delays: List[float]):
+        self.delays = delays
+        self.n_calls = 0
+        self.lock = threading.Lock()
+
+    def invoke(self, messages) -> str:
+        with self.lock:
+            delay = self.delays[self.n_calls]
+            self.n_calls += 1
+        time.sleep(abs(delay))
+        if delay < 0:
+            raise Exception("Request failed.")
+        return f"response after {delay}s"
+
+
+class TestLLMHedging(TestCase):
+    def test_hedges_slow_request(self):
+        """
+        Tests that a slow request is hedged with a second request, the first response is returned, and the prompt of the
+        cancelled request is counted.
+        """
+        router = self.create_router([2, 0], hedge_delay=0.05)
+
+        start = time.perf_counter()
+        response = router.invoke([("human", "prompt")])
+
+        self.assertEqual("response after 0s", response)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(1, router.metrics["model"].n_hedged)
+        self.assertEqual(estimate_tokens([("human", "prompt")]), router.metrics["model"].cancelled_prompt_tokens)
+
+    def test_hedge_delay_from_latency_percentile(self):
+        """
+        Tests that the hedge delay is the latency percentile of the route once enough latencies were measured.
+        """
+        router = self.create_router([], hedge_percentile=50, hedge_delay=30)
+        route = router.routes[0]
+        self.assertEqual(30, router.get_hedge_delay(route))
+        router.latencies["model"].extend([5, 1, 4, 2, 3])
+        self.assertEqual(3, router.get_hedge_delay(route))
+        router.hedge_percentile = 0
+        self.assertIsNone(router.get_hedge_delay(route))
+
+    def test_retry_and_timeout(self):
+        """
+        Tests that a failed request is retried once, with or without hedging, and that requests are abandoned after the
+        timeout.
+        """
+        self.assertEqual("response after 0s", self.create_router([-0.01, 0]).invoke([("human", "prompt")]))
+        with self.assertRaises(Exception):
+            self.create_router([-0.01, -0.01]).invoke([("human", "prompt")])
+        unhedged_router = self.create_router([-0.01, 0], hedge_percentile=0)
+        self.assertEqual("response after 0s", unhedged_router.invoke([("human", "prompt")]))
+        hedged_router = self.create_router([-0.1, -0.01, 0], hedge_delay=0.05)
+        self.assertEqual("response after 0s", hedged_router.invoke([("human", "prompt")]))
+        self.assertEqual(2, hedged_router.metrics["model"].n_hedged)
+        with self.assertRaises(Exception):
+            self.create_router([1], hedge_percentile=0, timeout=0.05).invoke([("human", "prompt")])
+
+    @staticmethod
+    def create_router(delays: List[float], **kwargs) -> LLMRouter:
+        """
+        Creates router with single route whose LLM responds after the given delays.
+        :param delays: Seconds each request takes, negative delays fail the request after their absolute value.
+        :param kwargs: Hedging and timeout options of router.
+        :return: The router.
+        """
+        llm = DelayedLLM(delays)
+        return LLMRouter([LLMRoute("model")], lambda route: llm, **kwargs)
@@ -0,0 +1,67 @@
+from dataclasses import dataclass, field
+from typing import Dict
+from unittest import TestCase
+
+from safa.utils.llm_router import LLMRoute, LLMRouter, estimate_tokens, parse_llm_routes
+from safa.utils.prompt_cache import create_cached_content
+
+
+@dataclass
+class RouteResponse:
+    content: str
+    usage_metadata: Dict[str, int] = field(default_factory=dict)
+    response_metadata: Dict[str, Dict] = field(default_factory=dict)
+
+
+class RouteLLM:
+    def __init__(self, route: LLMRoute):
+        self.route = route
+
+    def invoke(self, messages) -> RouteResponse:
+        cache_usage = {"cache_read_input_tokens": 8, "cache_creation_input_tokens": 0}
+        return RouteResponse(self.route.model_name, {"input_tokens": 10, "output_tokens": 5}, {"usage": cache_usage})
+
+
+class TestLLMRouter(TestCase):
+    def test_parse_routes(self):
+        """
+        Tests that routes are ordered by their token limit and routes without a limit are last.
+        """
+        routes = parse_llm_routes("large, medium:8000,small:1000")
+        self.assertEqual([LLMRoute("small", 1000), LLMRoute("medium", 8000), LLMRoute("large")], routes)
+        with self.assertRaises(Exception):
+            parse_llm_routes("small:many")
+
+    def test_routes_by_prompt_size(self):
+        """
+        Tests that prompts are sent to the smallest route fitting them and that metrics are recorded per route.
+        """
+        created_routes = []
+
+        def create_llm(route: LLMRoute) -> RouteLLM:
+            created_routes.append(route.model_name)
+            return RouteLLM(route)
+
+        router = LLMRouter(parse_llm_routes("small:100,large"), create_llm)
+        small_prompt = [("system", "a" * 100), ("human", "b" * 100)]
+        large_prompt = [("system", "a" * 100), ("human", "b" * 1000)]
+
+        responses = [router.invoke(m).content for m in [small_prompt, large_prompt, small_prompt]]
+
+        self.assertEqual(["small", "large", "small"], responses)
+        self.assertEqual(["small", "large"], created_routes)
+        self.assertEqual((2, 36, 10), (router.metrics["small"].n_calls, router.metrics["small"].prompt_tokens,
+                                       router.metrics["small"].output_tokens))
+        self.assertEqual(1, router.metrics["large"].n_calls)
+
+    def test_cached_prefix(self):
+        """
+        Tests that cached content is counted towards the prompt size and that cache reads are recorded.
+        """
+        router = LLMRouter(parse_llm_routes("model"), RouteLLM)
+        messages = [("system", "a" * 100), ("human", create_cached_content("b" * 100)), ("human", "c" * 100)]
+
+        router.invoke(messages)
+
+        self.assertEqual(75, estimate_tokens(messages))
+        self.assertEqual(8, router.metrics["model"].cache_read_tokens)
@@ -0,0 +1,45 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from safa.utils.profiler import Profiler
+
+
+class TestProfiler(TestCase):
+    def test_disabled(self):
+        """
+        Tests that spans are not recorded until profiler is enabled.
+        """
+        profiler = Profiler()
+        with profiler.span("http.GET"):
+            pass
+        self.assertEqual(0, len(profiler.spans))
+
+    def test_summary_and_trace(self):
+        """
+        Tests that spans are aggregated by stage and written in chrome trace format.
+        """
+        profiler = Profiler()
+        profiler.enable()
+
+        @profiler.timed("git.calculate_diff")
+        def calculate_diff():
+            with profiler.span("git.decode_blob", file="a.py"):
+                pass
+
+        for _ in range(3):
+            calculate_diff()
+
+        summary = profiler.get_summary()
+        self.assertEqual(3, summary["git.calculate_diff"].count)
+        self.assertEqual(3, summary["git.decode_blob"].count)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_path = os.path.join(tmp_dir, "trace.json")
+            profiler.write_chrome_trace(trace_path)
+            with open(trace_path) as f:
+                trace_events = json.load(f)["traceEvents"]
+        self.assertEqual(6, len(trace_events))
+        self.assertEqual({"file": "a.py"}, trace_events[0]["args"])
+        self.assertEqual("git", trace_events[0]["cat"])
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import uuid
+from unittest import TestCase
+
+import responses
+
+from safa.api.constants import STORE_PROJECT_KEY
+from safa.api.safa_store import SafaStore
+from safa.utils.fs import read_json_file
+from tests.unit.mocker import Mocker
+
+
+def create_artifact(name: str, body: str, summary: str = "") -> dict:
+    return {"id": str(uuid.uuid4()), "name": name, "type": "Code", "body": body, "summary": summary}
+
+
+class TestProjectDelta(TestCase):
+    def test_apply_commit(self):
+        """
+        Tests that commit responses patch the cached project data and move it to the new version.
+        """
+        base_version_id = str(uuid.uuid4())
+        version_id = str(uuid.uuid4())
+        kept, modified, removed = create_artifact("a.py", "a"), create_artifact("b.py", "b"), create_artifact("c.py", "c")
+        project_data = {"name": "project", "artifacts": [kept, modified, removed], "traces": []}
+
+        client = Mocker.get_client()
+        client.store.save(STORE_PROJECT_KEY, base_version_id, project_data)
+
+        added = create_artifact("d.py", "d")
+        commit_response = {
+            "artifacts": {"added": [added], "modified": [{**modified, "body": "b2"}], "removed": [removed]},
+            "traces": {"added": [{"sourceName": "d.py", "targetName": "a.py"}], "modified": [], "removed": []}
+        }
+        client.apply_commit(version_id, commit_response, base_version_id=base_version_id)
+
+        self.assertFalse(client.store.has(STORE_PROJECT_KEY, base_version_id))
+        patched_data = client.get_version(version_id)
+        name2artifact = {a["name"]: a for a in patched_data["artifacts"]}
+        self.assertEqual({"a.py", "b.py", "d.py"}, set(name2artifact.keys()))
+        self.assertEqual("b2", name2artifact["b.py"]["body"])
+        self.assertEqual(modified["id"], name2artifact["b.py"]["id"])
+        self.assertEqual(1, len(patched_data["traces"]))
+
+    def test_apply_commit_deferred(self):
+        """
+        Tests that commits applied while store writes are deferred are written to the cache file once the context exits.
+        """
+        base_version_id = str(uuid.uuid4())
+        version_id = str(uuid.uuid4())
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_file_path = os.path.join(cache_dir, "cache.json")
+            store = SafaStore(cache_file_path)
+            store.save(STORE_PROJECT_KEY, base_version_id, {"artifacts": [create_artifact("a.py", "a")], "traces": []})
+            client = Mocker.get_client()
+            client.async_client.store = store
+            commit_response = {
+                "artifacts": {"added": [create_artifact("b.py", "b")], "modified": [], "removed": []},
+                "traces": {"added": [], "modified": [], "removed": []}
+            }
+
+            with store.defer_writes():
+                client.apply_commit(version_id, commit_response, base_version_id=base_version_id)
+                self.assertEqual([base_version_id], list(read_json_file(cache_file_path)[STORE_PROJECT_KEY].keys()))
+
+            cached_versions = read_json_file(cache_file_path)[STORE_PROJECT_KEY]
+            self.assertEqual([version_id], list(cached_versions.keys()))
+            self.assertEqual(2, len(cached_versions[version_id]["artifacts"]))
+
+    @responses.activate
+    def test_get_version_from_delta(self):
+        """
+        Tests that versions are constructed from the changes since a cached version.
+        """
+        base_version_id = str(uuid.uuid4())
+        version_id = str(uuid.uuid4())
+        modified = create_artifact("a.py", "a")
+        removed = create_artifact("b.py", "b")
+        project_data = {"name": "project", "artifacts": [modified, removed], "traces": []}
+        added = create_artifact("c.py", "c")
+        delta_data = {
+            "artifacts": {
+                "added": {added["id"]: added},
+                "modified": {modified["id"]: {"before": modified, "after": {**modified, "summary": "new summary"}}},
+                "removed": {removed["id"]: removed}
+            },
+            "traces": {"added": {}, "modified": {}, "removed": {}}
+        }
+
+        Mocker.mock_auth(self)
+        Mocker.mock_get_version_delta(self, delta_data)
+        client = Mocker.get_client()
+        client.login(email=Mocker.DEFAULT_EMAIL, password=Mocker.DEFAULT_PASSWORD)
+        client.store.save(STORE_PROJECT_KEY, base_version_id, project_data)
+
+        retrieved_data = client.get_version(version_id, base_version_id=base_version_id)
+
+        name2artifact = {a["name"]: a for a in retrieved_data["artifacts"]}
+        self.assertEqual({"a.py", "c.py"}, set(name2artifact.keys()))
+        self.assertEqual("new summary", name2artifact["a.py"]["summary"])
+        self.assertEqual(2, len(client.store.get(STORE_PROJECT_KEY, base_version_id)["artifacts"]))
@@ -0,0 +1,44 @@
+import importlib.util
+from types import SimpleNamespace
+from unittest import TestCase, skipUnless
+
+from safa.utils.prompt_cache import CACHE_CONTROL, PROMPT_CACHING_HEADERS, create_cached_content, get_prompt_tokens
+
+
+class TestPromptCache(TestCase):
+    def test_prompt_tokens_include_cache(self):
+        """
+        Tests that prompt tokens read from and written to the cache are counted towards the prompt.
+        """
+        response = SimpleNamespace(usage_metadata={"input_tokens": 10},
+                                   response_metadata={"usage": {"cache_read_input_tokens": 8,
+                                                                "cache_creation_input_tokens": 2}})
+        detailed_response = SimpleNamespace(usage_metadata={"input_tokens": 20, "input_token_details": {"cache_read": 8}})
+
+        self.assertEqual(20, get_prompt_tokens(response, 5))
+        self.assertEqual(20, get_prompt_tokens(detailed_response, 5))
+        self.assertEqual(5, get_prompt_tokens(SimpleNamespace(), 5))
+
+    def test_caching_disabled(self):
+        """
+        Tests that content is sent without cache breakpoint when prompt caching is disabled.
+        """
+        self.assertEqual([{"type": "text", "text": "project summary"}],
+                         create_cached_content("project summary", prompt_caching=False))
+
+    @skipUnless(importlib.util.find_spec("langchain_anthropic"), "langchain-anthropic is not installed.")
+    def test_anthropic_payload(self):
+        """
+        Tests that the cache breakpoint and the prompt caching header are sent to Anthropic.
+        """
+        from safa.utils.llm_manager import ALLOWED_MANAGERS
+        from safa.utils.llm_router import LLMRoute
+
+        llm = ALLOWED_MANAGERS["anthropic"]("key", LLMRoute("claude-3-haiku-20240307"))
+        messages = [("system", "instructions"), ("human", create_cached_content("project summary")), ("human", "diff")]
+
+        payload = llm._get_request_payload(messages)
+
+        cached_blocks = [b for m in payload["messages"] for b in m["content"] if b.get("cache_control") == CACHE_CONTROL]
+        self.assertEqual(["project summary"], [b["text"] for b in cached_blocks])
+        self.assertEqual(PROMPT_CACHING_HEADERS["anthropic-beta"], llm._client.default_headers["anthropic-beta"])
@@ -0,0 +1,80 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from safa.api.http_client import HttpClient
+from safa.api.safa_client import SafaClient
+from safa.api.stub_server import StubSafaServer
+from safa.config.safa_config import SafaConfig
+from safa.tools.projects.push_all import FAILED_STATUS, SKIPPED_STATUS, SUCCESS_STATUS, run_push_all
+from tests.live.infra.repo_factory import RepoFactory
+
+
+class TestPushAll(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.server = StubSafaServer().start()
+        env = {"SAFA_BASE_URL": self.server.base_url, "SAFA_EMAIL": "test@safa.ai", "SAFA_PASSWORD": "password"}
+        self.env_patch = patch.dict(os.environ, env)
+        self.env_patch.start()
+
+    def tearDown(self) -> None:
+        self.env_patch.stop()
+        self.server.stop()
+        self.tmp_dir.cleanup()
+
+    def test_push_all(self):
+        """
+        Tests that the commits since the last push of each configured repository are pushed with one login.
+        """
+        repo = self.create_repo("repo", n_commits=3)
+        other_repo = self.create_repo("other_repo", n_commits=2)
+        self.create_repo("unconfigured_repo", n_commits=1)
+        self.configure_project(repo)
+        self.configure_project(other_repo)
+
+        manifest_path = os.path.join(self.tmp_dir.name, "manifest.txt")
+        with open(manifest_path, "w") as f:
+            f.write("# repositories\nrepo\nother_repo\n\nunconfigured_repo\n")
+        report_path = os.path.join(self.tmp_dir.name, "report.json")
+        self.server.api.request_counts.clear()
+
+        results = run_push_all(manifest_path, max_workers=2, report_path=report_path)
+
+        self.assertEqual([SUCCESS_STATUS, SUCCESS_STATUS, SKIPPED_STATUS], [r.status for r in results])
+        self.assertEqual([3, 2, 0], [r.n_commits for r in results])
+        self.assertEqual(1, self.server.api.request_counts["POST login"])
+        self.assertEqual(5, self.server.api.request_counts["POST projects/{project_id}/versions/{version_type}"])
+        self.assertTrue(os.path.isfile(report_path))
+
+        repo.commit_revisions(1, start=3)
+        results = run_push_all(manifest_path, max_workers=2)
+
+        self.assertEqual([1, 0, 0], [r.n_commits for r in results])
+        self.assertNotIn(FAILED_STATUS, [r.status for r in results])
+        config = SafaConfig.from_repo(repo.repo_path)
+        self.assertEqual(repo.repo.head.commit.hexsha, config.project_config.commit_id)
+
+    def create_repo(self, name: str, n_commits: int) -> RepoFactory:
+        """
+        Creates repository with a file modified in each commit.
+        :param name: Name of the repository directory.
+        :param n_commits: Number of commits to make.
+        :return: The repository.
+        """
+        repo = RepoFactory(repo_path=os.path.join(self.tmp_dir.name, name))
+        repo.commit_revisions(n_commits)
+        return repo
+
+    def configure_project(self, repo: RepoFactory) -> None:
+        """
+        Creates project on stub server and sets it as the repository's project.
+        :param repo: The repository to configure.
+        :return: None
+        """
+        client = SafaClient(HttpClient(self.server.base_url))
+        client.login(email="test@safa.ai", password="password")
+        project_data = client.create_project(os.path.basename(repo.repo_path), "description")
+        config = SafaConfig.from_repo(repo.repo_path)
+        config.project_config.set_project(project_data["projectId"], project_data["projectVersion"]["versionId"])
@@ -0,0 +1,63 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from safa.data.commits import create_empty_diff
+from safa.utils.push_journal import COMMIT_SENT, IDS_SAVED, SUMMARIES_SENT, VERSION_CREATED, PushJournal
+
+
+class TestPushJournal(TestCase):
+    def setUp(self) -> None:
+        self.journal_dir = tempfile.TemporaryDirectory()
+        self.journal = PushJournal(os.path.join(self.journal_dir.name, "push_journal.jsonl"))
+
+    def tearDown(self) -> None:
+        self.journal_dir.cleanup()
+
+    def record_commit(self, index: int, version_id: str, save_ids: bool = True) -> None:
+        self.journal.record(VERSION_CREATED, index=index, version={"versionId": version_id})
+        self.journal.record(COMMIT_SENT, index=index, response=create_empty_diff())
+        if save_ids:
+            self.journal.record(IDS_SAVED, index=index)
+
+    def test_resume_after_commit_sent(self):
+        """
+        Tests that push resumes at commit whose response was received but whose ids were not saved.
+        """
+        self.journal.start(["c1", "c2", "c3"], start_commit_id="c0", start_version_id="v0")
+        self.record_commit(0, "v1")
+        self.journal.record(SUMMARIES_SENT, index=0)
+        self.record_commit(1, "v2", save_ids=False)
+
+        state = self.journal.load()
+
+        self.assertIsNotNone(state)
+        self.assertEqual(["c1", "c2", "c3"], state.commit_ids)
+        self.assertEqual(1, state.get_resume_index())
+        self.assertEqual("v2", state.get_resume_version_id())
+        self.assertEqual(0, len(state.get_unsummarized_responses()))
+
+    def test_resume_after_version_created(self):
+        """
+        Tests that push resumes from previous version when commit was not sent, ignoring partially written entries.
+        """
+        self.journal.start(["c1", "c2"], start_commit_id=None, start_version_id="v0")
+        self.record_commit(0, "v1")
+        self.journal.record(VERSION_CREATED, index=1, version={"versionId": "v2"})
+        with open(self.journal.journal_file_path, "a") as f:
+            f.write('{"step": "commit_se')
+
+        state = self.journal.load()
+
+        self.assertEqual(1, state.get_resume_index())
+        self.assertEqual("v1", state.get_resume_version_id())
+        self.assertEqual({"versionId": "v2"}, state.versions[1])
+        self.assertEqual(1, len(state.get_unsummarized_responses()))
+
+    def test_clear(self):
+        """
+        Tests that cleared journals have no unfinished push.
+        """
+        self.journal.start(["c1"], start_commit_id=None, start_version_id="v0")
+        self.journal.clear()
+        self.assertIsNone(self.journal.load())
@@ -0,0 +1,83 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from safa.api.http_client import HttpClient
+from safa.api.safa_client import SafaClient
+from safa.api.stub_server import StubSafaServer
+from safa.config.run_options import RunOptions
+from safa.config.safa_config import SafaConfig
+from safa.tools.projects.push import run_push_commit
+from tests.live.infra.repo_factory import RepoFactory
+
+VERSION_ROUTE = "POST projects/{project_id}/versions/{version_type}"
+
+
+class TestPushResume(TestCase):
+    def setUp(self) -> None:
+        self.repo_dir = tempfile.TemporaryDirectory()
+        self.commits = RepoFactory(repo_path=self.repo_dir.name).commit_revisions(3)
+        self.server = StubSafaServer().start()
+        self.client = SafaClient(HttpClient(self.server.base_url))
+        self.client.login(email="test@safa.ai", password="password")
+        project_data = self.client.create_project("project", "description")
+        self.project_id = project_data["projectId"]
+        self.start_version_id = project_data["projectVersion"]["versionId"]
+        self.config = SafaConfig.from_repo(self.repo_dir.name)
+        self.config.project_config.set_project(self.project_id, self.start_version_id)
+        self.config.run_options = RunOptions(yes=True)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+        self.repo_dir.cleanup()
+
+    def crash_push(self, method_name: str, n_calls: int) -> None:
+        """
+        Pushes all commits, crashing on the given call to client method and discarding the deferred config writes.
+        :param method_name: Name of the client method that crashes.
+        :param n_calls: The number of the call that crashes.
+        :return: None
+        """
+        method = getattr(self.client, method_name)
+        n_calls_made = []
+
+        def crashing_method(*args, **kwargs):
+            n_calls_made.append(1)
+            if len(n_calls_made) == n_calls:
+                raise KeyboardInterrupt()
+            return method(*args, **kwargs)
+
+        with patch.object(self.client, method_name, side_effect=crashing_method):
+            with self.assertRaises(KeyboardInterrupt):
+                run_push_commit(self.config, self.client, summary_interval=0, commits=self.commits, update_summary=False)
+        self.config.project_config.set_project(self.project_id, self.start_version_id, commit_id=None)
+
+    def test_decline_resume_after_crash(self):
+        """
+        Tests that declining to resume pushes only the commits that were not sent before the crash.
+        """
+        self.crash_push("commit", n_calls=3)
+        self.assertEqual(3, self.server.api.request_counts[VERSION_ROUTE])
+
+        run_push_commit(self.config, self.client, summary_interval=0, resume=False, update_summary=False)
+
+        self.assertEqual(4, self.server.api.request_counts[VERSION_ROUTE])
+        self.assertEqual(self.commits[-1].hexsha, self.config.project_config.commit_id)
+        final_version = self.server.api.version_artifacts[self.config.project_config.get_version_id()]
+        self.assertEqual("a = 2\n", final_version["a.py"]["body"])
+        self.assertFalse(os.path.exists(self.config.get_push_journal_path()))
+
+    def test_resume_summaries_after_crash(self):
+        """
+        Tests that resuming a push crashing after its last commit sends the pending summaries to the last version.
+        """
+        self.crash_push("summarize_artifacts", n_calls=1)
+
+        run_push_commit(self.config, self.client, summary_interval=0, resume=True, update_summary=False)
+
+        self.assertEqual(3, self.server.api.request_counts[VERSION_ROUTE])
+        self.assertEqual(self.commits[-1].hexsha, self.config.project_config.commit_id)
+        final_version = self.server.api.version_artifacts[self.config.project_config.get_version_id()]
+        self.assertTrue(final_version["a.py"]["summary"])
+        self.assertFalse(self.server.api.version_artifacts[self.start_version_id])
@@ -0,0 +1,107 @@
+import tempfile
+from unittest import TestCase
+
+from safa.api.constants import STORE_PROJECT_KEY
+from safa.api.http_client import HttpClient
+from safa.api.safa_client import SafaClient
+from safa.api.stub_server import StubSafaServer
+from safa.config.run_options import RunOptions
+from safa.config.safa_config import SafaConfig
+from safa.data.artifact import create_artifact
+from safa.data.commits import create_empty_diff
+from safa.tools.projects.push import _add_pending_summaries, _commit_summaries, _is_summary_checkpoint, run_push_commit
+from safa.utils.commit_store import CommitStore
+from tests.live.infra.repo_factory import RepoFactory
+
+COMMIT_ROUTE = "POST projects/versions/{version_id}/commit"
+SUMMARIZE_ROUTE = "POST projects/versions/{version_id}/artifacts/summarize"
+
+
+class TestPushSummaries(TestCase):
+    def setUp(self) -> None:
+        self.server = StubSafaServer().start()
+        self.client = SafaClient(HttpClient(self.server.base_url))
+        self.client.login(email="test@safa.ai", password="password")
+        project_data = self.client.create_project("project", "description")
+        self.project_id = project_data["projectId"]
+        self.version_id = project_data["projectVersion"]["versionId"]
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_add_pending_summaries(self):
+        """
+        Tests that only the latest revision of artifacts changed across commits is pending and removed ones are not.
+        """
+        pending_summaries = {}
+        first_response = create_empty_diff()
+        first_response["artifacts"]["added"] = [create_artifact("a.py", "Code", "a = 0"),
+                                                create_artifact("b.py", "Code")]
+        second_response = create_empty_diff()
+        second_response["artifacts"]["modified"] = [create_artifact("a.py", "Code", "a = 1")]
+        second_response["artifacts"]["removed"] = [create_artifact("b.py", "Code")]
+
+        _add_pending_summaries(pending_summaries, first_response)
+        _add_pending_summaries(pending_summaries, second_response)
+
+        self.assertEqual(["a.py"], list(pending_summaries.keys()))
+        self.assertEqual("a = 1", pending_summaries["a.py"]["body"])
+
+    def test_summary_checkpoints(self):
+        """
+        Tests that summaries are committed every interval and after the last commit, only after it if interval is 0.
+        """
+        self.assertEqual([1, 3, 4], [i for i in range(5) if _is_summary_checkpoint(i, 5, summary_interval=2)])
+        self.assertEqual([4], [i for i in range(5) if _is_summary_checkpoint(i, 5, summary_interval=0)])
+
+    def test_commit_summaries(self):
+        """
+        Tests that pending artifacts are summarized in one commit and that summaries equal to the stored ones are not
+        committed again, even if the commit response omits them.
+        """
+        commit_data = create_empty_diff()
+        commit_data["artifacts"]["added"] = [create_artifact("a.py", "Code", "a = 0"),
+                                             create_artifact("b.py", "Code", "b = 0")]
+        commit_response = self.client.commit(self.version_id, commit_data)
+        store = CommitStore(self.client.get_version(self.version_id))
+        store.save_ids(commit_response)
+        pending_summaries = {}
+        _add_pending_summaries(pending_summaries, commit_response)
+
+        _commit_summaries(self.client, self.version_id, pending_summaries, store)
+
+        artifacts = self.server.api.version_artifacts[self.version_id]
+        self.assertEqual({}, pending_summaries)
+        self.assertEqual("a.py (Code): a = 0", artifacts["a.py"]["summary"])
+        self.assertEqual(CommitStore.hash_summary("b.py (Code): b = 0"), store.artifact_store["b.py"].summary_hash)
+        self.assertEqual(2, self.server.api.request_counts[COMMIT_ROUTE])
+
+        commit_data = create_empty_diff()
+        commit_data["artifacts"]["modified"] = [create_artifact("a.py", "Code", "a = 0")]
+        store.add_ids(commit_data)
+        commit_response = self.client.commit(self.version_id, commit_data)
+        commit_response["artifacts"]["modified"][0].pop("summary")
+        store.save_ids(commit_response)
+        _add_pending_summaries(pending_summaries, commit_response)
+        _commit_summaries(self.client, self.version_id, pending_summaries, store)
+
+        self.assertEqual(2, self.server.api.request_counts[SUMMARIZE_ROUTE])
+        self.assertEqual(3, self.server.api.request_counts[COMMIT_ROUTE])
+
+    def test_push_summary_interval(self):
+        """
+        Tests that artifacts changed between checkpoints are summarized once, including those after the last checkpoint,
+        and that versions are not kept in the store.
+        """
+        with tempfile.TemporaryDirectory() as repo_dir:
+            commits = RepoFactory(repo_path=repo_dir).commit_revisions(3)
+            config = SafaConfig.from_repo(repo_dir)
+            config.project_config.set_project(self.project_id, self.version_id)
+            config.run_options = RunOptions(yes=True)
+
+            run_push_commit(config, self.client, summary_interval=2, commits=commits, update_summary=False)
+
+        final_version_id = config.project_config.get_version_id()
+        self.assertEqual(2, self.server.api.request_counts[SUMMARIZE_ROUTE])
+        self.assertEqual("a.py (Code): a = 2", self.server.api.version_artifacts[final_version_id]["a.py"]["summary"])
+        self.assertEqual({}, self.client.store.project_data[STORE_PROJECT_KEY])
@@ -0,0 +1,40 @@
+import json
+from dataclasses import dataclass
+from typing import List
+from unittest import TestCase
+
+from safa.data.file_change import FileChange
+from safa.utils.diff_summary import regenerate_commit_part
+
+
+@dataclass
+class RegenerateResponse:
+    content: str
+
+
+class RegenerateLLM:
+    def __init__(self):
+        self.prompts: List[str] = []
+
+    def invoke(self, messages) -> RegenerateResponse:
+        self.prompts.append(messages[-1][1])
+        return RegenerateResponse(f"```json\n{json.dumps({'text': ' Adds b. '})}\n```")
+
+
+class TestRegenerateChange(TestCase):
+    def test_regenerate_change(self):
+        """
+        Tests that a change is regenerated from the current message and the summaries of the files changed.
+        """
+        llm = RegenerateLLM()
+        file_changes = [FileChange(file="a.py", diff="diff of a.py", content_before="content of a.py", summary=""),
+                        FileChange(file="b.py", diff="diff of b.py", content_before="content of b.py", summary="")]
+
+        change = regenerate_commit_part(llm, file_changes, {"a.py": "Adds a.", "b.py": "Adds b."}, "Add files",
+                                        ["Adds a.", "Adds something."], change_index=1)
+
+        self.assertEqual("Adds b.", change)
+        self.assertEqual(1, len(llm.prompts))
+        self.assertIn("# File: b.py\n\n## Summary Of Changes\nAdds b.", llm.prompts[0])
+        self.assertNotIn("diff of", llm.prompts[0])
+        self.assertTrue(llm.prompts[0].endswith("Rewrite change 2 (Adds something.)."))
@@ -0,0 +1,93 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from safa.api.http_client import HttpClient
+from safa.api.safa_client import SafaClient
+from safa.api.stub_server import StubSafaServer
+from safa.config.run_options import RunOptions
+from safa.config.safa_config import SafaConfig
+from safa.tools.projects.push import run_push_commit
+from safa.utils.commits import resolve_commits
+from safa.utils.push_journal import PushJournal
+from tests.live.infra.repo_factory import RepoFactory
+
+
+class TestRunOptions(TestCase):
+    def setUp(self) -> None:
+        self.repo_dir = tempfile.TemporaryDirectory()
+        repo_factory = RepoFactory(repo_path=self.repo_dir.name)
+        self.repo = repo_factory.repo
+        self.commits = repo_factory.commit_revisions(3)
+
+    def tearDown(self) -> None:
+        self.repo_dir.cleanup()
+
+    def test_resolve_commits(self):
+        """
+        Tests that commits are resolved from `since-last`, ranges, and single revisions, oldest first.
+        """
+        self.assertEqual(self.commits, resolve_commits(self.repo, "since-last"))
+        self.assertEqual(self.commits[1:], resolve_commits(self.repo, "since-last", last_commit_id=self.commits[0].hexsha))
+        self.assertEqual(self.commits[1:], resolve_commits(self.repo, "HEAD~2..HEAD"))
+        self.assertEqual([self.commits[1]], resolve_commits(self.repo, "HEAD~1"))
+
+    @patch("builtins.input", side_effect=AssertionError("User should not be prompted."))
+    def test_push_without_prompts(self, _):
+        """
+        Tests that push selects commits, version types, and confirmations from run options.
+        """
+        with StubSafaServer() as server:
+            client = SafaClient(HttpClient(server.base_url))
+            client.login(email="test@safa.ai", password="password")
+            project_data = client.create_project("project", "description")
+            config = SafaConfig.from_repo(self.repo_dir.name)
+            config.project_config.set_project(project_data["projectId"], project_data["projectVersion"]["versionId"])
+            config.run_options = RunOptions(commits="HEAD", version_type="major", yes=True)
+
+            run_push_commit(config, client)
+
+        self.assertEqual(self.commits[-1].hexsha, config.project_config.commit_id)
+        self.assertEqual(1, server.api.request_counts["POST projects/{project_id}/versions/{version_type}"])
+        version = server.api.versions[config.project_config.get_version_id()]
+        self.assertEqual(2, version["majorVersion"])
+        self.assertEqual(0, server.api.request_counts["POST projects/versions/{version_id}/summarize"])
+
+    @patch("builtins.input", side_effect=AssertionError("User should not be prompted."))
+    def test_push_update_summary(self, _):
+        """
+        Tests that project is summarized after a push without prompts only if requested.
+        """
+        with StubSafaServer() as server:
+            client = SafaClient(HttpClient(server.base_url))
+            client.login(email="test@safa.ai", password="password")
+            project_data = client.create_project("project", "description")
+            config = SafaConfig.from_repo(self.repo_dir.name)
+            config.project_config.set_project(project_data["projectId"], project_data["projectVersion"]["versionId"])
+            config.run_options = RunOptions(commits="HEAD", yes=True, update_summary=True)
+
+            run_push_commit(config, client)
+
+        self.assertEqual(1, server.api.request_counts["POST projects/versions/{version_id}/summarize"])
+
+    @patch("builtins.input", side_effect=AssertionError("User should not be prompted."))
+    def test_auto_commit_resumes_push(self, _):
+        """
+        Tests that unfinished pushes are resumed without prompts when running with `--auto-commit`.
+        """
+        with StubSafaServer() as server:
+            client = SafaClient(HttpClient(server.base_url))
+            client.login(email="test@safa.ai", password="password")
+            project_data = client.create_project("project", "description")
+            config = SafaConfig.from_repo(self.repo_dir.name)
+            config.project_config.set_project(project_data["projectId"], project_data["projectVersion"]["versionId"])
+            config.run_options = RunOptions(auto_commit=True)
+            PushJournal(config.get_push_journal_path()).start([c.hexsha for c in self.commits], None,
+                                                             config.project_config.get_version_id())
+
+            run_push_commit(config, client)
+
+        self.assertEqual(self.commits[-1].hexsha, config.project_config.commit_id)
+        self.assertEqual(3, server.api.request_counts["POST projects/{project_id}/versions/{version_type}"])
+        self.assertFalse(os.path.exists(config.get_push_journal_path()))
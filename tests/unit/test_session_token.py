@@ -0,0 +1,65 @@
+import json
+import os
+import stat
+import tempfile
+from unittest import TestCase
+
+import responses
+
+from safa.api.constants import SAFA_AUTH_TOKEN, STORE_CRED_KEY
+from safa.api.http_client import HttpClient
+from safa.api.safa_client import SafaClient
+from safa.api.safa_store import SafaStore
+from tests.unit.mocker import Mocker
+
+
+class TestSessionToken(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_file_path = os.path.join(self.tmp_dir.name, "cache.json")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    @responses.activate
+    def test_reuses_saved_token(self):
+        """
+        Tests that the session token saved by a login is reused by later clients without logging in again.
+        """
+        Mocker.mock_auth(self)
+        Mocker.mock_get_projects(self, Mocker.DEFAULT_PROJECTS)
+
+        self.create_client().login(email=Mocker.DEFAULT_EMAIL, password=Mocker.DEFAULT_PASSWORD)
+        client = self.create_client()
+        client.login(email=Mocker.DEFAULT_EMAIL, password=Mocker.DEFAULT_PASSWORD)
+        projects = client.get_projects()
+
+        self.assertEqual(Mocker.DEFAULT_PROJECTS, projects)
+        self.assertEqual(1, len([c for c in responses.calls if c.request.url.endswith("/login")]))
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.cache_file_path).st_mode))
+
+    @responses.activate
+    def test_expired_token(self):
+        """
+        Tests that expired saved tokens are discarded and that requests rejected as unauthorized log in again.
+        """
+        Mocker.mock_auth(self)
+        store = SafaStore(cache_file_path=self.cache_file_path)
+        store.save(STORE_CRED_KEY, Mocker.DEFAULT_EMAIL, {"base_url": Mocker.BASE_URL, "token": "old_token",
+                                                          "domain": "", "path": "/", "expires": 0})
+        client = self.create_client()
+        client.login(email=Mocker.DEFAULT_EMAIL, password=Mocker.DEFAULT_PASSWORD)
+        self.assertEqual("auth_token", client.http_client.get_cookie(SAFA_AUTH_TOKEN))
+
+        project_responses = [(401, {}, json.dumps({})), (200, {}, json.dumps(Mocker.DEFAULT_PROJECTS))]
+        responses.add_callback(responses.GET, Mocker.BASE_URL + "/projects", callback=lambda r: project_responses.pop(0))
+        projects = client.get_projects()
+
+        self.assertEqual(Mocker.DEFAULT_PROJECTS, projects)
+        self.assertEqual(2, len([c for c in responses.calls if c.request.url.endswith("/login")]))
+
+    def create_client(self) -> SafaClient:
+        """
+        :return: Client whose store is persisted to the cache file.
+        """
+        return SafaClient(HttpClient(Mocker.BASE_URL), store=SafaStore(cache_file_path=self.cache_file_path))
@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from safa.utils.spec_sections import SpecSection, fits_budget, needs_retrieval, select_sections, \
+    split_specification
+
+SPECIFICATION = """# Overview
+Safa summarizes commits.
+
+## Authentication
+Users log in with email and password.
+
+## Search
+Artifacts are embedded and searched.
+"""
+
+
+class TestSpecSections(TestCase):
+    def test_split_specification(self):
+        """
+        Tests that specification is split at its headings and falls back to paragraphs without headings.
+        """
+        sections = split_specification(SPECIFICATION)
+        self.assertEqual(["# Overview", "## Authentication", "## Search"], [s.content.splitlines()[0] for s in sections])
+        self.assertEqual(["a", "b"], [s.content for s in split_specification("a\n\n  \nb\n")])
+
+    def test_select_sections(self):
+        """
+        Tests that the most relevant sections fitting the budget are selected in specification order.
+        """
+        sections = [SpecSection(0, "a" * 40), SpecSection(1, "b" * 400), SpecSection(2, "c" * 40)]
+
+        self.assertEqual(f"{'a' * 40}\n\n{'c' * 40}", select_sections(sections, [2, 1, 0], 50))
+        self.assertEqual("b" * 400, select_sections(sections, [1, 0], 5))
+        self.assertTrue(fits_budget(SPECIFICATION, 100))
+        self.assertFalse(fits_budget(SPECIFICATION, 10))
+
+    def test_needs_retrieval(self):
+        """
+        Tests that sections are only retrieved from specifications exceeding the budget when prompt caching is off.
+        """
+        self.assertTrue(needs_retrieval(SPECIFICATION, 10, prompt_caching=False))
+        self.assertFalse(needs_retrieval(SPECIFICATION, 10, prompt_caching=True))
+        self.assertFalse(needs_retrieval(SPECIFICATION, 100, prompt_caching=False))
+        self.assertFalse(needs_retrieval("", 10, prompt_caching=False))
@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+from safa.api.http_client import HttpClient
+from safa.api.safa_client import SafaClient
+from safa.api.stub_server import StubSafaApi, StubSafaServer
+from safa.data.artifact import create_artifact
+from safa.data.commits import create_empty_diff
+
+
+class TestStubServer(TestCase):
+    def test_commit_and_get_version(self):
+        """
+        Tests that committed artifacts are assigned ids and copied into new versions.
+        """
+        with StubSafaServer() as server:
+            client = self.create_client(server)
+            project_data = client.create_project("project", "description")
+            project_id = project_data["projectId"]
+
+            version = client.create_version(project_id, "revision")
+            commit_data = create_empty_diff()
+            commit_data["artifacts"]["added"].append(create_artifact("a.py", "Code", body="print('a')"))
+            commit_response = client.commit(version["versionId"], commit_data)
+            artifact_id = commit_response["artifacts"]["added"][0]["id"]
+
+            next_version = client.create_version(project_id, "minor")
+            version_data = client.get_version(next_version["versionId"])
+
+        self.assertEqual((1, 1, 0), (next_version["majorVersion"], next_version["minorVersion"], next_version["revision"]))
+        self.assertEqual([artifact_id], [a["id"] for a in version_data["artifacts"]])
+        self.assertEqual(1, server.api.request_counts["POST projects/versions/{version_id}/commit"])
+
+    def test_job_latency(self):
+        """
+        Tests that summarization jobs stay in progress until their latency has passed.
+        """
+        api = StubSafaApi(job_latency=60)
+        with StubSafaServer(api) as server:
+            client = self.create_client(server)
+            project_data = client.create_project("project", "description")
+            job = client.summarize(project_data["projectVersion"]["versionId"])
+            self.assertEqual("IN_PROGRESS", client.get_job(job["id"])["status"])
+
+            api.job_latency = 0
+            job = client.summarize(project_data["projectVersion"]["versionId"])
+            self.assertEqual("COMPLETED", client.get_job(job["id"])["status"])
+
+    def test_failure_rate(self):
+        """
+        Tests that requests fail with server errors at the configured rate.
+        """
+        api = StubSafaApi(failure_rate=1)
+        with StubSafaServer(api) as server:
+            client = self.create_client(server)
+            with self.assertRaises(Exception):
+                client.get_projects()
+        self.assertEqual(1, api.failure_counts["GET projects"])
+
+    @staticmethod
+    def create_client(server: StubSafaServer) -> SafaClient:
+        """
+        Creates client logged in to stub server.
+        :param server: The running stub server.
+        :return: The client.
+        """
+        client = SafaClient(HttpClient(server.base_url))
+        client.login(email="user@safa.ai", password="password")
+        return client
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import List, Tuple
+from unittest import TestCase
+
+from safa.data.file_change import FileChange
+from safa.utils.diff_summary import summarize_commit_changes
+from safa.utils.summary_cache import SummaryCache
+
+
+@dataclass
+class SummaryResponse:
+    content: str
+
+
+class SummaryLLM:
+    def __init__(self):
+        self.prompts: List[str] = []
+
+    def invoke(self, messages: List[Tuple[str, str]]) -> SummaryResponse:
+        prompt = messages[-1][1]
+        self.prompts.append(prompt)
+        files = [line.replace("# File: ", "") for line in prompt.splitlines() if line.startswith("# File: ")]
+        response_json = {
+            "diffs": {f: f"Changes {f}." for f in files},
+            "changes": [f"Changes {f}." for f in files],
+            "title": f"Change {len(self.prompts)}"
+        }
+        return SummaryResponse(f"```json\n{json.dumps(response_json)}\n```")
+
+
+class TestSummaryCache(TestCase):
+    def test_only_changed_files_are_sent(self):
+        """
+        Tests that restaged changes reuse their message and that files whose content did not change are only sent as
+        their cached summary.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file_path = os.path.join(tmp_dir, "summary_cache.json")
+            llm = SummaryLLM()
+            a_change = self.create_file_change("a.py", "a1", "a2")
+            b_change = self.create_file_change("b.py", "b1", "b2")
+
+            title, _ = summarize_commit_changes(llm, [a_change, b_change], "", summary_cache=SummaryCache(cache_file_path))
+            restaged_title, _ = summarize_commit_changes(llm, [a_change, b_change], "",
+                                                         summary_cache=SummaryCache(cache_file_path))
+            self.assertEqual(1, len(llm.prompts))
+            self.assertEqual(title, restaged_title)
+
+            b_change = self.create_file_change("b.py", "b1", "b3")
+            summarize_commit_changes(llm, [a_change, b_change], "", summary_cache=SummaryCache(cache_file_path))
+
+        self.assertEqual(2, len(llm.prompts))
+        self.assertIn("# File: a.py\n\n## Summary Of Changes\nChanges a.py.", llm.prompts[-1])
+        self.assertNotIn("diff of a.py", llm.prompts[-1])
+        self.assertIn("diff of b.py", llm.prompts[-1])
+
+    @staticmethod
+    def create_file_change(file: str, blob_before: str, blob_after: str) -> FileChange:
+        """
+        Creates change to file between two blobs.
+        :param file: The file changed.
+        :param blob_before: ID of the blob before the change.
+        :param blob_after: ID of the blob after the change.
+        :return: The file change.
+        """
+        return FileChange(file=file, diff=f"diff of {file}", content_before=f"content of {file}", summary="",
+                          blob_before=blob_before, blob_after=blob_after)
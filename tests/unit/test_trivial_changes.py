@@ -0,0 +1,87 @@
+import tempfile
+from unittest import TestCase
+
+from safa.utils.trivial_changes import summarize_trivial_changes
+from tests.live.infra.repo_factory import RepoFactory
+
+
+class TestTrivialChanges(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.repo_factory = RepoFactory(repo_path=self.tmp_dir.name)
+        self.repo = self.repo_factory.repo
+        self.repo_factory.commit_files({
+            "a.py": "def a():\n    return 1\n",
+            "b.py": "b = 2\n",
+            "requirements.txt": "requests==2.31.0\nGitPython==3.1.40\n",
+            "poetry.lock": "# lock\n",
+            "m.py": "def m(a, b):\n    if a:\n        b += 1\n        return b\n    return None\n",
+            "pyproject.toml": "[project]\nversion = \"1.0\"\n",
+            "c.js": "const c = \"a b\";\n"
+        }, "Initial commit")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_version_bump(self):
+        """
+        Tests that a dependency version edit and its lockfile are summarized without the LLM.
+        """
+        self.repo_factory.write_files({"requirements.txt": "requests==2.32.3\nGitPython==3.1.40\n", "poetry.lock": "# lock 2\n"})
+        self.repo.index.add(["requirements.txt", "poetry.lock"])
+
+        title, changes = summarize_trivial_changes(self.repo)
+
+        self.assertEqual("Bump requests to 2.32.3", title)
+        self.assertEqual(["Updates locked dependency versions in poetry.lock.",
+                          "Bumps requests from 2.31.0 to 2.32.3 in requirements.txt."], changes)
+
+    def test_rename_and_format(self):
+        """
+        Tests that pure renames, deletions, and whitespace-only edits are summarized without the LLM.
+        """
+        self.repo.index.move(["b.py", "c.py"])
+        self.repo_factory.write_files({"a.py": "def a():\n\n    return 1  \n"})
+        self.repo.index.add(["a.py"])
+
+        title, changes = summarize_trivial_changes(self.repo)
+
+        self.assertEqual("Rename and format files", title)
+        self.assertEqual(["Reformats a.py without changing its content.", "Renames b.py to c.py."], changes)
+
+    def test_requires_llm(self):
+        """
+        Tests that any change not matching a rule sends all changes to the LLM.
+        """
+        self.repo_factory.write_files({"a.py": "def a():\n    return 2\n"})
+        self.repo.index.add(["a.py"])
+        self.repo.index.remove(["b.py"], working_tree=True)
+
+        self.assertIsNone(summarize_trivial_changes(self.repo))
+
+    def test_indentation_change(self):
+        """
+        Tests that moving python code out of a block is not mistaken for formatting.
+        """
+        self.repo_factory.write_files({"m.py": "def m(a, b):\n    if a:\n        b += 1\n    return b\n    return None\n"})
+        self.repo.index.add(["m.py"])
+
+        self.assertIsNone(summarize_trivial_changes(self.repo))
+
+    def test_string_whitespace_removed(self):
+        """
+        Tests that removing whitespace inside a string is not mistaken for formatting.
+        """
+        self.repo_factory.write_files({"c.js": "const c = \"ab\";\n"})
+        self.repo.index.add(["c.js"])
+
+        self.assertIsNone(summarize_trivial_changes(self.repo))
+
+    def test_version_removed(self):
+        """
+        Tests that removing a version is not mistaken for a version change.
+        """
+        self.repo_factory.write_files({"pyproject.toml": "[project]\nversion = \"\"\n"})
+        self.repo.index.add(["pyproject.toml"])
+
+        self.assertIsNone(summarize_trivial_changes(self.repo))
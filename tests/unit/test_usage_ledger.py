@@ -0,0 +1,54 @@
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict
+from unittest import TestCase
+
+from safa.tools.usage import create_usage_report
+from safa.utils.llm_router import LLMRoute, LLMRouter, RouteMetrics
+from safa.utils.usage_ledger import UsageLedger, get_cost, get_prompt_size
+
+
+@dataclass
+class UsageResponse:
+    content: str
+    usage_metadata: Dict[str, int] = field(default_factory=dict)
+
+
+class UsageLLM:
+    def invoke(self, messages) -> UsageResponse:
+        return UsageResponse("response", {"input_tokens": 1000, "output_tokens": 100})
+
+
+class TestUsageLedger(TestCase):
+    def test_records_router_usage(self):
+        """
+        Tests that the usage of each request is aggregated per day, model, and prompt size across runs.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            usage_file_path = os.path.join(tmp_dir, ".safa", "usage.json")
+            for _ in range(2):
+                router = LLMRouter([LLMRoute("claude-3-haiku-20240307")], lambda route: UsageLLM(),
+                                   on_usage=UsageLedger(usage_file_path).record)
+                router.invoke([("human", "a" * 8000)])
+
+            usage_table = UsageLedger(usage_file_path).load()
+
+        day_usage = list(usage_table.values())[0]
+        usage = day_usage["claude-3-haiku-20240307"]["1k-4k"]
+        self.assertEqual((2, 2000, 200), (usage.n_calls, usage.prompt_tokens, usage.output_tokens))
+        report = "\n".join(create_usage_report(usage_table, n_days=7))
+        self.assertIn("claude-3-haiku-20240307 (1k-4k prompt tokens): 2 calls (0 hedged)", report)
+        self.assertIn("$0.0008", report)
+
+    def test_cost(self):
+        """
+        Tests that cached prompt tokens are priced at their cache rates, prompts of cancelled requests are priced, and
+        unknown models have no cost.
+        """
+        usage = RouteMetrics(prompt_tokens=1_000_000, output_tokens=1_000_000, cache_read_tokens=500_000)
+        self.assertAlmostEqual(3 * 0.5 + 3 * 0.1 * 0.5 + 15, get_cost("claude-3-5-sonnet-20240620", usage))
+        self.assertIsNone(get_cost("unknown-model", usage))
+        hedged_usage = RouteMetrics(prompt_tokens=1_000_000, cancelled_prompt_tokens=1_000_000)
+        self.assertAlmostEqual(3 * 2, get_cost("claude-3-5-sonnet-20240620", hedged_usage))
+        self.assertEqual(["0-1k", "4k-16k", ">16k"], [get_prompt_size(n) for n in [10, 4000, 20000]])